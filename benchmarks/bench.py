@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the hot paths of python-chess.
+
+Save results of a known good version as a baseline, then compare:
+
+    python benchmarks/bench.py -o baseline.json
+    python benchmarks/bench.py --compare baseline.json
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than the threshold.
+"""
+
+import argparse
+import gc
+import glob
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+import chess
+import chess.gaviota
+import chess.pgn
+import chess.polyglot
+import chess.syzygy
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+BRATKO_KOPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "bratko_kopec", "bratko-kopec.epd")
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+Setup = Callable[[], Tuple[Callable[[], Any], int]]
+
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """
+    Registers a benchmark. The decorated function prepares the data and
+    returns the workload and the number of operations it performs.
+    """
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def bratko_kopec() -> List[chess.Board]:
+    with open(BRATKO_KOPEC) as epds:
+        return [chess.Board.from_epd(epd)[0] for epd in epds if epd.strip()]
+
+
+def endgames() -> List[chess.Board]:
+    with open(os.path.join(DATA_DIR, "endgame.epd")) as epds:
+        return [chess.Board.from_epd(epd)[0] for epd in epds if epd.strip()]
+
+
+@benchmark("fen.set")
+def bench_set_fen() -> Tuple[Callable[[], Any], int]:
+    fens = [board.fen() for board in bratko_kopec()]
+    board = chess.Board()
+
+    def run() -> None:
+        for fen in fens:
+            board.set_fen(fen)
+
+    return run, len(fens)
+
+
+@benchmark("fen.get")
+def bench_fen() -> Tuple[Callable[[], Any], int]:
+    boards = bratko_kopec()
+
+    def run() -> None:
+        for board in boards:
+            board.fen()
+
+    return run, len(boards)
+
+
+@benchmark("movegen.legal")
+def bench_legal_moves() -> Tuple[Callable[[], Any], int]:
+    boards = bratko_kopec()
+
+    def run() -> None:
+        for board in boards:
+            list(board.generate_legal_moves())
+
+    return run, len(boards)
+
+
+@benchmark("movegen.count")
+def bench_count_legal_moves() -> Tuple[Callable[[], Any], int]:
+    boards = bratko_kopec()
+
+    def run() -> None:
+        for board in boards:
+            board.legal_moves.count()
+
+    return run, len(boards)
+
+
+@benchmark("push_pop")
+def bench_push_pop() -> Tuple[Callable[[], Any], int]:
+    positions = [(board, list(board.legal_moves)) for board in bratko_kopec()]
+
+    def run() -> None:
+        for board, moves in positions:
+            for move in moves:
+                board.push(move)
+                board.pop()
+
+    return run, sum(len(moves) for _, moves in positions)
+
+
+@benchmark("san.parse")
+def bench_parse_san() -> Tuple[Callable[[], Any], int]:
+    positions = [(board, [board.san(move) for move in board.legal_moves]) for board in bratko_kopec()]
+
+    def run() -> None:
+        for board, sans in positions:
+            for san in sans:
+                board.parse_san(san)
+
+    return run, sum(len(sans) for _, sans in positions)
+
+
+@benchmark("san.emit")
+def bench_san() -> Tuple[Callable[[], Any], int]:
+    positions = [(board, list(board.legal_moves)) for board in bratko_kopec()]
+
+    def run() -> None:
+        for board, moves in positions:
+            for move in moves:
+                board.san(move)
+
+    return run, sum(len(moves) for _, moves in positions)
+
+
+@benchmark("pgn.read_game")
+def bench_read_game() -> Tuple[Callable[[], Any], int]:
+    # Read from memory, to measure parsing rather than disk access.
+    texts = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "pgn", "*.pgn"))):
+        with open(path, encoding="utf-8-sig") as pgn:
+            texts.append(pgn.read())
+
+    def run() -> int:
+        games = 0
+        for text in texts:
+            pgn = io.StringIO(text)
+            while chess.pgn.read_game(pgn) is not None:
+                games += 1
+        return games
+
+    return run, run()
+
+
+@benchmark("pgn.iter_games.buffer")
+def bench_iter_games_buffer() -> Tuple[Callable[[], Any], int]:
+    buffers = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "pgn", "*.pgn"))):
+        with open(path, "rb") as pgn:
+            buffers.append(pgn.read())
+
+    def run() -> int:
+        return sum(1 for buffer in buffers for _ in chess.pgn.iter_games(buffer))
+
+    return run, run()
+
+
+@benchmark("polyglot.find_all")
+def bench_find_all() -> Tuple[Callable[[], Any], int]:
+    reader = chess.polyglot.open_reader(os.path.join(DATA_DIR, "polyglot", "performance.bin"))
+
+    # Follow the main line of the book.
+    boards = []
+    board = chess.Board()
+    for _ in range(20):
+        boards.append(board.copy(stack=False))
+        entry = reader.get(board)
+        if entry is None:
+            break
+        board.push(entry.move)
+
+    def run() -> None:
+        for board in boards:
+            list(reader.find_all(board))
+
+    return run, len(boards)
+
+
+@benchmark("syzygy.probe_wdl")
+def bench_probe_wdl() -> Tuple[Callable[[], Any], int]:
+    tablebase = chess.syzygy.open_tablebase(os.path.join(DATA_DIR, "syzygy", "regular"))
+    boards = endgames()
+
+    def run() -> None:
+        for board in boards:
+            tablebase.probe_wdl(board)
+
+    return run, len(boards)
+
+
+@benchmark("syzygy.probe_dtz")
+def bench_probe_dtz() -> Tuple[Callable[[], Any], int]:
+    tablebase = chess.syzygy.open_tablebase(os.path.join(DATA_DIR, "syzygy", "regular"))
+    boards = endgames()
+
+    def run() -> None:
+        for board in boards:
+            tablebase.probe_dtz(board)
+
+    return run, len(boards)
+
+
+@benchmark("gaviota.probe_dtm")
+def bench_probe_dtm() -> Tuple[Callable[[], Any], int]:
+    # Measure the pure Python implementation, not libgtb.
+    tablebase = chess.gaviota.PythonTablebase()
+    tablebase.add_directory(os.path.join(DATA_DIR, "gaviota"))
+
+    # Only a few tables are bundled.
+    boards = []
+    for board in endgames():
+        try:
+            tablebase.probe_dtm(board)
+        except chess.gaviota.MissingTableError:
+            pass
+        else:
+            boards.append(board)
+    if not boards:
+        raise SkipBenchmark("no positions covered by the bundled tables")
+
+    def run() -> None:
+        for board in boards:
+            tablebase.probe_dtm(board)
+
+    return run, len(boards)
+
+
+def measure(run: Callable[[], Any], *, repeat: int, min_time: float) -> List[float]:
+    """Returns the best time per call of each repetition."""
+    # Calibrate the number of calls, like timeit.Timer.autorange().
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return timings
+
+
+def run_benchmarks(pattern: Optional[str], *, repeat: int, min_time: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+
+        try:
+            run, ops = setup()
+        except (SkipBenchmark, OSError) as err:
+            print(f"{name:<20} skipped: {err}", file=sys.stderr)
+            continue
+
+        timings = measure(run, repeat=repeat, min_time=min_time)
+        seconds_per_op = min(timings) / ops
+        results[name] = {
+            "ops": ops,
+            "seconds_per_op": seconds_per_op,
+            "ops_per_second": 1 / seconds_per_op,
+            "median_seconds_per_op": statistics.median(timings) / ops,
+        }
+        print(f"{name:<20} {seconds_per_op * 1e6:>12.3f} us/op {1 / seconds_per_op:>14.0f} ops/s", file=sys.stderr)
+
+    return {
+        "version": 1,
+        "chess": chess.__version__,
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], *, threshold: float, file: TextIO = sys.stdout) -> List[str]:
+    """
+    Prints the change of each benchmark relative to the baseline and
+    returns the names of the regressions.
+    """
+    regressions = []
+    print(f"{'benchmark':<20} {'baseline us':>12} {'current us':>12} {'change':>8}", file=file)
+    for name, result in current["benchmarks"].items():
+        try:
+            before = baseline["benchmarks"][name]["seconds_per_op"]
+        except KeyError:
+            print(f"{name:<20} {'-':>12} {result['seconds_per_op'] * 1e6:>12.3f}", file=file)
+            continue
+
+        change = result["seconds_per_op"] / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<20} {before * 1e6:>12.3f} {result['seconds_per_op'] * 1e6:>12.3f} {change:>+8.1%}{flag}", file=file)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file (- for stdout)")
+    parser.add_argument("-c", "--compare", metavar="BASELINE", help="Compare with results from a previous run")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+        help="Report slowdowns above this fraction as regressions. Defaults to 0.1")
+    parser.add_argument("-k", "--filter", help="Only run benchmarks with names matching this regular expression")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Number of timed repetitions. Defaults to 5")
+    parser.add_argument("--min-time", type=float, default=0.2,
+        help="Minimum duration of each repetition in seconds. Defaults to 0.2")
+    parser.add_argument("-l", "--list", action="store_true", help="List the benchmarks")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(args.filter, repeat=args.repeat, min_time=args.min_time)
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if baseline is not None:
+        # Keep stdout clean for JSON output.
+        file = sys.stderr if args.output == "-" else sys.stdout
+        print(file=file)
+        regressions = compare(baseline, results, threshold=args.threshold, file=file)
+        if regressions:
+            print(file=file)
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}", file=file)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
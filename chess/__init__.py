@@ -15,8 +15,8 @@ __email__ = "niklas.fiekas@backscattering.de"
 
 __version__ = "1.11.2"
 
+import array
 import collections
-import copy
 import dataclasses
 import enum
 import math
@@ -537,18 +537,39 @@ def _attack_table(deltas: List[int]) -> Tuple[List[Bitboard], List[Dict[Bitboard
     mask_table: List[Bitboard] = []
     attack_table: List[Dict[Bitboard, Bitboard]] = []
 
-    for square in SQUARES:
-        attacks = {}
-
-        mask = _sliding_attacks(square, 0, deltas) & ~_edges(square)
-        for subset in _carry_rippler(mask):
-            attacks[subset] = _sliding_attacks(square, subset, deltas)
+    # Many entries have equal keys or attacks. Sharing a single int object
+    # for each distinct bitboard saves memory.
+    shared: Dict[Bitboard, Bitboard] = {}
 
-        attack_table.append(attacks)
+    for square in SQUARES:
+        attacks = {BB_EMPTY: BB_EMPTY}
+        mask = BB_EMPTY
+
+        # Lines in different directions are independent, so tracing each
+        # line and combining the results is much cheaper than tracing every
+        # subset of the whole mask. Along a line, the attacks stop at the
+        # nearest blocker.
+        for delta in deltas:
+            ray = _sliding_attacks(square, BB_EMPTY, [delta])
+            line_mask = ray & ~_edges(square)
+            if delta > 0:
+                line = [(subset, ray & ((subset & -subset) << 1) - 1) for subset in _carry_rippler(line_mask)]
+            else:
+                line = [(subset, ray & ~(BB_SQUARES[msb(subset)] - 1) if subset else ray) for subset in _carry_rippler(line_mask)]
+            attacks = {subset | line_subset: attacks_subset | line_attacks
+                       for subset, attacks_subset in attacks.items()
+                       for line_subset, line_attacks in line}
+            mask |= line_mask
+
+        attack_table.append({shared.setdefault(subset, subset): shared.setdefault(attacks_subset, attacks_subset)
+                             for subset, attacks_subset in attacks.items()})
         mask_table.append(mask)
 
     return mask_table, attack_table
 
+# Slider attacks are looked up by masked occupancy. In CPython, a dict
+# lookup is cheaper than computing a flat table index (magic multiplication
+# or shifts) on arbitrary precision ints.
 BB_DIAG_MASKS, BB_DIAG_ATTACKS = _attack_table([-9, -7, 7, 9])
 BB_FILE_MASKS, BB_FILE_ATTACKS = _attack_table([-8, 8])
 BB_RANK_MASKS, BB_RANK_ATTACKS = _attack_table([-1, 1])
@@ -579,13 +600,234 @@ def between(a: Square, b: Square) -> Bitboard:
     bb = BB_RAYS[a][b] & ((BB_ALL << a) ^ (BB_ALL << b))
     return bb & (bb - 1)
 
+def _piece_attacks(piece_type: PieceType, color: Color, square: Square, occupied: Bitboard) -> Bitboard:
+    if piece_type == PAWN:
+        return BB_PAWN_ATTACKS[color][square]
+    elif piece_type == KNIGHT:
+        return BB_KNIGHT_ATTACKS[square]
+    elif piece_type == KING:
+        return BB_KING_ATTACKS[square]
+
+    attacks = BB_EMPTY
+    if piece_type == BISHOP or piece_type == QUEEN:
+        attacks = BB_DIAG_ATTACKS[square][BB_DIAG_MASKS[square] & occupied]
+    if piece_type == ROOK or piece_type == QUEEN:
+        attacks |= (BB_RANK_ATTACKS[square][BB_RANK_MASKS[square] & occupied] |
+                    BB_FILE_ATTACKS[square][BB_FILE_MASKS[square] & occupied])
+    return attacks
+
+
+POLYGLOT_RANDOM_ARRAY = [
+    0x9D39247E33776D41, 0x2AF7398005AAA5C7, 0x44DB015024623547, 0x9C15F73E62A76AE2,
+    0x75834465489C0C89, 0x3290AC3A203001BF, 0x0FBBAD1F61042279, 0xE83A908FF2FB60CA,
+    0x0D7E765D58755C10, 0x1A083822CEAFE02D, 0x9605D5F0E25EC3B0, 0xD021FF5CD13A2ED5,
+    0x40BDF15D4A672E32, 0x011355146FD56395, 0x5DB4832046F3D9E5, 0x239F8B2D7FF719CC,
+    0x05D1A1AE85B49AA1, 0x679F848F6E8FC971, 0x7449BBFF801FED0B, 0x7D11CDB1C3B7ADF0,
+    0x82C7709E781EB7CC, 0xF3218F1C9510786C, 0x331478F3AF51BBE6, 0x4BB38DE5E7219443,
+    0xAA649C6EBCFD50FC, 0x8DBD98A352AFD40B, 0x87D2074B81D79217, 0x19F3C751D3E92AE1,
+    0xB4AB30F062B19ABF, 0x7B0500AC42047AC4, 0xC9452CA81A09D85D, 0x24AA6C514DA27500,
+    0x4C9F34427501B447, 0x14A68FD73C910841, 0xA71B9B83461CBD93, 0x03488B95B0F1850F,
+    0x637B2B34FF93C040, 0x09D1BC9A3DD90A94, 0x3575668334A1DD3B, 0x735E2B97A4C45A23,
+    0x18727070F1BD400B, 0x1FCBACD259BF02E7, 0xD310A7C2CE9B6555, 0xBF983FE0FE5D8244,
+    0x9F74D14F7454A824, 0x51EBDC4AB9BA3035, 0x5C82C505DB9AB0FA, 0xFCF7FE8A3430B241,
+    0x3253A729B9BA3DDE, 0x8C74C368081B3075, 0xB9BC6C87167C33E7, 0x7EF48F2B83024E20,
+    0x11D505D4C351BD7F, 0x6568FCA92C76A243, 0x4DE0B0F40F32A7B8, 0x96D693460CC37E5D,
+    0x42E240CB63689F2F, 0x6D2BDCDAE2919661, 0x42880B0236E4D951, 0x5F0F4A5898171BB6,
+    0x39F890F579F92F88, 0x93C5B5F47356388B, 0x63DC359D8D231B78, 0xEC16CA8AEA98AD76,
+    0x5355F900C2A82DC7, 0x07FB9F855A997142, 0x5093417AA8A7ED5E, 0x7BCBC38DA25A7F3C,
+    0x19FC8A768CF4B6D4, 0x637A7780DECFC0D9, 0x8249A47AEE0E41F7, 0x79AD695501E7D1E8,
+    0x14ACBAF4777D5776, 0xF145B6BECCDEA195, 0xDABF2AC8201752FC, 0x24C3C94DF9C8D3F6,
+    0xBB6E2924F03912EA, 0x0CE26C0B95C980D9, 0xA49CD132BFBF7CC4, 0xE99D662AF4243939,
+    0x27E6AD7891165C3F, 0x8535F040B9744FF1, 0x54B3F4FA5F40D873, 0x72B12C32127FED2B,
+    0xEE954D3C7B411F47, 0x9A85AC909A24EAA1, 0x70AC4CD9F04F21F5, 0xF9B89D3E99A075C2,
+    0x87B3E2B2B5C907B1, 0xA366E5B8C54F48B8, 0xAE4A9346CC3F7CF2, 0x1920C04D47267BBD,
+    0x87BF02C6B49E2AE9, 0x092237AC237F3859, 0xFF07F64EF8ED14D0, 0x8DE8DCA9F03CC54E,
+    0x9C1633264DB49C89, 0xB3F22C3D0B0B38ED, 0x390E5FB44D01144B, 0x5BFEA5B4712768E9,
+    0x1E1032911FA78984, 0x9A74ACB964E78CB3, 0x4F80F7A035DAFB04, 0x6304D09A0B3738C4,
+    0x2171E64683023A08, 0x5B9B63EB9CEFF80C, 0x506AACF489889342, 0x1881AFC9A3A701D6,
+    0x6503080440750644, 0xDFD395339CDBF4A7, 0xEF927DBCF00C20F2, 0x7B32F7D1E03680EC,
+    0xB9FD7620E7316243, 0x05A7E8A57DB91B77, 0xB5889C6E15630A75, 0x4A750A09CE9573F7,
+    0xCF464CEC899A2F8A, 0xF538639CE705B824, 0x3C79A0FF5580EF7F, 0xEDE6C87F8477609D,
+    0x799E81F05BC93F31, 0x86536B8CF3428A8C, 0x97D7374C60087B73, 0xA246637CFF328532,
+    0x043FCAE60CC0EBA0, 0x920E449535DD359E, 0x70EB093B15B290CC, 0x73A1921916591CBD,
+    0x56436C9FE1A1AA8D, 0xEFAC4B70633B8F81, 0xBB215798D45DF7AF, 0x45F20042F24F1768,
+    0x930F80F4E8EB7462, 0xFF6712FFCFD75EA1, 0xAE623FD67468AA70, 0xDD2C5BC84BC8D8FC,
+    0x7EED120D54CF2DD9, 0x22FE545401165F1C, 0xC91800E98FB99929, 0x808BD68E6AC10365,
+    0xDEC468145B7605F6, 0x1BEDE3A3AEF53302, 0x43539603D6C55602, 0xAA969B5C691CCB7A,
+    0xA87832D392EFEE56, 0x65942C7B3C7E11AE, 0xDED2D633CAD004F6, 0x21F08570F420E565,
+    0xB415938D7DA94E3C, 0x91B859E59ECB6350, 0x10CFF333E0ED804A, 0x28AED140BE0BB7DD,
+    0xC5CC1D89724FA456, 0x5648F680F11A2741, 0x2D255069F0B7DAB3, 0x9BC5A38EF729ABD4,
+    0xEF2F054308F6A2BC, 0xAF2042F5CC5C2858, 0x480412BAB7F5BE2A, 0xAEF3AF4A563DFE43,
+    0x19AFE59AE451497F, 0x52593803DFF1E840, 0xF4F076E65F2CE6F0, 0x11379625747D5AF3,
+    0xBCE5D2248682C115, 0x9DA4243DE836994F, 0x066F70B33FE09017, 0x4DC4DE189B671A1C,
+    0x51039AB7712457C3, 0xC07A3F80C31FB4B4, 0xB46EE9C5E64A6E7C, 0xB3819A42ABE61C87,
+    0x21A007933A522A20, 0x2DF16F761598AA4F, 0x763C4A1371B368FD, 0xF793C46702E086A0,
+    0xD7288E012AEB8D31, 0xDE336A2A4BC1C44B, 0x0BF692B38D079F23, 0x2C604A7A177326B3,
+    0x4850E73E03EB6064, 0xCFC447F1E53C8E1B, 0xB05CA3F564268D99, 0x9AE182C8BC9474E8,
+    0xA4FC4BD4FC5558CA, 0xE755178D58FC4E76, 0x69B97DB1A4C03DFE, 0xF9B5B7C4ACC67C96,
+    0xFC6A82D64B8655FB, 0x9C684CB6C4D24417, 0x8EC97D2917456ED0, 0x6703DF9D2924E97E,
+    0xC547F57E42A7444E, 0x78E37644E7CAD29E, 0xFE9A44E9362F05FA, 0x08BD35CC38336615,
+    0x9315E5EB3A129ACE, 0x94061B871E04DF75, 0xDF1D9F9D784BA010, 0x3BBA57B68871B59D,
+    0xD2B7ADEEDED1F73F, 0xF7A255D83BC373F8, 0xD7F4F2448C0CEB81, 0xD95BE88CD210FFA7,
+    0x336F52F8FF4728E7, 0xA74049DAC312AC71, 0xA2F61BB6E437FDB5, 0x4F2A5CB07F6A35B3,
+    0x87D380BDA5BF7859, 0x16B9F7E06C453A21, 0x7BA2484C8A0FD54E, 0xF3A678CAD9A2E38C,
+    0x39B0BF7DDE437BA2, 0xFCAF55C1BF8A4424, 0x18FCF680573FA594, 0x4C0563B89F495AC3,
+    0x40E087931A00930D, 0x8CFFA9412EB642C1, 0x68CA39053261169F, 0x7A1EE967D27579E2,
+    0x9D1D60E5076F5B6F, 0x3810E399B6F65BA2, 0x32095B6D4AB5F9B1, 0x35CAB62109DD038A,
+    0xA90B24499FCFAFB1, 0x77A225A07CC2C6BD, 0x513E5E634C70E331, 0x4361C0CA3F692F12,
+    0xD941ACA44B20A45B, 0x528F7C8602C5807B, 0x52AB92BEB9613989, 0x9D1DFA2EFC557F73,
+    0x722FF175F572C348, 0x1D1260A51107FE97, 0x7A249A57EC0C9BA2, 0x04208FE9E8F7F2D6,
+    0x5A110C6058B920A0, 0x0CD9A497658A5698, 0x56FD23C8F9715A4C, 0x284C847B9D887AAE,
+    0x04FEABFBBDB619CB, 0x742E1E651C60BA83, 0x9A9632E65904AD3C, 0x881B82A13B51B9E2,
+    0x506E6744CD974924, 0xB0183DB56FFC6A79, 0x0ED9B915C66ED37E, 0x5E11E86D5873D484,
+    0xF678647E3519AC6E, 0x1B85D488D0F20CC5, 0xDAB9FE6525D89021, 0x0D151D86ADB73615,
+    0xA865A54EDCC0F019, 0x93C42566AEF98FFB, 0x99E7AFEABE000731, 0x48CBFF086DDF285A,
+    0x7F9B6AF1EBF78BAF, 0x58627E1A149BBA21, 0x2CD16E2ABD791E33, 0xD363EFF5F0977996,
+    0x0CE2A38C344A6EED, 0x1A804AADB9CFA741, 0x907F30421D78C5DE, 0x501F65EDB3034D07,
+    0x37624AE5A48FA6E9, 0x957BAF61700CFF4E, 0x3A6C27934E31188A, 0xD49503536ABCA345,
+    0x088E049589C432E0, 0xF943AEE7FEBF21B8, 0x6C3B8E3E336139D3, 0x364F6FFA464EE52E,
+    0xD60F6DCEDC314222, 0x56963B0DCA418FC0, 0x16F50EDF91E513AF, 0xEF1955914B609F93,
+    0x565601C0364E3228, 0xECB53939887E8175, 0xBAC7A9A18531294B, 0xB344C470397BBA52,
+    0x65D34954DAF3CEBD, 0xB4B81B3FA97511E2, 0xB422061193D6F6A7, 0x071582401C38434D,
+    0x7A13F18BBEDC4FF5, 0xBC4097B116C524D2, 0x59B97885E2F2EA28, 0x99170A5DC3115544,
+    0x6F423357E7C6A9F9, 0x325928EE6E6F8794, 0xD0E4366228B03343, 0x565C31F7DE89EA27,
+    0x30F5611484119414, 0xD873DB391292ED4F, 0x7BD94E1D8E17DEBC, 0xC7D9F16864A76E94,
+    0x947AE053EE56E63C, 0xC8C93882F9475F5F, 0x3A9BF55BA91F81CA, 0xD9A11FBB3D9808E4,
+    0x0FD22063EDC29FCA, 0xB3F256D8ACA0B0B9, 0xB03031A8B4516E84, 0x35DD37D5871448AF,
+    0xE9F6082B05542E4E, 0xEBFAFA33D7254B59, 0x9255ABB50D532280, 0xB9AB4CE57F2D34F3,
+    0x693501D628297551, 0xC62C58F97DD949BF, 0xCD454F8F19C5126A, 0xBBE83F4ECC2BDECB,
+    0xDC842B7E2819E230, 0xBA89142E007503B8, 0xA3BC941D0A5061CB, 0xE9F6760E32CD8021,
+    0x09C7E552BC76492F, 0x852F54934DA55CC9, 0x8107FCCF064FCF56, 0x098954D51FFF6580,
+    0x23B70EDB1955C4BF, 0xC330DE426430F69D, 0x4715ED43E8A45C0A, 0xA8D7E4DAB780A08D,
+    0x0572B974F03CE0BB, 0xB57D2E985E1419C7, 0xE8D9ECBE2CF3D73F, 0x2FE4B17170E59750,
+    0x11317BA87905E790, 0x7FBF21EC8A1F45EC, 0x1725CABFCB045B00, 0x964E915CD5E2B207,
+    0x3E2B8BCBF016D66D, 0xBE7444E39328A0AC, 0xF85B2B4FBCDE44B7, 0x49353FEA39BA63B1,
+    0x1DD01AAFCD53486A, 0x1FCA8A92FD719F85, 0xFC7C95D827357AFA, 0x18A6A990C8B35EBD,
+    0xCCCB7005C6B9C28D, 0x3BDBB92C43B17F26, 0xAA70B5B4F89695A2, 0xE94C39A54A98307F,
+    0xB7A0B174CFF6F36E, 0xD4DBA84729AF48AD, 0x2E18BC1AD9704A68, 0x2DE0966DAF2F8B1C,
+    0xB9C11D5B1E43A07E, 0x64972D68DEE33360, 0x94628D38D0C20584, 0xDBC0D2B6AB90A559,
+    0xD2733C4335C6A72F, 0x7E75D99D94A70F4D, 0x6CED1983376FA72B, 0x97FCAACBF030BC24,
+    0x7B77497B32503B12, 0x8547EDDFB81CCB94, 0x79999CDFF70902CB, 0xCFFE1939438E9B24,
+    0x829626E3892D95D7, 0x92FAE24291F2B3F1, 0x63E22C147B9C3403, 0xC678B6D860284A1C,
+    0x5873888850659AE7, 0x0981DCD296A8736D, 0x9F65789A6509A440, 0x9FF38FED72E9052F,
+    0xE479EE5B9930578C, 0xE7F28ECD2D49EECD, 0x56C074A581EA17FE, 0x5544F7D774B14AEF,
+    0x7B3F0195FC6F290F, 0x12153635B2C0CF57, 0x7F5126DBBA5E0CA7, 0x7A76956C3EAFB413,
+    0x3D5774A11D31AB39, 0x8A1B083821F40CB4, 0x7B4A38E32537DF62, 0x950113646D1D6E03,
+    0x4DA8979A0041E8A9, 0x3BC36E078F7515D7, 0x5D0A12F27AD310D1, 0x7F9D1A2E1EBE1327,
+    0xDA3A361B1C5157B1, 0xDCDD7D20903D0C25, 0x36833336D068F707, 0xCE68341F79893389,
+    0xAB9090168DD05F34, 0x43954B3252DC25E5, 0xB438C2B67F98E5E9, 0x10DCD78E3851A492,
+    0xDBC27AB5447822BF, 0x9B3CDB65F82CA382, 0xB67B7896167B4C84, 0xBFCED1B0048EAC50,
+    0xA9119B60369FFEBD, 0x1FFF7AC80904BF45, 0xAC12FB171817EEE7, 0xAF08DA9177DDA93D,
+    0x1B0CAB936E65C744, 0xB559EB1D04E5E932, 0xC37B45B3F8D6F2BA, 0xC3A9DC228CAAC9E9,
+    0xF3B8B6675A6507FF, 0x9FC477DE4ED681DA, 0x67378D8ECCEF96CB, 0x6DD856D94D259236,
+    0xA319CE15B0B4DB31, 0x073973751F12DD5E, 0x8A8E849EB32781A5, 0xE1925C71285279F5,
+    0x74C04BF1790C0EFE, 0x4DDA48153C94938A, 0x9D266D6A1CC0542C, 0x7440FB816508C4FE,
+    0x13328503DF48229F, 0xD6BF7BAEE43CAC40, 0x4838D65F6EF6748F, 0x1E152328F3318DEA,
+    0x8F8419A348F296BF, 0x72C8834A5957B511, 0xD7A023A73260B45C, 0x94EBC8ABCFB56DAE,
+    0x9FC10D0F989993E0, 0xDE68A2355B93CAE6, 0xA44CFE79AE538BBE, 0x9D1D84FCCE371425,
+    0x51D2B1AB2DDFB636, 0x2FD7E4B9E72CD38C, 0x65CA5B96B7552210, 0xDD69A0D8AB3B546D,
+    0x604D51B25FBF70E2, 0x73AA8A564FB7AC9E, 0x1A8C1E992B941148, 0xAAC40A2703D9BEA0,
+    0x764DBEAE7FA4F3A6, 0x1E99B96E70A9BE8B, 0x2C5E9DEB57EF4743, 0x3A938FEE32D29981,
+    0x26E6DB8FFDF5ADFE, 0x469356C504EC9F9D, 0xC8763C5B08D1908C, 0x3F6C6AF859D80055,
+    0x7F7CC39420A3A545, 0x9BFB227EBDF4C5CE, 0x89039D79D6FC5C5C, 0x8FE88B57305E2AB6,
+    0xA09E8C8C35AB96DE, 0xFA7E393983325753, 0xD6B6D0ECC617C699, 0xDFEA21EA9E7557E3,
+    0xB67C1FA481680AF8, 0xCA1E3785A9E724E5, 0x1CFC8BED0D681639, 0xD18D8549D140CAEA,
+    0x4ED0FE7E9DC91335, 0xE4DBF0634473F5D2, 0x1761F93A44D5AEFE, 0x53898E4C3910DA55,
+    0x734DE8181F6EC39A, 0x2680B122BAA28D97, 0x298AF231C85BAFAB, 0x7983EED3740847D5,
+    0x66C1A2A1A60CD889, 0x9E17E49642A3E4C1, 0xEDB454E7BADC0805, 0x50B704CAB602C329,
+    0x4CC317FB9CDDD023, 0x66B4835D9EAFEA22, 0x219B97E26FFC81BD, 0x261E4E4C0A333A9D,
+    0x1FE2CCA76517DB90, 0xD7504DFA8816EDBB, 0xB9571FA04DC089C8, 0x1DDC0325259B27DE,
+    0xCF3F4688801EB9AA, 0xF4F5D05C10CAB243, 0x38B6525C21A42B0E, 0x36F60E2BA4FA6800,
+    0xEB3593803173E0CE, 0x9C4CD6257C5A3603, 0xAF0C317D32ADAA8A, 0x258E5A80C7204C4B,
+    0x8B889D624D44885D, 0xF4D14597E660F855, 0xD4347F66EC8941C3, 0xE699ED85B0DFB40D,
+    0x2472F6207C2D0484, 0xC2A1E7B5B459AEB5, 0xAB4F6451CC1D45EC, 0x63767572AE3D6174,
+    0xA59E0BD101731A28, 0x116D0016CB948F09, 0x2CF9C8CA052F6E9F, 0x0B090A7560A968E3,
+    0xABEEDDB2DDE06FF1, 0x58EFC10B06A2068D, 0xC6E57A78FBD986E0, 0x2EAB8CA63CE802D7,
+    0x14A195640116F336, 0x7C0828DD624EC390, 0xD74BBE77E6116AC7, 0x804456AF10F5FB53,
+    0xEBE9EA2ADF4321C7, 0x03219A39EE587A30, 0x49787FEF17AF9924, 0xA1E9300CD8520548,
+    0x5B45E522E4B1B4EF, 0xB49C3B3995091A36, 0xD4490AD526F14431, 0x12A8F216AF9418C2,
+    0x001F837CC7350524, 0x1877B51E57A764D5, 0xA2853B80F17F58EE, 0x993E1DE72D36D310,
+    0xB3598080CE64A656, 0x252F59CF0D9F04BB, 0xD23C8E176D113600, 0x1BDA0492E7E4586E,
+    0x21E0BD5026C619BF, 0x3B097ADAF088F94E, 0x8D14DEDB30BE846E, 0xF95CFFA23AF5F6F4,
+    0x3871700761B3F743, 0xCA672B91E9E4FA16, 0x64C8E531BFF53B55, 0x241260ED4AD1E87D,
+    0x106C09B972D2E822, 0x7FBA195410E5CA30, 0x7884D9BC6CB569D8, 0x0647DFEDCD894A29,
+    0x63573FF03E224774, 0x4FC8E9560F91B123, 0x1DB956E450275779, 0xB8D91274B9E9D4FB,
+    0xA2EBEE47E2FBFCE1, 0xD9F1F30CCD97FB09, 0xEFED53D75FD64E6B, 0x2E6D02C36017F67F,
+    0xA9AA4D20DB084E9B, 0xB64BE8D8B25396C1, 0x70CB6AF7C2D5BCF0, 0x98F076A4F7A2322E,
+    0xBF84470805E69B5F, 0x94C3251F06F90CF3, 0x3E003E616A6591E9, 0xB925A6CD0421AFF3,
+    0x61BDD1307C66E300, 0xBF8D5108E27E0D48, 0x240AB57A8B888B20, 0xFC87614BAF287E07,
+    0xEF02CDD06FFDB432, 0xA1082C0466DF6C0A, 0x8215E577001332C8, 0xD39BB9C3A48DB6CF,
+    0x2738259634305C14, 0x61CF4F94C97DF93D, 0x1B6BACA2AE4E125B, 0x758F450C88572E0B,
+    0x959F587D507A8359, 0xB063E962E045F54D, 0x60E8ED72C0DFF5D1, 0x7B64978555326F9F,
+    0xFD080D236DA814BA, 0x8C90FD9B083F4558, 0x106F72FE81E2C590, 0x7976033A39F7D952,
+    0xA4EC0132764CA04B, 0x733EA705FAE4FA77, 0xB4D8F77BC3E56167, 0x9E21F4F903B33FD9,
+    0x9D765E419FB69F6D, 0xD30C088BA61EA5EF, 0x5D94337FBFAF7F5B, 0x1A4E4822EB4D7A59,
+    0x6FFE73E81B637FB3, 0xDDF957BC36D8B9CA, 0x64D0E29EEA8838B3, 0x08DD9BDFD96B9F63,
+    0x087E79E5A57D1D13, 0xE328E230E3E2B3FB, 0x1C2559E30F0946BE, 0x720BF5F26F4D2EAA,
+    0xB0774D261CC609DB, 0x443F64EC5A371195, 0x4112CF68649A260E, 0xD813F2FAB7F5C5CA,
+    0x660D3257380841EE, 0x59AC2C7873F910A3, 0xE846963877671A17, 0x93B633ABFA3469F8,
+    0xC0C0F5A60EF4CDCF, 0xCAF21ECD4377B28C, 0x57277707199B8175, 0x506C11B9D90E8B1D,
+    0xD83CC2687A19255F, 0x4A29C6465A314CD1, 0xED2DF21216235097, 0xB5635C95FF7296E2,
+    0x22AF003AB672E811, 0x52E762596BF68235, 0x9AEBA33AC6ECC6B0, 0x944F6DE09134DFB6,
+    0x6C47BEC883A7DE39, 0x6AD047C430A12104, 0xA5B1CFDBA0AB4067, 0x7C45D833AFF07862,
+    0x5092EF950A16DA0B, 0x9338E69C052B8E7B, 0x455A4B4CFE30E3F5, 0x6B02E63195AD0CF8,
+    0x6B17B224BAD6BF27, 0xD1E0CCD25BB9C169, 0xDE0C89A556B9AE70, 0x50065E535A213CF6,
+    0x9C1169FA2777B874, 0x78EDEFD694AF1EED, 0x6DC93D9526A50E68, 0xEE97F453F06791ED,
+    0x32AB0EDB696703D3, 0x3A6853C7E70757A7, 0x31865CED6120F37D, 0x67FEF95D92607890,
+    0x1F2B1D1F15F6DC9C, 0xB69E38A8965C6B65, 0xAA9119FF184CCCF4, 0xF43C732873F24C13,
+    0xFB4A3D794A9A80D2, 0x3550C2321FD6109C, 0x371F77E76BB8417E, 0x6BFA9AAE5EC05779,
+    0xCD04F3FF001A4778, 0xE3273522064480CA, 0x9F91508BFFCFC14A, 0x049A7F41061A9E60,
+    0xFCB6BE43A9F2FE9B, 0x08DE8A1C7797DA9B, 0x8F9887E6078735A1, 0xB5B4071DBFC73A66,
+    0x230E343DFBA08D33, 0x43ED7F5A0FAE657D, 0x3A88A0FBBCB05C63, 0x21874B8B4D2DBC4F,
+    0x1BDEA12E35F6A8C9, 0x53C065C6C8E63528, 0xE34A1D250E7A8D6B, 0xD6B04D3B7651DD7E,
+    0x5E90277E7CB39E2D, 0x2C046F22062DC67D, 0xB10BB459132D0A26, 0x3FA9DDFB67E2F199,
+    0x0E09B88E1914F7AF, 0x10E8B35AF3EEAB37, 0x9EEDECA8E272B933, 0xD4C718BC4AE8AE5F,
+    0x81536D601170FC20, 0x91B534F885818A06, 0xEC8177F83F900978, 0x190E714FADA5156E,
+    0xB592BF39B0364963, 0x89C350C893AE7DC1, 0xAC042E70F8B383F2, 0xB49B52E587A1EE60,
+    0xFB152FE3FF26DA89, 0x3E666E6F69AE2C15, 0x3B544EBE544C19F9, 0xE805A1E290CF2456,
+    0x24B33C9D7ED25117, 0xE74733427B72F0C1, 0x0A804D18B7097475, 0x57E3306D881EDB4F,
+    0x4AE7D6A36EB5DBCB, 0x2D8D5432157064C8, 0xD1E649DE1E7F268B, 0x8A328A1CEDFE552C,
+    0x07A3AEC79624C7DA, 0x84547DDC3E203C94, 0x990A98FD5071D263, 0x1A4FF12616EEFC89,
+    0xF6F7FD1431714200, 0x30C05B1BA332F41C, 0x8D2636B81555A786, 0x46C9FEB55D120902,
+    0xCCEC0A73B49C9921, 0x4E9D2827355FC492, 0x19EBB029435DCB0F, 0x4659D2B743848A2C,
+    0x963EF2C96B33BE31, 0x74F85198B05A2E7D, 0x5A0F544DD2B1FB18, 0x03727073C2E134B1,
+    0xC7F6AA2DE59AEA61, 0x352787BAA0D7C22F, 0x9853EAB63B5E0B35, 0xABBDCDD7ED5C0860,
+    0xCF05DAF5AC8D77B0, 0x49CAD48CEBF4A71E, 0x7A4C10EC2158C4A6, 0xD9E92AA246BF719E,
+    0x13AE978D09FE5557, 0x730499AF921549FF, 0x4E4B705B92903BA4, 0xFF577222C14F0A3A,
+    0x55B6344CF97AAFAE, 0xB862225B055B6960, 0xCAC09AFBDDD2CDB4, 0xDAF8E9829FE96B5F,
+    0xB5FDFC5D3132C498, 0x310CB380DB6F7503, 0xE87FBB46217A360E, 0x2102AE466EBB1148,
+    0xF8549E1A3AA5E00D, 0x07A69AFDCC42261A, 0xC4C118BFE78FEAAE, 0xF9F4892ED96BD438,
+    0x1AF3DBE25D8F45DA, 0xF5B4B0B0D2DEEEB4, 0x962ACEEFA82E1C84, 0x046E3ECAAF453CE9,
+    0xF05D129681949A4C, 0x964781CE734B3C84, 0x9C2ED44081CE5FBD, 0x522E23F3925E319E,
+    0x177E00F9FC32F791, 0x2BC60A63A6F3B3F2, 0x222BBFAE61725606, 0x486289DDCC3D6780,
+    0x7DC7785B8EFDFC80, 0x8AF38731C02BA980, 0x1FAB64EA29A2DDF7, 0xE4D9429322CD065A,
+    0x9DA058C67844F20C, 0x24C0E332B70019B0, 0x233003B5A6CFE6AD, 0xD586BD01C5C217F6,
+    0x5E5637885F29BC2B, 0x7EBA726D8C94094B, 0x0A56A5F0BFE39272, 0xD79476A84EE20D06,
+    0x9E4C1269BAA4BF37, 0x17EFEE45B0DEE640, 0x1D95B0A5FCF90BC6, 0x93CBE0B699C2585D,
+    0x65FA4F227A2B6D79, 0xD5F9E858292504D5, 0xC2B5A03F71471A6F, 0x59300222B4561E00,
+    0xCE2F8642CA0712DC, 0x7CA9723FBB2E8988, 0x2785338347F2BA08, 0xC61BB3A141E50E8C,
+    0x150F361DAB9DEC26, 0x9F6A419D382595F4, 0x64A53DC924FE7AC9, 0x142DE49FFF7A7C3D,
+    0x0C335248857FA9E7, 0x0A9C32D5EAE45305, 0xE6C42178C4BBB92E, 0x71F1CE2490D20B07,
+    0xF1BCC3D275AFE51A, 0xE728E8C83C334074, 0x96FBF83A12884624, 0x81A1549FD6573DA5,
+    0x5FA7867CAF35E149, 0x56986E2EF3ED091B, 0x917F1DD5F8886C61, 0xD20D8C88C8FFE65F,
+    0x31D71DCE64B2C310, 0xF165B587DF898190, 0xA57E6339DD2CF3A0, 0x1EF6E6DBB1961EC9,
+    0x70CC73D90BC26E24, 0xE21A6B35DF0C3AD7, 0x003A93D8B2806962, 0x1C99DED33CB890A1,
+    0xCF3145DE0ADD4289, 0xD0E4427A5514FB72, 0x77C621CC9FB3A483, 0x67A34DAC4356550B,
+    0xF8D626AAAF278509
+]
+
 
 SAN_REGEX = re.compile(r"^([NBKRQ])?([a-h])?([1-8])?[\-x]?([a-h][1-8])(=?[nbrqkNBRQK])?[\+#]?\Z")
 
+# Parsed SAN tokens: piece type, origin file, origin rank, target square and
+# promotion piece type. Bounded, because tokens may come from untrusted input.
+_SAN_TOKENS: Dict[str, Tuple[Optional[PieceType], Optional[int], Optional[int], Square, Optional[PieceType]]] = {}
+_SAN_TOKENS_MAX = 10000
+
 FEN_CASTLING_REGEX = re.compile(r"^(?:-|[KQABCDEFGH]{0,2}[kqabcdefgh]{0,2})\Z")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Piece:
     """A piece with type and color."""
 
@@ -633,13 +875,16 @@ class Piece:
         return cls(PIECE_SYMBOLS.index(symbol.lower()), symbol.isupper())
 
 
-@dataclasses.dataclass(unsafe_hash=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Move:
     """
     Represents a move from a square to a square and possibly the promotion
     piece type.
 
     Drops and null moves are supported.
+
+    Moves are immutable and hashable. Move generation and
+    :func:`~chess.Move.from_uci()` return shared instances.
     """
 
     from_square: Square
@@ -675,6 +920,16 @@ class Move:
     def xboard(self) -> str:
         return self.uci() if self else "@@@@"
 
+    def encode(self) -> int:
+        """
+        Packs the move into a 16-bit integer
+        ``from_square | to_square << 6 | promotion << 12``.
+
+        Drops are encoded with equal source and target squares and the
+        dropped piece type in place of the promotion. The null move is ``0``.
+        """
+        return self.from_square | self.to_square << 6 | (self.promotion or self.drop or 0) << 12
+
     def __bool__(self) -> bool:
         return bool(self.from_square or self.to_square or self.promotion or self.drop)
 
@@ -691,6 +946,12 @@ class Move:
 
         :raises: :exc:`InvalidMoveError` if the UCI string is invalid.
         """
+        if cls is Move:
+            try:
+                return _UCI_MOVES[uci]
+            except KeyError:
+                pass
+
         if uci == "0000":
             return cls.null()
         elif len(uci) == 4 and "@" == uci[1]:
@@ -713,6 +974,31 @@ class Move:
         else:
             raise InvalidMoveError(f"expected uci string to be of length 4 or 5: {uci!r}")
 
+    @classmethod
+    def from_encoded(cls, code: int) -> Move:
+        """
+        Unpacks a move from an integer produced by
+        :func:`~chess.Move.encode()`.
+
+        :raises: :exc:`InvalidMoveError` if *code* is not a 16-bit integer
+            or the piece type is invalid.
+        """
+        if cls is Move:
+            try:
+                return _MOVES[code]
+            except KeyError:
+                pass
+
+        if not 0 <= code <= 0xffff or code >> 12 > KING:
+            raise InvalidMoveError(f"invalid encoded move: {code!r}")
+
+        from_square = code & 0x3f
+        to_square = code >> 6 & 0x3f
+        piece_type = code >> 12 or None
+        if from_square == to_square and piece_type:
+            return cls(to_square, to_square, drop=piece_type)
+        return cls(from_square, to_square, piece_type)
+
     @classmethod
     def null(cls) -> Move:
         """
@@ -727,7 +1013,29 @@ class Move:
         >>> bool(chess.Move.null())
         False
         """
-        return cls(0, 0)
+        return _MOVES[0] if cls is Move else cls(0, 0)
+
+def _move_table() -> Dict[int, Move]:
+    # Shared instances of all moves that any piece could possibly make,
+    # keyed by from_square | to_square << 6 | promotion << 12.
+    moves = {0: Move(0, 0)}
+    for from_square in SQUARES:
+        for to_square in scan_reversed(BB_KNIGHT_ATTACKS[from_square] | BB_RANK_ATTACKS[from_square][0] | BB_FILE_ATTACKS[from_square][0] | BB_DIAG_ATTACKS[from_square][0]):
+            moves[from_square | to_square << 6] = Move(from_square, to_square)
+            if BB_SQUARES[from_square] & (BB_RANK_2 | BB_RANK_7) and BB_SQUARES[to_square] & BB_BACKRANKS and square_distance(from_square, to_square) == 1:
+                for promotion in [KNIGHT, BISHOP, ROOK, QUEEN, KING]:
+                    moves[from_square | to_square << 6 | promotion << 12] = Move(from_square, to_square, promotion)
+    return moves
+
+_MOVES = _move_table()
+
+_UCI_MOVES = {move.uci(): move for move in _MOVES.values()}
+
+def _move(from_square: Square, to_square: Square, promotion: Optional[PieceType] = None) -> Move:
+    try:
+        return _MOVES[from_square | to_square << 6 | (promotion or 0) << 12]
+    except KeyError:
+        return Move(from_square, to_square, promotion)
 
 
 BaseBoardT = TypeVar("BaseBoardT", bound="BaseBoard")
@@ -741,8 +1049,12 @@ class BaseBoard:
     otherwise specified in the optional *board_fen* argument. If *board_fen*
     is ``None``, an empty board is created.
     """
+
+    __slots__ = ("occupied_co", "pawns", "knights", "bishops", "rooks", "queens", "kings", "promoted", "occupied", "_zobrist_board", "__weakref__")
+
     def __init__(self, board_fen: Optional[str] = STARTING_BOARD_FEN) -> None:
         self.occupied_co = [BB_EMPTY, BB_EMPTY]
+        self._zobrist_board: Optional[int] = None
 
         if board_fen is None:
             self._clear_board()
@@ -799,6 +1111,8 @@ class BaseBoard:
         self.occupied_co[BLACK] = BB_RANK_7 | BB_RANK_8
         self.occupied = BB_RANK_1 | BB_RANK_2 | BB_RANK_7 | BB_RANK_8
 
+        self._zobrist_board = None
+
     def reset_board(self) -> None:
         """
         Resets pieces to the starting position.
@@ -823,6 +1137,8 @@ class BaseBoard:
         self.occupied_co[BLACK] = BB_EMPTY
         self.occupied = BB_EMPTY
 
+        self._zobrist_board = 0
+
     def clear_board(self) -> None:
         """
         Clears the board.
@@ -849,6 +1165,19 @@ class BaseBoard:
 
         return bb & self.occupied_co[color]
 
+    def _board_zobrist_hash(self) -> int:
+        # The piece placement part of the Polyglot Zobrist hash. Kept up to
+        # date by _set_piece_at() and _remove_piece_at() once it has been
+        # computed.
+        if self._zobrist_board is None:
+            zobrist_hash = 0
+            for color, squares in enumerate(self.occupied_co):
+                for square in scan_reversed(squares):
+                    piece_type = typing.cast(PieceType, self.piece_type_at(square))
+                    zobrist_hash ^= POLYGLOT_RANDOM_ARRAY[128 * piece_type - 128 + 64 * color + square]
+            self._zobrist_board = zobrist_hash
+        return self._zobrist_board
+
     def pieces(self, piece_type: PieceType, color: Color) -> SquareSet:
         """
         Gets pieces of the given type and color.
@@ -1050,6 +1379,9 @@ class BaseBoard:
         piece_type = self.piece_type_at(square)
         mask = BB_SQUARES[square]
 
+        if piece_type and self._zobrist_board is not None:
+            self._zobrist_board ^= POLYGLOT_RANDOM_ARRAY[128 * piece_type - 128 + 64 * bool(self.occupied_co[WHITE] & mask) + square]
+
         if piece_type == PAWN:
             self.pawns ^= mask
         elif piece_type == KNIGHT:
@@ -1110,6 +1442,9 @@ class BaseBoard:
         if promoted:
             self.promoted ^= mask
 
+        if self._zobrist_board is not None:
+            self._zobrist_board ^= POLYGLOT_RANDOM_ARRAY[128 * piece_type - 128 + 64 * color + square]
+
     def set_piece_at(self, square: Square, piece: Optional[Piece], promoted: bool = False) -> None:
         """
         Sets a piece at the given square.
@@ -1305,6 +1640,7 @@ class BaseBoard:
         self.occupied_co[BLACK] = BB_RANK_7 | BB_RANK_8
         self.occupied = BB_RANK_1 | BB_RANK_2 | BB_RANK_7 | BB_RANK_8
         self.promoted = BB_EMPTY
+        self._zobrist_board = None
 
     def set_chess960_pos(self, scharnagl: int) -> None:
         """
@@ -1498,6 +1834,7 @@ class BaseBoard:
         self.occupied_co[BLACK] = f(self.occupied_co[BLACK])
         self.occupied = f(self.occupied)
         self.promoted = f(self.promoted)
+        self._zobrist_board = None
 
     def transform(self, f: Callable[[Bitboard], Bitboard]) -> Self:
         """
@@ -1550,6 +1887,7 @@ class BaseBoard:
         board.occupied_co[BLACK] = self.occupied_co[BLACK]
         board.occupied = self.occupied
         board.promoted = self.promoted
+        board._zobrist_board = self._zobrist_board
 
         return board
 
@@ -1584,9 +1922,85 @@ class BaseBoard:
         return board
 
 
+def _write_varint(data: bytearray, n: int) -> None:
+    # Unsigned LEB128.
+    while n > 0x7f:
+        data.append(n & 0x7f | 0x80)
+        n >>= 7
+    data.append(n)
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    n = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, offset
+        shift += 7
+
+def _piece_code(piece_type: PieceType, color: Color) -> int:
+    return piece_type | color << 3
+
+def _write_nibbles(data: bytearray, codes: List[int]) -> None:
+    # Two codes per byte, high nibble first.
+    for i in range(0, len(codes) - 1, 2):
+        data.append(codes[i] << 4 | codes[i + 1])
+    if len(codes) % 2:
+        data.append(codes[-1] << 4)
+
+def _read_nibbles(data: bytes, offset: int, n: int) -> Tuple[List[int], int]:
+    if len(data) < offset + (n + 1) // 2:
+        raise IndexError
+    codes = [data[offset + i // 2] >> (0 if i % 2 else 4) & 0xf for i in range(n)]
+    return codes, offset + (n + 1) // 2
+
 BoardT = TypeVar("BoardT", bound="Board")
 
+class _PositionAnalysis:
+    # King safety of the side to move, shared by move generation and check
+    # detection until the position changes. Slider blockers are only needed
+    # for move generation, so they are computed on demand, as is whether
+    # there are any legal moves at all (for game end detection). That also
+    # depends on castling rights and the en passant square, which can be
+    # assigned directly, so it is remembered together with them.
+
+    __slots__ = ("turn", "king", "checkers", "has_legal_moves", "has_legal_moves_for", "_blockers")
+
+    def __init__(self, board: Board) -> None:
+        self.turn = board.turn
+
+        king_mask = board.kings & board.occupied_co[board.turn]
+        if king_mask:
+            self.king: Optional[Square] = msb(king_mask)
+            self.checkers = board.attackers_mask(not board.turn, msb(king_mask))
+        else:
+            self.king = None
+            self.checkers = BB_EMPTY
+        self.has_legal_moves: Optional[bool] = None
+        self.has_legal_moves_for: Tuple[Bitboard, Optional[Square], bool] = (BB_EMPTY, None, False)
+        self._blockers: Optional[Bitboard] = None
+
+    def blockers(self, board: Board) -> Bitboard:
+        if self._blockers is None:
+            self._blockers = board._slider_blockers(self.king) if self.king is not None else BB_EMPTY
+        return self._blockers
+
 class _BoardState:
+    # A position on the move stack, linked to the previous one. Board copies
+    # share these, so they must not be modified once pushed (except for
+    # resolving the transposition key, which is the same for all copies).
+
+    __slots__ = (
+        "pawns", "knights", "bishops", "rooks", "queens", "kings",
+        "occupied_w", "occupied_b", "occupied", "promoted", "zobrist_board",
+        "turn", "castling_rights", "ep_square", "halfmove_clock", "fullmove_number",
+        "transposition_key", "analysis", "move", "previous",
+    )
+
+    move: Move
+    previous: Optional[_BoardState]
 
     def __init__(self, board: Board) -> None:
         self.pawns = board.pawns
@@ -1601,6 +2015,7 @@ class _BoardState:
         self.occupied = board.occupied
 
         self.promoted = board.promoted
+        self.zobrist_board = board._zobrist_board
 
         self.turn = board.turn
         self.castling_rights = board.castling_rights
@@ -1608,6 +2023,9 @@ class _BoardState:
         self.halfmove_clock = board.halfmove_clock
         self.fullmove_number = board.fullmove_number
 
+        self.transposition_key = board._repetition_key()
+        self.analysis = board._analysis if board._analysis is not None and board._analysis.turn == board.turn else None
+
     def restore(self, board: Board) -> None:
         board.pawns = self.pawns
         board.knights = self.knights
@@ -1621,6 +2039,7 @@ class _BoardState:
         board.occupied = self.occupied
 
         board.promoted = self.promoted
+        board._zobrist_board = self.zobrist_board
 
         board.turn = self.turn
         board.castling_rights = self.castling_rights
@@ -1628,6 +2047,64 @@ class _BoardState:
         board.halfmove_clock = self.halfmove_clock
         board.fullmove_number = self.fullmove_number
 
+        board._analysis = self.analysis
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Position:
+    """
+    An immutable snapshot of a position, as returned by
+    :func:`chess.Board.position()`.
+
+    Positions are hashable and can be used as keys in caches and sets.
+    The hash is the precomputed Polyglot :data:`~chess.Position.zobrist_hash`,
+    which also lets comparisons of different positions fail fast.
+
+    Like for :func:`chess.Board.is_repetition()`, move counters are not
+    part of the position, castling rights are cleaned, and the en passant
+    square is only kept if there is a legal en passant capture. Variant
+    specific state, like pockets or remaining checks, is not included.
+
+    >>> import chess
+    >>>
+    >>> board = chess.Board()
+    >>> start = board.position()
+    >>> for uci in ["g1f3", "g8f6", "f3g1", "f6g8"]:
+    ...     board.push(chess.Move.from_uci(uci))
+    >>> board.position() == start
+    True
+    >>> hex(start.zobrist_hash)
+    '0x463b96181691fc9c'
+    """
+
+    zobrist_hash: int
+    """The Polyglot Zobrist hash. See :func:`chess.Board.zobrist_hash()`."""
+
+    pawns: Bitboard
+    knights: Bitboard
+    bishops: Bitboard
+    rooks: Bitboard
+    queens: Bitboard
+    kings: Bitboard
+
+    occupied_w: Bitboard
+    """The white pieces."""
+
+    occupied_b: Bitboard
+    """The black pieces."""
+
+    turn: Color
+    """The side to move."""
+
+    castling_rights: Bitboard
+    """The cleaned castling rights. See :func:`chess.Board.clean_castling_rights()`."""
+
+    ep_square: Optional[Square]
+    """The en passant square, if there is a legal en passant capture."""
+
+    def __hash__(self) -> int:
+        return self.zobrist_hash
+
+
 class Board(BaseBoard):
     """
     A :class:`~chess.BaseBoard`, additional information representing
@@ -1652,6 +2129,11 @@ class Board(BaseBoard):
     :data:`~Board.ep_square`, :data:`~Board.halfmove_clock` and
     :data:`~Board.fullmove_number` directly.
 
+    Boards are slotted objects. On 64-bit CPython 3.11 a board takes about
+    600 bytes, plus about 500 bytes for each move on the move stack. Use
+    :func:`~chess.Board.copy()` with ``stack=False`` or
+    :func:`~chess.Board.clear_stack()` to keep many boards compact.
+
     .. warning::
         It is possible to set up and work with invalid positions. In this
         case, :class:`~chess.Board` implements a kind of "pseudo-chess"
@@ -1676,6 +2158,8 @@ class Board(BaseBoard):
     one_king: ClassVar[bool] = True
     captures_compulsory: ClassVar[bool] = False
 
+    __slots__ = ("turn", "castling_rights", "ep_square", "fullmove_number", "halfmove_clock", "chess960", "legal_move_cache", "_move_stack", "_stack", "_stack_size", "_analysis")
+
     turn: Color
     """The side to move (``chess.WHITE`` or ``chess.BLACK``)."""
 
@@ -1729,23 +2213,24 @@ class Board(BaseBoard):
     represented as king moves to the corresponding rook square.
     """
 
-    move_stack: List[Move]
+    legal_move_cache: Optional[LegalMoveCache]
     """
-    The move stack. Use :func:`Board.push() <chess.Board.push()>`,
-    :func:`Board.pop() <chess.Board.pop()>`,
-    :func:`Board.peek() <chess.Board.peek()>` and
-    :func:`Board.clear_stack() <chess.Board.clear_stack()>` for
-    manipulation.
+    An optional :class:`~chess.LegalMoveCache` to be used by
+    :data:`~chess.Board.legal_moves`. Defaults to ``None``. Copies of the
+    board share the cache.
     """
 
     def __init__(self, fen: Optional[str] = STARTING_FEN, *, chess960: bool = False) -> None:
+        self._analysis: Optional[_PositionAnalysis] = None
         BaseBoard.__init__(self, None)
 
         self.chess960 = chess960
+        self.legal_move_cache = None
 
         self.ep_square = None
-        self.move_stack = []
-        self._stack: List[_BoardState] = []
+        self._move_stack: Optional[List[Move]] = []
+        self._stack: Optional[_BoardState] = None
+        self._stack_size = 0
 
         if fen is None:
             self.clear()
@@ -1825,16 +2310,55 @@ class Board(BaseBoard):
         super().clear_board()
         self.clear_stack()
 
+    @property
+    def move_stack(self) -> List[Move]:
+        """
+        The move stack. Use :func:`Board.push() <chess.Board.push()>`,
+        :func:`Board.pop() <chess.Board.pop()>`,
+        :func:`Board.peek() <chess.Board.peek()>` and
+        :func:`Board.clear_stack() <chess.Board.clear_stack()>` for
+        manipulation.
+        """
+        if self._move_stack is None:
+            # Copies share their history with the original board. The list
+            # is only built when needed.
+            self._move_stack = [state.move for state in reversed(self._states())]
+        return self._move_stack
+
+    def _states(self, limit: Optional[int] = None) -> List[_BoardState]:
+        # States on the stack, starting with the most recent one.
+        states = []
+        state = self._stack
+        for _ in range(self._stack_size if limit is None else min(limit, self._stack_size)):
+            assert state is not None
+            states.append(state)
+            state = state.previous
+        return states
+
+    def _board_state(self) -> _BoardState:
+        return _BoardState(self)
+
     def clear_stack(self) -> None:
         """Clears the move stack."""
-        self.move_stack.clear()
-        self._stack.clear()
+        if self._move_stack is None:
+            self._move_stack = []
+        else:
+            self._move_stack.clear()
+        self._stack = None
+        self._stack_size = 0
+        self._analysis = None
+
+    def _analyze(self) -> _PositionAnalysis:
+        analysis = self._analysis
+        if analysis is None or analysis.turn != self.turn:
+            analysis = self._analysis = _PositionAnalysis(self)
+        return analysis
 
     def root(self) -> Self:
         """Returns a copy of the root position."""
-        if self._stack:
+        if self._stack_size:
             board = type(self)(None, chess960=self.chess960)
-            self._stack[0].restore(board)
+            self._states()[-1].restore(board)
             return board
         else:
             return self.copy(stack=False)
@@ -1868,7 +2392,7 @@ class Board(BaseBoard):
         for from_square in scan_reversed(non_pawns):
             moves = self.attacks_mask(from_square) & ~our_pieces & to_mask
             for to_square in scan_reversed(moves):
-                yield Move(from_square, to_square)
+                yield _MOVES[from_square | to_square << 6]
 
         # Generate castling moves.
         if from_mask & self.kings:
@@ -1887,13 +2411,14 @@ class Board(BaseBoard):
                 self.occupied_co[not self.turn] & to_mask)
 
             for to_square in scan_reversed(targets):
+                index = from_square | to_square << 6
                 if square_rank(to_square) in [0, 7]:
-                    yield Move(from_square, to_square, QUEEN)
-                    yield Move(from_square, to_square, ROOK)
-                    yield Move(from_square, to_square, BISHOP)
-                    yield Move(from_square, to_square, KNIGHT)
+                    yield _MOVES[index | QUEEN << 12]
+                    yield _MOVES[index | ROOK << 12]
+                    yield _MOVES[index | BISHOP << 12]
+                    yield _MOVES[index | KNIGHT << 12]
                 else:
-                    yield Move(from_square, to_square)
+                    yield _MOVES[index]
 
         # Prepare pawn advance generation.
         if self.turn == WHITE:
@@ -1909,19 +2434,20 @@ class Board(BaseBoard):
         # Generate single pawn moves.
         for to_square in scan_reversed(single_moves):
             from_square = to_square + (8 if self.turn == BLACK else -8)
+            index = from_square | to_square << 6
 
             if square_rank(to_square) in [0, 7]:
-                yield Move(from_square, to_square, QUEEN)
-                yield Move(from_square, to_square, ROOK)
-                yield Move(from_square, to_square, BISHOP)
-                yield Move(from_square, to_square, KNIGHT)
+                yield _MOVES[index | QUEEN << 12]
+                yield _MOVES[index | ROOK << 12]
+                yield _MOVES[index | BISHOP << 12]
+                yield _MOVES[index | KNIGHT << 12]
             else:
-                yield Move(from_square, to_square)
+                yield _MOVES[index]
 
         # Generate double pawn moves.
         for to_square in scan_reversed(double_moves):
             from_square = to_square + (16 if self.turn == BLACK else -16)
-            yield Move(from_square, to_square)
+            yield _MOVES[from_square | to_square << 6]
 
         # Generate en passant captures.
         if self.ep_square:
@@ -1940,7 +2466,7 @@ class Board(BaseBoard):
             BB_RANKS[4 if self.turn else 3])
 
         for capturer in scan_reversed(capturers):
-            yield Move(capturer, self.ep_square)
+            yield _MOVES[capturer | self.ep_square << 6]
 
     def generate_pseudo_legal_captures(self, from_mask: Bitboard = BB_ALL, to_mask: Bitboard = BB_ALL) -> Iterator[Move]:
         return itertools.chain(
@@ -1948,6 +2474,9 @@ class Board(BaseBoard):
             self.generate_pseudo_legal_ep(from_mask, to_mask))
 
     def checkers_mask(self) -> Bitboard:
+        if not self.kings & self.promoted:
+            return self._analyze().checkers
+
         king = self.king(self.turn)
         return BB_EMPTY if king is None else self.attackers_mask(not self.turn, king)
 
@@ -1968,23 +2497,61 @@ class Board(BaseBoard):
         Probes if the given move would put the opponent in check. The move
         must be at least pseudo-legal.
         """
-        self.push(move)
-        try:
-            return self.is_check()
-        finally:
-            self.pop()
+        king = self.king(not self.turn)
+        if king is None:
+            return False
+        if not move:
+            return self.is_attacked_by(self.turn, king)
+
+        move = self._to_chess960(move)
+        to_square = move.to_square
+        if move.drop:
+            piece_type: Optional[PieceType] = move.drop
+            moved = BB_EMPTY
+            occupied = self.occupied | BB_SQUARES[to_square]
+        else:
+            piece_type = self.piece_type_at(move.from_square)
+            moved = BB_SQUARES[move.from_square]
+            occupied = self.occupied & ~moved | BB_SQUARES[to_square]
+
+            if move.promotion:
+                piece_type = move.promotion
+            elif piece_type == KING and self.occupied_co[self.turn] & BB_SQUARES[to_square]:
+                # Castling. Only the rook can give direct check.
+                a_side = square_file(to_square) < square_file(move.from_square)
+                backrank = 0 if self.turn == WHITE else 7
+                king_to = square(2 if a_side else 6, backrank)
+                rook_to = square(3 if a_side else 5, backrank)
+                moved |= BB_SQUARES[to_square]
+                occupied = self.occupied & ~moved | BB_SQUARES[king_to] | BB_SQUARES[rook_to]
+                piece_type, to_square = ROOK, rook_to
+            elif self.is_en_passant(move):
+                occupied &= ~BB_SQUARES[to_square + (-8 if self.turn == WHITE else 8)]
+        assert piece_type is not None, f"gives_check() expects move to be pseudo-legal, but got {move} in {self.board_fen()}"
+
+        # Direct check by the moved piece.
+        if _piece_attacks(piece_type, self.turn, to_square, occupied) & BB_SQUARES[king]:
+            return True
+
+        # Discovered check by the other pieces.
+        return bool(self.attackers_mask(self.turn, king, occupied) & ~moved)
 
     def is_into_check(self, move: Move) -> bool:
         king = self.king(self.turn)
         if king is None:
             return False
 
+        analysis = self._analyze()
+        if analysis.king == king:
+            checkers, blockers = analysis.checkers, analysis.blockers(self)
+        else:
+            checkers, blockers = self.attackers_mask(not self.turn, king), self._slider_blockers(king)
+
         # If already in check, look if it is an evasion.
-        checkers = self.attackers_mask(not self.turn, king)
         if checkers and move not in self._generate_evasions(king, checkers, BB_SQUARES[move.from_square], BB_SQUARES[move.to_square]):
             return True
 
-        return not self._is_safe(king, self._slider_blockers(king), move)
+        return not self._is_safe(king, blockers, move)
 
     def was_into_check(self) -> bool:
         king = self.king(not self.turn)
@@ -2100,8 +2667,7 @@ class Board(BaseBoard):
         The game is not considered to be over by the
         :func:`fifty-move rule <chess.Board.can_claim_fifty_moves()>` or
         :func:`threefold repetition <chess.Board.can_claim_threefold_repetition()>`,
-        unless *claim_draw* is given. Note that checking the latter can be
-        slow.
+        unless *claim_draw* is given.
         """
         # Variant support.
         if self.is_variant_loss():
@@ -2116,7 +2682,7 @@ class Board(BaseBoard):
             return Outcome(Termination.CHECKMATE, not self.turn)
         if self.is_insufficient_material():
             return Outcome(Termination.INSUFFICIENT_MATERIAL, None)
-        if not any(self.generate_legal_moves()):
+        if not self._has_legal_moves():
             return Outcome(Termination.STALEMATE, None)
 
         # Automatic draws.
@@ -2139,7 +2705,7 @@ class Board(BaseBoard):
         if not self.is_check():
             return False
 
-        return not any(self.generate_legal_moves())
+        return not self._has_legal_moves()
 
     def is_stalemate(self) -> bool:
         """Checks if the current position is a stalemate."""
@@ -2149,7 +2715,7 @@ class Board(BaseBoard):
         if self.is_variant_end():
             return False
 
-        return not any(self.generate_legal_moves())
+        return not self._has_legal_moves()
 
     def is_insufficient_material(self) -> bool:
         """
@@ -2194,7 +2760,7 @@ class Board(BaseBoard):
         return True
 
     def _is_halfmoves(self, n: int) -> bool:
-        return self.halfmove_clock >= n and any(self.generate_legal_moves())
+        return self.halfmove_clock >= n and self._has_legal_moves()
 
     def is_seventyfive_moves(self) -> bool:
         """
@@ -2218,8 +2784,6 @@ class Board(BaseBoard):
         """
         Checks if the player to move can claim a draw by the fifty-move rule or
         by threefold repetition.
-
-        Note that checking the latter can be slow.
         """
         return self.can_claim_fifty_moves() or self.can_claim_threefold_repetition()
 
@@ -2262,37 +2826,19 @@ class Board(BaseBoard):
         board occurred for the third time or if such a repetition is reached
         with one of the possible legal moves.
 
-        Note that checking this can be slow: In the worst case
-        scenario, every legal move has to be tested and the entire game has to
-        be replayed because there is no incremental transposition table.
+        Earlier positions are looked up in the repetition history that is
+        recorded along with the move stack, but every legal move has to be
+        tested.
         """
-        transposition_key = self._transposition_key()
-        transpositions: Counter[Hashable] = collections.Counter()
-        transpositions.update((transposition_key, ))
-
-        # Count positions.
-        switchyard: List[Move] = []
-        while self.move_stack:
-            move = self.pop()
-            switchyard.append(move)
-
-            if self.is_irreversible(move):
-                break
-
-            transpositions.update((self._transposition_key(), ))
-
-        while switchyard:
-            self.push(switchyard.pop())
-
         # Threefold repetition occurred.
-        if transpositions[transposition_key] >= 3:
+        if self._count_repetitions(self._transposition_key(), 2) >= 2:
             return True
 
         # The next legal move is a threefold repetition.
         for move in self.generate_legal_moves():
             self.push(move)
             try:
-                if transpositions[self._transposition_key()] >= 2:
+                if self._count_repetitions(self._transposition_key(), 2) >= 2:
                     return True
             finally:
                 self.pop()
@@ -2308,45 +2854,73 @@ class Board(BaseBoard):
         this does not consider a repetition that can be played on the next
         move.
 
-        Note that checking this can be slow: In the worst case, the entire
-        game has to be replayed because there is no incremental transposition
-        table.
-        """
-        # Fast check, based on occupancy only.
-        maybe_repetitions = 1
-        for state in reversed(self._stack):
-            if state.occupied == self.occupied:
-                maybe_repetitions += 1
-                if maybe_repetitions >= count:
-                    break
-        if maybe_repetitions < count:
-            return False
-
-        # Check full replay.
-        transposition_key = self._transposition_key()
-        switchyard: List[Move] = []
+        Earlier positions are looked up in the repetition history that is
+        recorded along with the move stack.
+        """
+        if count <= 1:
+            return True
 
-        try:
-            while True:
-                if count <= 1:
-                    return True
+        if self._stack_size < count - 1:
+            return False
 
-                if len(self.move_stack) < count - 1:
-                    break
+        return self._count_repetitions(self._transposition_key(), count - 1) >= count - 1
 
-                move = self.pop()
-                switchyard.append(move)
+    def _repetition_key(self) -> Optional[Hashable]:
+        # Transposition key to record in the repetition history. Deferred
+        # (None) if there is a pseudo-legal en passant capture, because
+        # variants may have to make moves to test its legality.
+        if self.ep_square is not None and self.has_pseudo_legal_en_passant():
+            return None
+        return self._transposition_key()
+
+    def _count_repetitions(self, transposition_key: Hashable, limit: int) -> int:
+        # Counts earlier occurrences of the position with the given key,
+        # stopping early once the limit is reached. Positions before an
+        # irreversible move can never match, so scanning the entire history
+        # is equivalent to stopping at the last irreversible move.
+        repetitions = 0
+        deferred: Dict[int, _BoardState] = {}
+
+        state = self._stack
+        for size in range(self._stack_size - 1, -1, -1):
+            assert state is not None
+            if state.transposition_key is None:
+                if state.occupied == self.occupied:
+                    deferred[size] = state
+            elif state.transposition_key == transposition_key:
+                repetitions += 1
+                if repetitions >= limit:
+                    return repetitions
+            state = state.previous
+
+        if deferred:
+            # Replay to resolve deferred keys. They are stored in the
+            # history, so that this happens at most once per position.
+            resolved: Dict[int, Hashable] = {}
+            switchyard: List[Move] = []
+            try:
+                while self._stack_size > min(deferred):
+                    switchyard.append(self.pop())
+                    if self._stack_size in deferred:
+                        resolved[self._stack_size] = self._transposition_key()
+            finally:
+                while switchyard:
+                    self.push(switchyard.pop())
 
-                if self.is_irreversible(move):
-                    break
+            # Pushing the moves again created new states, so store the
+            # resolved keys in those.
+            state = self._stack
+            for size in range(self._stack_size - 1, min(deferred) - 1, -1):
+                assert state is not None
+                if size in resolved:
+                    state.transposition_key = resolved[size]
+                state = state.previous
 
-                if self._transposition_key() == transposition_key:
-                    count -= 1
-        finally:
-            while switchyard:
-                self.push(switchyard.pop())
+            for key in resolved.values():
+                if key == transposition_key:
+                    repetitions += 1
 
-        return False
+        return repetitions
 
     def _push_capture(self, move: Move, capture_square: Square, piece_type: PieceType, was_promoted: bool) -> None:
         pass
@@ -2376,10 +2950,58 @@ class Board(BaseBoard):
         """
         # Push move and remember board state.
         move = self._to_chess960(move)
-        board_state = _BoardState(self)
+        board_state = self._board_state()
         self.castling_rights = self.clean_castling_rights()  # Before pushing stack
-        self.move_stack.append(self._from_chess960(self.chess960, move.from_square, move.to_square, move.promotion, move.drop))
-        self._stack.append(board_state)
+        board_state.move = self._from_chess960(self.chess960, move.from_square, move.to_square, move.promotion, move.drop)
+        board_state.previous = self._stack
+        if self._move_stack is not None:
+            self._move_stack.append(board_state.move)
+        self._stack = board_state
+        self._stack_size += 1
+        self._make_move(move)
+
+    def push_many(self, moves: Iterable[Move], *, validate: bool = False, stack: bool = True, ply: Optional[int] = None) -> None:
+        """
+        Pushes a sequence of *moves*, as if by calling :func:`~chess.Board.push()`
+        for each of them. This is the fast way to replay a known game.
+
+        >>> import chess
+        >>>
+        >>> board = chess.Board()
+        >>> board.push_many(map(chess.Move.from_uci, ["e2e4", "e7e5", "g1f3"]))
+        >>> board.fen()
+        'rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2'
+
+        Moves are not checked for legality, unless *validate* is set.
+
+        If *stack* is ``False``, no snapshots of the intermediate positions
+        are taken. This is considerably faster, but the move stack is cleared,
+        as if the resulting position had been set up from a FEN.
+
+        If *ply* is given, replaying stops as soon as
+        :func:`~chess.Board.ply()` reaches it. Remaining moves are ignored.
+
+        :raises: :exc:`IllegalMoveError` if *validate* is set and a move is
+            neither legal nor a null move. Moves before it remain pushed.
+        """
+        if not stack:
+            self.castling_rights = self.clean_castling_rights()
+            self.clear_stack()
+
+        for move in moves:
+            if ply is not None and self.ply() >= ply:
+                break
+            if validate and move and not self.is_legal(move):
+                raise IllegalMoveError(f"illegal move {move} in {self.fen()}")
+            if stack:
+                self.push(move)
+            else:
+                self._make_move(self._to_chess960(move))
+
+    def _make_move(self, move: Move) -> None:
+        # Updates the position, without touching the move stack. Variants
+        # override this (rather than push) to maintain additional state.
+        self._analysis = None
 
         # Reset en passant square.
         ep_square = self.ep_square
@@ -2478,9 +3100,17 @@ class Board(BaseBoard):
 
         :raises: :exc:`IndexError` if the move stack is empty.
         """
-        move = self.move_stack.pop()
-        self._stack.pop().restore(self)
-        return move
+        board_state = self._stack
+        if board_state is None:
+            raise IndexError("pop from empty move stack")
+
+        self._stack_size -= 1
+        self._stack = board_state.previous if self._stack_size else None
+        if self._move_stack is not None:
+            self._move_stack.pop()
+
+        board_state.restore(self)
+        return board_state.move
 
     def peek(self) -> Move:
         """
@@ -2488,7 +3118,9 @@ class Board(BaseBoard):
 
         :raises: :exc:`IndexError` if the move stack is empty.
         """
-        return self.move_stack[-1]
+        if self._stack is None:
+            raise IndexError("peek into empty move stack")
+        return self._stack.move
 
     def find_move(self, from_square: Square, to_square: Square, promotion: Optional[PieceType] = None) -> Move:
         """
@@ -2788,6 +3420,143 @@ class Board(BaseBoard):
 
         return super().chess960_pos()
 
+    def to_bytes(self) -> bytes:
+        """
+        Gets a compact binary representation of the position, typically
+        24 to 32 bytes long, as an alternative to :func:`~chess.Board.fen()`.
+
+        Like FEN, it does not include the move stack or the
+        :data:`~chess.Board.chess960` flag. Unlike FEN, the en passant square
+        and castling rights are stored as they are, even if en passant is
+        not possible or castling rights are not clean.
+
+        The format starts with a flags byte (turn, and whether an en passant
+        square, castling rights or promoted pieces are present), followed by
+        the occupied squares as a 64-bit big-endian integer and a nibble for
+        each occupied square (piece type, plus 8 for white), in ascending
+        square order. Then the optional en passant square, castling rights
+        (back rank masks) and promoted mask, and the move counters as
+        unsigned LEB128 integers. Variants append their additional state.
+
+        >>> import chess
+        >>>
+        >>> len(chess.Board().to_bytes())
+        29
+        """
+        data = bytearray()
+        self._write_bytes(data)
+        return bytes(data)
+
+    def _write_bytes(self, data: bytearray) -> None:
+        castling_rights = self.castling_rights & BB_BACKRANKS
+        promoted = self.promoted & self.occupied
+
+        data.append(
+            self.turn |
+            (self.ep_square is not None) << 1 |
+            bool(castling_rights) << 2 |
+            bool(promoted) << 3)
+        data += self.occupied.to_bytes(8, "big")
+
+        white = self.occupied_co[WHITE]
+        codes: List[int] = []
+        for square in scan_forward(self.occupied):
+            piece_type = self.piece_type_at(square)
+            assert piece_type is not None
+            codes.append(_piece_code(piece_type, bool(white & BB_SQUARES[square])))
+        _write_nibbles(data, codes)
+
+        if self.ep_square is not None:
+            data.append(self.ep_square)
+        if castling_rights:
+            data.append(castling_rights & 0xff)
+            data.append(castling_rights >> 56)
+        if promoted:
+            data += promoted.to_bytes(8, "big")
+
+        _write_varint(data, self.halfmove_clock)
+        _write_varint(data, self.fullmove_number)
+
+    def set_bytes(self, data: bytes) -> None:
+        """
+        Sets up the position from its binary representation. See
+        :func:`~chess.Board.to_bytes()`.
+
+        Also clears the move stack.
+
+        :raises: :exc:`ValueError` if *data* is invalid.
+        """
+        try:
+            offset, apply = self._read_bytes(data, 0)
+        except IndexError:
+            raise ValueError(f"truncated binary position: {data!r}")
+        if offset != len(data):
+            raise ValueError(f"unexpected trailing data in binary position: {data!r}")
+        apply()
+        self.clear_stack()
+
+    def _read_bytes(self, data: bytes, offset: int) -> Tuple[int, Callable[[], None]]:
+        # Validates the binary position without modifying the board. Returns
+        # the offset after it, and a function to set it up.
+        flags = data[offset]
+        if flags & ~0xf:
+            raise ValueError(f"invalid flags in binary position: {data!r}")
+        if len(data) < offset + 9:
+            raise IndexError
+        occupied = int.from_bytes(data[offset + 1:offset + 9], "big")
+        offset += 9
+
+        bitboards = [BB_EMPTY] * 8
+        white = BB_EMPTY
+        for i, square in enumerate(scan_forward(occupied)):
+            code = data[offset + i // 2] >> (0 if i % 2 else 4) & 0xf
+            if not KING >= code & 7 >= PAWN:
+                raise ValueError(f"invalid piece code {code} in binary position: {data!r}")
+            bitboards[code & 7] |= BB_SQUARES[square]
+            if code & 8:
+                white |= BB_SQUARES[square]
+        offset += (popcount(occupied) + 1) // 2
+
+        ep_square = None
+        if flags & 2:
+            ep_square = data[offset]
+            offset += 1
+            if ep_square >= 64:
+                raise ValueError(f"invalid en passant square in binary position: {data!r}")
+        castling_rights = BB_EMPTY
+        if flags & 4:
+            castling_rights = data[offset] | data[offset + 1] << 56
+            offset += 2
+        promoted = BB_EMPTY
+        if flags & 8:
+            if len(data) < offset + 8:
+                raise IndexError
+            promoted = int.from_bytes(data[offset:offset + 8], "big") & occupied
+            offset += 8
+        halfmove_clock, offset = _read_varint(data, offset)
+        fullmove_number, offset = _read_varint(data, offset)
+
+        def apply() -> None:
+            self.pawns = bitboards[PAWN]
+            self.knights = bitboards[KNIGHT]
+            self.bishops = bitboards[BISHOP]
+            self.rooks = bitboards[ROOK]
+            self.queens = bitboards[QUEEN]
+            self.kings = bitboards[KING]
+            self.occupied_co[WHITE] = white
+            self.occupied_co[BLACK] = occupied & ~white
+            self.occupied = occupied
+            self.promoted = promoted
+            self._zobrist_board = None
+
+            self.turn = bool(flags & 1)
+            self.ep_square = ep_square
+            self.castling_rights = castling_rights
+            self.halfmove_clock = halfmove_clock
+            self.fullmove_number = max(fullmove_number, 1)
+
+        return offset, apply
+
     def _epd_operations(self, operations: Mapping[str, Union[None, str, int, float, Move, Iterable[Move]]]) -> str:
         epd: List[str] = []
         first_op = True
@@ -3040,6 +3809,12 @@ class Board(BaseBoard):
         return self._algebraic_and_push(move)
 
     def _algebraic(self, move: Move, *, long: bool = False) -> str:
+        # Without variant end conditions, only checks need a look ahead.
+        if (type(self).is_variant_loss is Board.is_variant_loss and
+                type(self).is_variant_win is Board.is_variant_win and
+                not self.gives_check(move)):
+            return self._algebraic_without_suffix(move, long=long)
+
         san = self._algebraic_and_push(move, long=long)
         self.pop()
         return san
@@ -3049,16 +3824,19 @@ class Board(BaseBoard):
 
         # Look ahead for check or checkmate.
         self.push(move)
+        return san + self._algebraic_suffix(move)
+
+    def _algebraic_suffix(self, move: Move) -> str:
+        # Check or checkmate suffix for the move that has just been made.
         is_check = self.is_check()
         is_checkmate = (is_check and self.is_checkmate()) or self.is_variant_loss() or self.is_variant_win()
 
-        # Add check or checkmate suffix.
         if is_checkmate and move:
-            return san + "#"
+            return "#"
         elif is_check and move:
-            return san + "+"
+            return "+"
         else:
-            return san
+            return ""
 
     def _algebraic_without_suffix(self, move: Move, *, long: bool = False) -> str:
         # Null move.
@@ -3099,7 +3877,7 @@ class Board(BaseBoard):
             from_mask = self.pieces_mask(piece_type, self.turn)
             from_mask &= ~BB_SQUARES[move.from_square]
             to_mask = BB_SQUARES[move.to_square]
-            for candidate in self.generate_legal_moves(from_mask, to_mask):
+            for candidate in self._san_candidates(piece_type, from_mask, to_mask):
                 others |= BB_SQUARES[candidate.from_square]
 
             # Disambiguate.
@@ -3146,21 +3924,56 @@ class Board(BaseBoard):
 
         :raises: :exc:`IllegalMoveError` if any moves in the sequence are illegal.
         """
+        turn = self.turn
+        fullmove_number = self.fullmove_number
+        san: List[str] = []
+
+        for move_san in self.san_line(variation):
+            if turn == WHITE:
+                san.append(f"{fullmove_number}. {move_san}")
+            elif not san:
+                san.append(f"{fullmove_number}...{move_san}")
+            else:
+                san.append(move_san)
+
+            if turn == BLACK:
+                fullmove_number += 1
+            turn = not turn
+
+        return " ".join(san)
+
+    def san_line(self, moves: Iterable[Move]) -> List[str]:
+        """
+        Gets the standard algebraic notation of each move in a sequence,
+        starting from the current position.
+
+        >>> import chess
+        >>>
+        >>> board = chess.Board()
+        >>> board.san_line([chess.Move.from_uci("e2e4"), chess.Move.from_uci("e7e5")])
+        ['e4', 'e5']
+
+        This is faster than calling :func:`~chess.Board.san()` and
+        :func:`~chess.Board.push()` for each move. The board will not be
+        modified as a result of calling this.
+
+        :raises: :exc:`IllegalMoveError` if any moves in the sequence are illegal.
+        """
+        # Work on a copy without history. The moves are never taken back, so
+        # no snapshots are needed, and the position analysis of each ply is
+        # reused to validate and disambiguate the next move.
         board = self.copy(stack=False)
         san: List[str] = []
 
-        for move in variation:
+        for move in moves:
             if not board.is_legal(move):
                 raise IllegalMoveError(f"illegal move {move} in position {board.fen()}")
 
-            if board.turn == WHITE:
-                san.append(f"{board.fullmove_number}. {board.san_and_push(move)}")
-            elif not san:
-                san.append(f"{board.fullmove_number}...{board.san_and_push(move)}")
-            else:
-                san.append(board.san_and_push(move))
+            move_san = board._algebraic_without_suffix(move)
+            board._make_move(board._to_chess960(move))
+            san.append(move_san + board._algebraic_suffix(move))
 
-        return " ".join(san)
+        return san
 
     def parse_san(self, san: str) -> Move:
         """
@@ -3190,38 +4003,43 @@ class Board(BaseBoard):
             raise IllegalMoveError(f"illegal san: {san!r} in {self.fen()}")
 
         # Match normal moves.
-        match = SAN_REGEX.match(san)
-        if not match:
-            # Null moves.
-            if san in ["--", "Z0", "0000", "@@@@"]:
-                return Move.null()
-            elif "," in san:
-                raise InvalidMoveError(f"unsupported multi-leg move: {san!r}")
-            else:
-                raise InvalidMoveError(f"invalid san: {san!r}")
+        token = _SAN_TOKENS.get(san)
+        if token is None:
+            match = SAN_REGEX.match(san)
+            if not match:
+                # Null moves.
+                if san in ["--", "Z0", "0000", "@@@@"]:
+                    return Move.null()
+                elif "," in san:
+                    raise InvalidMoveError(f"unsupported multi-leg move: {san!r}")
+                else:
+                    raise InvalidMoveError(f"invalid san: {san!r}")
+
+            p = match.group(5)
+            token = (
+                PIECE_SYMBOLS.index(match.group(1).lower()) if match.group(1) else None,
+                FILE_NAMES.index(match.group(2)) if match.group(2) else None,
+                int(match.group(3)) - 1 if match.group(3) else None,
+                SQUARE_NAMES.index(match.group(4)),
+                PIECE_SYMBOLS.index(p[-1].lower()) if p else None,
+            )
+            if len(_SAN_TOKENS) < _SAN_TOKENS_MAX:
+                _SAN_TOKENS[san] = token
+
+        piece_type, from_file, from_rank, to_square, promotion = token
 
         # Get target square. Mask our own pieces to exclude castling moves.
-        to_square = SQUARE_NAMES.index(match.group(4))
         to_mask = BB_SQUARES[to_square] & ~self.occupied_co[self.turn]
 
-        # Get the promotion piece type.
-        p = match.group(5)
-        promotion = PIECE_SYMBOLS.index(p[-1].lower()) if p else None
-
         # Filter by original square.
         from_mask = BB_ALL
-        from_file = None
-        from_rank = None
-        if match.group(2):
-            from_file = FILE_NAMES.index(match.group(2))
+        if from_file is not None:
             from_mask &= BB_FILES[from_file]
-        if match.group(3):
-            from_rank = int(match.group(3)) - 1
+        if from_rank is not None:
             from_mask &= BB_RANKS[from_rank]
 
         # Filter by piece type.
-        if match.group(1):
-            piece_type = PIECE_SYMBOLS.index(match.group(1).lower())
+        if piece_type:
             from_mask &= self.pieces_mask(piece_type, self.turn)
         elif from_file is not None and from_rank is not None:
             # Allow fully specified moves, even if they are not pawn moves,
@@ -3240,7 +4058,7 @@ class Board(BaseBoard):
 
         # Match legal moves.
         matched_move = None
-        for move in self.generate_legal_moves(from_mask, to_mask):
+        for move in self._san_candidates(piece_type, from_mask, to_mask):
             if move.promotion != promotion:
                 continue
 
@@ -3254,6 +4072,25 @@ class Board(BaseBoard):
 
         return matched_move
 
+    def _san_candidates(self, piece_type: Optional[PieceType], from_mask: Bitboard, to_mask: Bitboard) -> Iterator[Move]:
+        # Legal piece moves to a single square, looked up by attacking the
+        # target square with the piece type, rather than generated.
+        analysis = self._analyze()
+        king = analysis.king
+        if (not piece_type or not to_mask or king is None or analysis.checkers or
+                type(self).generate_legal_moves is not Board.generate_legal_moves or
+                type(self).generate_pseudo_legal_moves is not Board.generate_pseudo_legal_moves or
+                self.is_variant_end()):
+            yield from self.generate_legal_moves(from_mask, to_mask)
+            return
+
+        to_square = msb(to_mask)
+        for from_square in scan_reversed(from_mask & _piece_attacks(piece_type, self.turn, to_square, self.occupied)):
+            move = _MOVES[from_square | to_square << 6]
+            # Pieces not aligned with the king can not be pinned.
+            if (from_square != king and not BB_RAYS[king][from_square]) or self._is_safe(king, analysis.blockers(self), move):
+                yield move
+
     def push_san(self, san: str) -> Move:
         """
         Parses a move in standard algebraic notation, makes the move and puts
@@ -3331,6 +4168,22 @@ class Board(BaseBoard):
         self.push(move)
         return move
 
+    def push_encoded(self, code: int) -> Move:
+        """
+        Makes an :func:`encoded move <chess.Move.encode()>`, as given by
+        :func:`~chess.Board.legal_moves_array()`, and puts it on the move
+        stack.
+
+        Returns the move.
+
+        .. warning::
+            Like :func:`~chess.Board.push()`, this does not check the move
+            for legality.
+        """
+        move = Move.from_encoded(code)
+        self.push(move)
+        return move
+
     def xboard(self, move: Move, chess960: Optional[bool] = None) -> str:
         if chess960 is None:
             chess960 = self.chess960
@@ -3408,7 +4261,7 @@ class Board(BaseBoard):
         Returns valid castling rights filtered from
         :data:`~chess.Board.castling_rights`.
         """
-        if self._stack:
+        if self._stack_size:
             # No new castling rights are assigned in a game, so we can assume
             # they were filtered already.
             return self.castling_rights
@@ -3729,7 +4582,7 @@ class Board(BaseBoard):
 
         if BB_SQUARES[king] & from_mask:
             for to_square in scan_reversed(BB_KING_ATTACKS[king] & ~self.occupied_co[self.turn] & ~attacked & to_mask):
-                yield Move(king, to_square)
+                yield _MOVES[king | to_square << 6]
 
         checker = msb(checkers)
         if BB_SQUARES[checker] == checkers:
@@ -3749,11 +4602,11 @@ class Board(BaseBoard):
         if self.is_variant_end():
             return
 
-        king_mask = self.kings & self.occupied_co[self.turn]
-        if king_mask:
-            king = msb(king_mask)
-            blockers = self._slider_blockers(king)
-            checkers = self.attackers_mask(not self.turn, king)
+        analysis = self._analyze()
+        king = analysis.king
+        if king is not None:
+            blockers = analysis.blockers(self)
+            checkers = analysis.checkers
             if checkers:
                 for move in self._generate_evasions(king, checkers, from_mask, to_mask):
                     if self._is_safe(king, blockers, move):
@@ -3778,6 +4631,144 @@ class Board(BaseBoard):
             self.generate_legal_moves(from_mask, to_mask & self.occupied_co[not self.turn]),
             self.generate_legal_ep(from_mask, to_mask))
 
+    def legal_moves_array(self, from_mask: Bitboard = BB_ALL, to_mask: Bitboard = BB_ALL) -> array.array[int]:
+        """
+        Gets the legal moves as an unsigned 16-bit integer array of
+        :func:`encoded moves <chess.Move.encode()>`.
+
+        This is a compact alternative to :data:`~chess.Board.legal_moves`,
+        for example to count, index or send moves to other processes.
+
+        >>> import chess
+        >>>
+        >>> board = chess.Board()
+        >>> moves = board.legal_moves_array()
+        >>> len(moves)
+        20
+        >>> chess.Move.from_encoded(moves[0])
+        Move.from_uci('g1h3')
+        """
+        return array.array("H", map(Move.encode, self.generate_legal_moves(from_mask, to_mask)))
+
+    def _count_legal_moves(self) -> int:
+        analysis = self._analyze()
+        king = analysis.king
+
+        # Enumerate evasions and variant rules. List conversion is faster
+        # than iterating.
+        if (king is None or analysis.checkers or
+                type(self).generate_legal_moves is not Board.generate_legal_moves or
+                type(self).generate_pseudo_legal_moves is not Board.generate_pseudo_legal_moves):
+            return len(list(self.generate_legal_moves()))
+
+        if self.is_variant_end():
+            return 0
+
+        our_pieces = self.occupied_co[self.turn]
+        blockers = analysis.blockers(self)
+        count = 0
+
+        # Piece moves. Pinned pieces can only move along the pin.
+        for from_square in scan_reversed(our_pieces & ~self.pawns & ~BB_SQUARES[king]):
+            moves = self.attacks_mask(from_square) & ~our_pieces
+            if BB_SQUARES[from_square] & blockers:
+                moves &= ray(king, from_square)
+            count += popcount(moves)
+
+        # King moves.
+        for to_square in scan_reversed(BB_KING_ATTACKS[king] & ~our_pieces):
+            if not self.is_attacked_by(not self.turn, to_square):
+                count += 1
+
+        count += len(list(self.generate_castling_moves()))
+
+        # Moves of pinned pawns and en passant captures.
+        pawns = self.pawns & our_pieces
+        if pawns & blockers:
+            count += len([move for move in self.generate_pseudo_legal_moves(pawns & blockers)
+                          if not self.is_en_passant(move) and self._is_safe(king, blockers, move)])
+        count += len(list(self.generate_legal_ep()))
+
+        # Remaining pawn moves. Moves to the backrank count once for each
+        # promotion.
+        pawns &= ~blockers
+        if self.turn == WHITE:
+            targets = [
+                pawns << 7 & ~BB_FILE_H & self.occupied_co[BLACK],
+                pawns << 9 & ~BB_FILE_A & self.occupied_co[BLACK],
+            ]
+            single_moves = pawns << 8 & ~self.occupied
+            double_moves = single_moves << 8 & ~self.occupied & (BB_RANK_3 | BB_RANK_4)
+        else:
+            targets = [
+                pawns >> 9 & ~BB_FILE_H & self.occupied_co[WHITE],
+                pawns >> 7 & ~BB_FILE_A & self.occupied_co[WHITE],
+            ]
+            single_moves = pawns >> 8 & ~self.occupied
+            double_moves = single_moves >> 8 & ~self.occupied & (BB_RANK_6 | BB_RANK_5)
+        targets.append(single_moves & BB_ALL)
+
+        for moves in targets:
+            count += popcount(moves & ~BB_BACKRANKS) + 4 * popcount(moves & BB_BACKRANKS)
+
+        return count + popcount(double_moves)
+
+    def _has_legal_moves(self) -> bool:
+        # Variant rules may depend on state that does not invalidate the
+        # position analysis (like pockets or remaining checks), so only
+        # standard rules are cached.
+        if (type(self).generate_legal_moves is not Board.generate_legal_moves or
+                type(self).generate_pseudo_legal_moves is not Board.generate_pseudo_legal_moves or
+                type(self).is_variant_end is not Board.is_variant_end):
+            return any(self.generate_legal_moves())
+
+        analysis = self._analyze()
+        state = (self.castling_rights, self.ep_square, self.chess960)
+        if analysis.has_legal_moves is None or analysis.has_legal_moves_for != state:
+            analysis.has_legal_moves = self._find_legal_move(analysis)
+            analysis.has_legal_moves_for = state
+        return analysis.has_legal_moves
+
+    def _find_legal_move(self, analysis: _PositionAnalysis) -> bool:
+        king = analysis.king
+        if king is None or analysis.checkers:
+            # Evasions start with king moves.
+            return any(self.generate_legal_moves())
+
+        our_pieces = self.occupied_co[self.turn]
+
+        # King moves.
+        for to_square in scan_reversed(BB_KING_ATTACKS[king] & ~our_pieces):
+            if not self.is_attacked_by(not self.turn, to_square):
+                return True
+
+        # Unpinned pieces.
+        blockers = analysis.blockers(self)
+        pieces = our_pieces & ~self.pawns & ~BB_SQUARES[king]
+        for from_square in scan_reversed(pieces & ~blockers):
+            if self.attacks_mask(from_square) & ~our_pieces:
+                return True
+
+        # Unpinned pawns. Double moves require a single move.
+        pawns = self.pawns & our_pieces & ~blockers
+        if self.turn == WHITE:
+            if (pawns << 8 & ~self.occupied |
+                    (pawns << 7 & ~BB_FILE_H | pawns << 9 & ~BB_FILE_A) & self.occupied_co[BLACK]) & BB_ALL:
+                return True
+        else:
+            if (pawns >> 8 & ~self.occupied |
+                    (pawns >> 9 & ~BB_FILE_H | pawns >> 7 & ~BB_FILE_A) & self.occupied_co[WHITE]):
+                return True
+
+        # Pinned pieces can only move along the pin.
+        for from_square in scan_reversed(pieces & blockers):
+            if self.attacks_mask(from_square) & ~our_pieces & ray(king, from_square):
+                return True
+
+        return (any(self.generate_castling_moves()) or
+                any(self.generate_legal_moves(self.pawns & our_pieces & blockers)) or
+                any(self.generate_legal_ep()))
+
     def _attacked_for_king(self, path: Bitboard, occupied: Bitboard) -> bool:
         return any(self.attackers_mask(not self.turn, sq, occupied) for sq in scan_reversed(path))
 
@@ -3815,31 +4806,91 @@ class Board(BaseBoard):
         if not chess960 and promotion is None and drop is None:
             if from_square == E1 and self.kings & BB_E1:
                 if to_square == H1:
-                    return Move(E1, G1)
+                    return _MOVES[E1 | G1 << 6]
                 elif to_square == A1:
-                    return Move(E1, C1)
+                    return _MOVES[E1 | C1 << 6]
             elif from_square == E8 and self.kings & BB_E8:
                 if to_square == H8:
-                    return Move(E8, G8)
+                    return _MOVES[E8 | G8 << 6]
                 elif to_square == A8:
-                    return Move(E8, C8)
+                    return _MOVES[E8 | C8 << 6]
 
-        return Move(from_square, to_square, promotion, drop)
+        return Move(from_square, to_square, promotion, drop) if drop else _move(from_square, to_square, promotion)
 
     def _to_chess960(self, move: Move) -> Move:
         if move.from_square == E1 and self.kings & BB_E1:
             if move.to_square == G1 and not self.rooks & BB_G1:
-                return Move(E1, H1)
+                return _MOVES[E1 | H1 << 6]
             elif move.to_square == C1 and not self.rooks & BB_C1:
-                return Move(E1, A1)
+                return _MOVES[E1 | A1 << 6]
         elif move.from_square == E8 and self.kings & BB_E8:
             if move.to_square == G8 and not self.rooks & BB_G8:
-                return Move(E8, H8)
+                return _MOVES[E8 | H8 << 6]
             elif move.to_square == C8 and not self.rooks & BB_C8:
-                return Move(E8, A8)
+                return _MOVES[E8 | A8 << 6]
 
         return move
 
+    def zobrist_hash(self) -> int:
+        """
+        Gets the Polyglot Zobrist hash of the position. Also see
+        :func:`chess.polyglot.zobrist_hash()`.
+
+        The piece placement part of the hash is maintained incrementally
+        when making and unmaking moves, so that this is cheap to call on
+        every ply.
+
+        >>> import chess
+        >>>
+        >>> board = chess.Board()
+        >>> hex(board.zobrist_hash())
+        '0x463b96181691fc9c'
+        """
+        return self._zobrist_hash(self.ep_square)
+
+    def _zobrist_hash(self, ep_square: Optional[Square]) -> int:
+        zobrist_hash = self._board_zobrist_hash()
+
+        # Castling rights.
+        castling_rights = self.clean_castling_rights()
+        if castling_rights:
+            for color, backrank, offset in [(WHITE, BB_RANK_1, 768), (BLACK, BB_RANK_8, 770)]:
+                king_mask = self.kings & self.occupied_co[color] & backrank & ~self.promoted
+                rooks = castling_rights & backrank
+                if king_mask and rooks:
+                    if BB_SQUARES[msb(rooks)] > king_mask:
+                        zobrist_hash ^= POLYGLOT_RANDOM_ARRAY[offset]
+                    if rooks & -rooks < king_mask:
+                        zobrist_hash ^= POLYGLOT_RANDOM_ARRAY[offset + 1]
+
+        # En passant file, but only if there is a pawn ready to capture.
+        # Legality of the potential capture is irrelevant.
+        if ep_square:
+            if self.turn == WHITE:
+                ep_mask = shift_down(BB_SQUARES[ep_square])
+            else:
+                ep_mask = shift_up(BB_SQUARES[ep_square])
+            if (shift_left(ep_mask) | shift_right(ep_mask)) & self.pawns & self.occupied_co[self.turn]:
+                zobrist_hash ^= POLYGLOT_RANDOM_ARRAY[772 + square_file(ep_square)]
+
+        # Turn.
+        if self.turn == WHITE:
+            zobrist_hash ^= POLYGLOT_RANDOM_ARRAY[780]
+
+        return zobrist_hash
+
+    def position(self) -> Position:
+        """
+        Gets an immutable, hashable snapshot of the position.
+        See :class:`~chess.Position`.
+        """
+        ep_square = self.ep_square if self.has_legal_en_passant() else None
+        return Position(
+            self.zobrist_hash() if ep_square == self.ep_square else self._zobrist_hash(ep_square),
+            self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings,
+            self.occupied_co[WHITE], self.occupied_co[BLACK],
+            self.turn, self.clean_castling_rights(), ep_square)
+
     def _transposition_key(self) -> Hashable:
         return (self.pawns, self.knights, self.bishops, self.rooks,
                 self.queens, self.kings,
@@ -3907,6 +4958,9 @@ class Board(BaseBoard):
 
         Defaults to copying the entire move stack. Alternatively, *stack* can
         be ``False``, or an integer to copy a limited number of moves.
+
+        The copy shares the move history with the original board, so this
+        takes constant time regardless of the number of moves.
         """
         board = super().copy()
 
@@ -3917,14 +4971,24 @@ class Board(BaseBoard):
         board.turn = self.turn
         board.fullmove_number = self.fullmove_number
         board.halfmove_clock = self.halfmove_clock
+        board._analysis = self._analysis
+        board.legal_move_cache = self.legal_move_cache
 
         if stack:
-            stack = len(self.move_stack) if stack is True else stack
-            board.move_stack = [copy.copy(move) for move in self.move_stack[-stack:]]
-            board._stack = self._stack[-stack:]
+            board._stack_size = self._stack_size if stack is True else max(0, min(stack, self._stack_size))
+            board._stack = self._stack if board._stack_size else None
+            board._move_stack = None
 
         return board
 
+    def __reduce__(self) -> Tuple[Callable[..., Board], Tuple[object, ...]]:
+        # Pickle the root position and the packed moves rather than the
+        # linked move history, which would be saved recursively.
+        if not self._stack_size:
+            return _unpickle_board, (type(self), self.to_bytes(), self.chess960)
+        moves = array.array("H", [move.encode() for move in self.move_stack])
+        return _unpickle_board, (type(self), self.to_bytes(), self.chess960, self.root().to_bytes(), moves)
+
     @classmethod
     def empty(cls: Type[BoardT], *, chess960: bool = False) -> BoardT:
         """Creates a new empty board. Also see :func:`~chess.Board.clear()`."""
@@ -3941,6 +5005,41 @@ class Board(BaseBoard):
         board = cls.empty(chess960=chess960)
         return board, board.set_epd(epd)
 
+    @classmethod
+    def from_bytes(cls: Type[BoardT], data: bytes, *, chess960: bool = False) -> BoardT:
+        """
+        Creates a new board from its binary representation. See
+        :func:`~chess.Board.to_bytes()`.
+        """
+        board = cls.empty(chess960=chess960)
+        board.set_bytes(data)
+        return board
+
+    @classmethod
+    def from_position(cls: Type[BoardT], position: Position, *, chess960: bool = False) -> BoardT:
+        """
+        Creates a new board from a :class:`~chess.Position` snapshot. See
+        :func:`~chess.Board.position()`.
+
+        The move counters are reset.
+        """
+        board = cls.empty(chess960=chess960)
+        board.pawns = position.pawns
+        board.knights = position.knights
+        board.bishops = position.bishops
+        board.rooks = position.rooks
+        board.queens = position.queens
+        board.kings = position.kings
+        board.occupied_co[WHITE] = position.occupied_w
+        board.occupied_co[BLACK] = position.occupied_b
+        board.occupied = position.occupied_w | position.occupied_b
+        board._zobrist_board = None
+
+        board.turn = position.turn
+        board.castling_rights = position.castling_rights
+        board.ep_square = position.ep_square
+        return board
+
     @classmethod
     def from_chess960_pos(cls: Type[BoardT], scharnagl: int) -> BoardT:
         board = cls.empty(chess960=True)
@@ -3948,6 +5047,19 @@ class Board(BaseBoard):
         return board
 
 
+def _unpickle_board(cls: Type[BoardT], data: bytes, chess960: bool, root: Optional[bytes] = None, moves: Iterable[int] = ()) -> BoardT:
+    if root is None:
+        return cls.from_bytes(data, chess960=chess960)
+    board = cls.from_bytes(root, chess960=chess960)
+    board.push_many(Move.from_encoded(code) for code in moves)
+
+    # The position may have been edited without clearing the stack.
+    _, apply = board._read_bytes(data, 0)
+    apply()
+    board._analysis = None
+    return board
+
+
 class PseudoLegalMoveGenerator:
 
     def __init__(self, board: Board) -> None:
@@ -3979,22 +5091,124 @@ class PseudoLegalMoveGenerator:
         return f"<PseudoLegalMoveGenerator at {id(self):#x} ({sans})>"
 
 
+class LegalMoveCache:
+    """
+    A bounded cache of legal move lists, shared by boards that opt in by
+    setting :data:`~chess.Board.legal_move_cache`. Once *maxsize* positions
+    are cached, the least recently used one is evicted.
+
+    Entries are keyed by the position (as for repetition detection), the
+    variant and the Chess960 mode, so moving on the board simply selects a
+    different entry.
+
+    >>> import chess
+    >>>
+    >>> cache = chess.LegalMoveCache(maxsize=10000)
+    >>> board = chess.Board()
+    >>> board.legal_move_cache = cache
+    >>> board.legal_moves.count()
+    20
+    >>> len(list(board.legal_moves))
+    20
+    >>> cache
+    LegalMoveCache(maxsize=10000, hits=1, misses=1, size=1)
+    """
+
+    maxsize: int
+    """The maximum number of cached positions."""
+
+    hits: int
+    """The number of lookups that found the position."""
+
+    misses: int
+    """The number of lookups that did not find the position."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 0:
+            raise ValueError(f"expected non-negative maxsize, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._moves: collections.OrderedDict[Hashable, Tuple[Move, ...]] = collections.OrderedDict()
+
+    def _key(self, board: Board) -> Hashable:
+        return type(board), board.chess960, board._transposition_key()
+
+    def _lookup(self, board: Board) -> Tuple[Hashable, Optional[Tuple[Move, ...]]]:
+        key = self._key(board)
+        moves = self._moves.get(key)
+        if moves is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._moves.move_to_end(key)
+        return key, moves
+
+    def moves(self, board: Board) -> Tuple[Move, ...]:
+        """
+        Gets the legal moves in the position of the board, generating and
+        caching them if needed.
+        """
+        key, moves = self._lookup(board)
+        if moves is None:
+            moves = tuple(board.generate_legal_moves())
+            if self.maxsize:
+                self._moves[key] = moves
+                if len(self._moves) > self.maxsize:
+                    self._moves.popitem(last=False)
+        return moves
+
+    def clear(self) -> None:
+        """Removes all cached positions and resets the counters."""
+        self._moves.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(maxsize={self.maxsize}, hits={self.hits}, misses={self.misses}, size={len(self)})"
+
+
 class LegalMoveGenerator:
 
     def __init__(self, board: Board) -> None:
         self.board = board
 
+    def _cache(self) -> Optional[LegalMoveCache]:
+        # Duck typed boards may not support caching.
+        return getattr(self.board, "legal_move_cache", None)
+
     def __bool__(self) -> bool:
-        return any(self.board.generate_legal_moves())
+        # Use cached moves, but do not generate all moves just to test
+        # this.
+        cache = self._cache()
+        if cache is not None:
+            moves = cache._lookup(self.board)[1]
+            if moves is not None:
+                return bool(moves)
+        return self.board._has_legal_moves()
 
     def count(self) -> int:
-        # List conversion is faster than iterating.
-        return len(list(self))
+        cache = self._cache()
+        if cache is not None:
+            return len(cache.moves(self.board))
+        return self.board._count_legal_moves()
 
     def __iter__(self) -> Iterator[Move]:
+        cache = self._cache()
+        if cache is not None:
+            return iter(cache.moves(self.board))
         return self.board.generate_legal_moves()
 
     def __contains__(self, move: Move) -> bool:
+        cache = self._cache()
+        if cache is not None:
+            moves = cache._lookup(self.board)[1]
+            # Castling moves may also be given in the alternative encoding.
+            if moves is not None and not BB_SQUARES[move.from_square] & self.board.kings:
+                return move in moves
         return self.board.is_legal(move)
 
     def __repr__(self) -> str:
@@ -4082,6 +5296,8 @@ class SquareSet:
     :func:`~chess.SquareSet.clear()`.
     """
 
+    __slots__ = ("mask", "__weakref__")
+
     def __init__(self, squares: IntoSquareSet = BB_EMPTY) -> None:
         try:
             self.mask: Bitboard = squares.__int__() & BB_ALL  # type: ignore
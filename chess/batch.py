@@ -0,0 +1,394 @@
+"""
+Columnar storage of many positions in NumPy arrays, for vectorized feature
+extraction.
+
+Requires NumPy.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import chess
+import numpy as np  # type: ignore[import-not-found, unused-ignore]
+import numpy.typing as npt  # type: ignore[import-not-found, unused-ignore]
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+from chess import Bitboard, Color, PieceType
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import TypeAlias
+
+
+Bitboards: TypeAlias = "npt.NDArray[np.uint64]"
+
+
+# NumPy 2.0 or fallback.
+if hasattr(np, "bitwise_count"):
+    def popcount(bb: Bitboards) -> npt.NDArray[np.uint8]:
+        """Counts the squares in each bitboard."""
+        return np.bitwise_count(bb)
+else:
+    def popcount(bb: Bitboards) -> npt.NDArray[np.uint8]:
+        """Counts the squares in each bitboard."""
+        # https://www.chessprogramming.org/Population_Count#SWAR-Popcount
+        bb = bb - ((bb >> 1) & np.uint64(0x5555_5555_5555_5555))
+        bb = (bb & np.uint64(0x3333_3333_3333_3333)) + ((bb >> 2) & np.uint64(0x3333_3333_3333_3333))
+        bb = (bb + (bb >> 4)) & np.uint64(0x0f0f_0f0f_0f0f_0f0f)
+        return ((bb * np.uint64(0x0101_0101_0101_0101)) >> 56).astype(np.uint8)
+
+
+def _vectorized(f: Callable[[Bitboard], Bitboard]) -> Callable[[Bitboards], Bitboards]:
+    # The bitboard functions of the core module only use operators and
+    # masks that work on uint64 arrays as well.
+    return typing.cast(Callable[[Bitboards], Bitboards], f)
+
+
+_BB_SQUARES = np.array(chess.BB_SQUARES + [chess.BB_EMPTY], dtype=np.uint64)
+
+_POLYGLOT_RANDOM_ARRAY = np.array(chess.POLYGLOT_RANDOM_ARRAY, dtype=np.uint64)
+
+def _zobrist_rank_table() -> npt.NDArray[np.uint64]:
+    # Hashes of each possible occupancy of a rank, indexed by piece type,
+    # color and rank, to hash bitboards a byte at a time.
+    keys = _POLYGLOT_RANDOM_ARRAY[:768].reshape(6, 2, 8, 8)
+    table = np.zeros((6, 2, 8, 256), dtype=np.uint64)
+    for file in range(8):
+        table[:, :, :, 1 << file:2 << file] = table[:, :, :, :1 << file] ^ keys[:, :, :, file, np.newaxis]
+    return table
+
+_ZOBRIST_RANK_TABLE = _zobrist_rank_table()
+
+
+class BoardBatch:
+    """
+    A batch of positions, stored column-wise. Each attribute is a NumPy
+    array with one entry per position.
+
+    >>> import chess
+    >>> import chess.batch
+    >>>
+    >>> batch = chess.batch.BoardBatch.from_fens([
+    ...     chess.STARTING_FEN,
+    ...     "8/8/8/4k3/8/8/3QK3/8 w - - 0 1",
+    ... ])
+    >>> batch.count_pieces(chess.WHITE).tolist()
+    [16, 2]
+    >>> batch.board(1)
+    Board('8/8/8/4k3/8/8/3QK3/8 w - - 0 1')
+
+    Only the state of standard chess positions is stored, so variant
+    specific state (like pockets or remaining checks) is not included.
+    """
+
+    pawns: Bitboards
+    knights: Bitboards
+    bishops: Bitboards
+    rooks: Bitboards
+    queens: Bitboards
+    kings: Bitboards
+
+    occupied_w: Bitboards
+    """The white pieces."""
+
+    occupied_b: Bitboards
+    """The black pieces."""
+
+    turn: npt.NDArray[np.bool_]
+    """The side to move (``True`` for white)."""
+
+    castling_rights: Bitboards
+    """The cleaned castling rights. See :func:`chess.Board.clean_castling_rights()`."""
+
+    chess960: npt.NDArray[np.bool_]
+    """Whether each position is in Chess960 mode."""
+
+    ep_square: npt.NDArray[np.int8]
+    """The en passant square, or ``-1``."""
+
+    halfmove_clock: npt.NDArray[np.uint32]
+
+    fullmove_number: npt.NDArray[np.uint32]
+
+    def __init__(self, size: int = 0) -> None:
+        self.pawns = np.zeros(size, dtype=np.uint64)
+        self.knights = np.zeros(size, dtype=np.uint64)
+        self.bishops = np.zeros(size, dtype=np.uint64)
+        self.rooks = np.zeros(size, dtype=np.uint64)
+        self.queens = np.zeros(size, dtype=np.uint64)
+        self.kings = np.zeros(size, dtype=np.uint64)
+        self.occupied_w = np.zeros(size, dtype=np.uint64)
+        self.occupied_b = np.zeros(size, dtype=np.uint64)
+        self.turn = np.ones(size, dtype=np.bool_)
+        self.castling_rights = np.zeros(size, dtype=np.uint64)
+        self.chess960 = np.zeros(size, dtype=np.bool_)
+        self.ep_square = np.full(size, -1, dtype=np.int8)
+        self.halfmove_clock = np.zeros(size, dtype=np.uint32)
+        self.fullmove_number = np.ones(size, dtype=np.uint32)
+
+    @classmethod
+    def from_boards(cls, boards: Iterable[chess.BaseBoard]) -> BoardBatch:
+        """
+        Creates a batch from the positions of the given boards.
+
+        Boards are read one by one, so the same board may be modified and
+        yielded repeatedly.
+        """
+        columns: List[List[int]] = [[] for _ in range(14)]
+        (pawns, knights, bishops, rooks, queens, kings, occupied_w, occupied_b,
+         turn, castling_rights, chess960, ep_square, halfmove_clock, fullmove_number) = columns
+
+        for board in boards:
+            pawns.append(board.pawns)
+            knights.append(board.knights)
+            bishops.append(board.bishops)
+            rooks.append(board.rooks)
+            queens.append(board.queens)
+            kings.append(board.kings)
+            occupied_w.append(board.occupied_co[chess.WHITE])
+            occupied_b.append(board.occupied_co[chess.BLACK])
+
+            if isinstance(board, chess.Board):
+                turn.append(board.turn)
+                castling_rights.append(board.clean_castling_rights())
+                chess960.append(board.chess960)
+                ep_square.append(-1 if board.ep_square is None else board.ep_square)
+                halfmove_clock.append(board.halfmove_clock)
+                fullmove_number.append(board.fullmove_number)
+            else:
+                turn.append(chess.WHITE)
+                castling_rights.append(chess.BB_EMPTY)
+                chess960.append(False)
+                ep_square.append(-1)
+                halfmove_clock.append(0)
+                fullmove_number.append(1)
+
+        batch = cls()
+        batch.pawns = np.array(pawns, dtype=np.uint64)
+        batch.knights = np.array(knights, dtype=np.uint64)
+        batch.bishops = np.array(bishops, dtype=np.uint64)
+        batch.rooks = np.array(rooks, dtype=np.uint64)
+        batch.queens = np.array(queens, dtype=np.uint64)
+        batch.kings = np.array(kings, dtype=np.uint64)
+        batch.occupied_w = np.array(occupied_w, dtype=np.uint64)
+        batch.occupied_b = np.array(occupied_b, dtype=np.uint64)
+        batch.turn = np.array(turn, dtype=np.bool_)
+        batch.castling_rights = np.array(castling_rights, dtype=np.uint64)
+        batch.chess960 = np.array(chess960, dtype=np.bool_)
+        batch.ep_square = np.array(ep_square, dtype=np.int8)
+        batch.halfmove_clock = np.array(halfmove_clock, dtype=np.uint32)
+        batch.fullmove_number = np.array(fullmove_number, dtype=np.uint32)
+        return batch
+
+    @classmethod
+    def from_fens(cls, fens: Iterable[str], *, chess960: bool = False) -> BoardBatch:
+        """
+        Creates a batch from FENs.
+
+        :param chess960: Whether the positions are in Chess960 mode, like
+            for :class:`chess.Board`.
+
+        :raises: :exc:`ValueError` if any of the FENs is invalid.
+        """
+        board = chess.Board(None, chess960=chess960)
+
+        def boards() -> Iterator[chess.Board]:
+            for fen in fens:
+                board.set_fen(fen)
+                yield board
+
+        return cls.from_boards(boards())
+
+    def board(self, index: int) -> chess.Board:
+        """Creates a board with the position at the given index."""
+        board = chess.Board(None, chess960=bool(self.chess960[index]))
+        board.pawns = int(self.pawns[index])
+        board.knights = int(self.knights[index])
+        board.bishops = int(self.bishops[index])
+        board.rooks = int(self.rooks[index])
+        board.queens = int(self.queens[index])
+        board.kings = int(self.kings[index])
+        board.occupied_co[chess.WHITE] = int(self.occupied_w[index])
+        board.occupied_co[chess.BLACK] = int(self.occupied_b[index])
+        board.occupied = board.occupied_co[chess.WHITE] | board.occupied_co[chess.BLACK]
+        board._zobrist_board = None
+
+        board.turn = bool(self.turn[index])
+        board.castling_rights = int(self.castling_rights[index])
+        ep_square = int(self.ep_square[index])
+        board.ep_square = None if ep_square < 0 else ep_square
+        board.halfmove_clock = int(self.halfmove_clock[index])
+        board.fullmove_number = int(self.fullmove_number[index])
+        return board
+
+    def boards(self) -> List[chess.Board]:
+        """Creates a board for each position."""
+        return [self.board(index) for index in range(len(self))]
+
+    def fens(self) -> List[str]:
+        """Gets the FEN of each position."""
+        return [self.board(index).fen() for index in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.pawns)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> chess.Board: ...
+    @typing.overload
+    def __getitem__(self, index: Union[slice, npt.NDArray[np.bool_], npt.NDArray[np.integer[Any]]]) -> BoardBatch: ...
+    def __getitem__(self, index: Union[int, slice, npt.NDArray[np.bool_], npt.NDArray[np.integer[Any]]]) -> Union[chess.Board, BoardBatch]:
+        """
+        Gets the board at an integer index, or a new batch with the
+        positions selected by a slice, a boolean mask or an array of
+        indexes.
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.board(int(index))
+        return self._map(lambda column: column[index])
+
+    def copy(self) -> BoardBatch:
+        """Creates a copy of the batch."""
+        return self._map(lambda column: column.copy())
+
+    def _map(self, f: Callable[[Any], Any]) -> BoardBatch:
+        batch = type(self)()
+        batch.pawns = f(self.pawns)
+        batch.knights = f(self.knights)
+        batch.bishops = f(self.bishops)
+        batch.rooks = f(self.rooks)
+        batch.queens = f(self.queens)
+        batch.kings = f(self.kings)
+        batch.occupied_w = f(self.occupied_w)
+        batch.occupied_b = f(self.occupied_b)
+        batch.turn = f(self.turn)
+        batch.castling_rights = f(self.castling_rights)
+        batch.chess960 = f(self.chess960)
+        batch.ep_square = f(self.ep_square)
+        batch.halfmove_clock = f(self.halfmove_clock)
+        batch.fullmove_number = f(self.fullmove_number)
+        return batch
+
+    def pieces_mask(self, piece_type: PieceType, color: Color) -> Bitboards:
+        """Gets the bitboards of the given piece type and color."""
+        pieces = [self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings][piece_type - 1]
+        return pieces & (self.occupied_w if color else self.occupied_b)
+
+    def count_pieces(self, color: Optional[Color] = None, piece_type: Optional[PieceType] = None) -> npt.NDArray[np.uint8]:
+        """
+        Counts pieces in each position, like
+        :func:`chess.BaseBoard.count_pieces()`.
+        """
+        if piece_type is not None:
+            pieces = [self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings][piece_type - 1]
+        else:
+            pieces = self.occupied_w | self.occupied_b
+        if color is not None:
+            pieces = pieces & (self.occupied_w if color else self.occupied_b)
+        return popcount(pieces)
+
+    def material_signature(self) -> Bitboards:
+        """
+        Gets a key for the material of each position, for example to group
+        positions with :func:`numpy.unique()`.
+
+        The key packs the number of pawns, knights, bishops, rooks and
+        queens of white, then black, into 4 bits each, starting with the
+        least significant bits. Counts above 15 are clamped.
+        """
+        signature = np.zeros(len(self), dtype=np.uint64)
+        shift = 0
+        for occupied in [self.occupied_w, self.occupied_b]:
+            for pieces in [self.pawns, self.knights, self.bishops, self.rooks, self.queens]:
+                count = np.minimum(popcount(pieces & occupied), 15).astype(np.uint64)
+                signature |= count << shift
+                shift += 4
+        return signature
+
+    def zobrist_hash(self) -> Bitboards:
+        """
+        Gets the Polyglot Zobrist hash of each position, like
+        :func:`chess.Board.zobrist_hash()`.
+        """
+        zobrist_hash = np.zeros(len(self), dtype=np.uint64)
+
+        # Piece placement, one rank at a time.
+        for color, occupied in [(chess.WHITE, self.occupied_w), (chess.BLACK, self.occupied_b)]:
+            for piece_index, pieces in enumerate([self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings]):
+                pieces = pieces & occupied
+                for rank in range(8):
+                    zobrist_hash ^= _ZOBRIST_RANK_TABLE[piece_index, int(color), rank][((pieces >> (8 * rank)) & 0xff).astype(np.intp)]
+
+        # Castling rights.
+        for occupied, backrank, offset in [(self.occupied_w, chess.BB_RANK_1, 768), (self.occupied_b, chess.BB_RANK_8, 770)]:
+            king_mask = self.kings & occupied & backrank
+            rooks = self.castling_rights & backrank
+            candidates = (king_mask != 0) & (rooks != 0)
+            kingside = candidates & (rooks & ~((king_mask << 1) - 1) != 0)
+            queenside = candidates & (rooks & (king_mask - 1) != 0)
+            zobrist_hash ^= np.where(kingside, _POLYGLOT_RANDOM_ARRAY[offset], np.uint64(0))
+            zobrist_hash ^= np.where(queenside, _POLYGLOT_RANDOM_ARRAY[offset + 1], np.uint64(0))
+
+        # En passant file, but only if there is a pawn ready to capture.
+        ep_mask = np.where(self.turn, _BB_SQUARES[self.ep_square] >> 8, _BB_SQUARES[self.ep_square] << 8)
+        capturers = (((ep_mask >> 1) & (chess.BB_ALL ^ chess.BB_FILE_H)) | ((ep_mask << 1) & (chess.BB_ALL ^ chess.BB_FILE_A)))
+        capturers &= self.pawns & np.where(self.turn, self.occupied_w, self.occupied_b)
+        zobrist_hash ^= np.where((self.ep_square >= 0) & (capturers != 0), _POLYGLOT_RANDOM_ARRAY[772 + (self.ep_square & 7).astype(np.intp)], np.uint64(0))
+
+        # Turn.
+        zobrist_hash ^= np.where(self.turn, _POLYGLOT_RANDOM_ARRAY[780], np.uint64(0))
+
+        return zobrist_hash
+
+    def apply_transform(self, f: Callable[[Bitboards], Bitboards]) -> None:
+        """
+        Applies a vectorized bitboard transformation to all positions, like
+        :func:`chess.Board.apply_transform()`.
+        """
+        self.pawns = f(self.pawns)
+        self.knights = f(self.knights)
+        self.bishops = f(self.bishops)
+        self.rooks = f(self.rooks)
+        self.queens = f(self.queens)
+        self.kings = f(self.kings)
+        self.occupied_w = f(self.occupied_w)
+        self.occupied_b = f(self.occupied_b)
+        self.castling_rights = f(self.castling_rights)
+
+        ep_squares = np.append(popcount(f(_BB_SQUARES[:64]) - 1).astype(np.int8), np.int8(-1))
+        self.ep_square = ep_squares[self.ep_square]
+
+    def transform(self, f: Callable[[Bitboards], Bitboards]) -> BoardBatch:
+        """Returns a transformed copy of the batch. See :func:`~chess.batch.BoardBatch.apply_transform()`."""
+        batch = self.copy()
+        batch.apply_transform(f)
+        return batch
+
+    def flip_vertical(self) -> BoardBatch:
+        """Returns a copy with all positions flipped vertically. See :func:`chess.flip_vertical()`."""
+        return self.transform(_vectorized(chess.flip_vertical))
+
+    def flip_horizontal(self) -> BoardBatch:
+        """Returns a copy with all positions mirrored horizontally. See :func:`chess.flip_horizontal()`."""
+        return self.transform(_vectorized(chess.flip_horizontal))
+
+    def flip_diagonal(self) -> BoardBatch:
+        """Returns a copy with all positions flipped at the a1-h8 diagonal. See :func:`chess.flip_diagonal()`."""
+        return self.transform(_vectorized(chess.flip_diagonal))
+
+    def flip_anti_diagonal(self) -> BoardBatch:
+        """Returns a copy with all positions flipped at the h1-a8 diagonal. See :func:`chess.flip_anti_diagonal()`."""
+        return self.transform(_vectorized(chess.flip_anti_diagonal))
+
+    def mirror(self) -> BoardBatch:
+        """
+        Returns a copy with all positions mirrored vertically, with swapped
+        colors and the opposite side to move, like
+        :func:`chess.Board.mirror()`.
+        """
+        batch = self.flip_vertical()
+        batch.occupied_w, batch.occupied_b = batch.occupied_b, batch.occupied_w
+        batch.turn = ~batch.turn
+        return batch
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} at {id(self):#x} ({len(self)} positions)>"
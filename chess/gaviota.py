@@ -1716,36 +1716,7 @@ class PythonTablebase:
 
         if t is None:
             t = TableBlock(req.egkey, req.side, offset, self.block_age)
-
-            block = self.egtb_block_getnumber(req, idx)
-            n = self.egtb_block_getsize(req, idx)
-            z = self.egtb_block_getsize_zipped(req.egkey, block)
-
-            self.egtb_block_park(req.egkey, block, stream)
-            buffer_zipped = stream.read(z)
-
-            if buffer_zipped[0] == 0:
-                # If flag is zero, plain LZMA is following.
-                buffer_zipped = buffer_zipped[2:]
-            else:
-                # Else LZMA86. Build a fake header.
-                DICTIONARY_SIZE = 4096
-                POS_STATE_BITS = 2
-                NUM_LITERAL_POS_STATE_BITS = 0
-                NUM_LITERAL_CONTEXT_BITS = 3
-                properties = bytearray(13)
-                properties[0] = (POS_STATE_BITS * 5 + NUM_LITERAL_POS_STATE_BITS) * 9 + NUM_LITERAL_CONTEXT_BITS
-                for i in range(4):
-                    properties[1 + i] = (DICTIONARY_SIZE >> (8 * i)) & 0xFF
-                for i in range(8):
-                    properties[5 + i] = (n >> (8 * i)) & 0xFF
-
-                # Concatenate the fake header with the true LZMA stream.
-                buffer_zipped = properties + buffer_zipped[15:]
-
-            buffer_packed = lzma.LZMADecompressor().decompress(buffer_zipped)
-
-            t.pcache = egtb_block_unpack(req.side, n, buffer_packed)
+            t.pcache = self.egtb_block_load(req, idx, stream)
 
             # Update LRU block cache.
             self.block_cache[(t.egkey, t.offset, t.side)] = t
@@ -1760,6 +1731,37 @@ class PythonTablebase:
 
         return dtm
 
+    def egtb_block_load(self, req: Request, idx: int, stream: BinaryIO) -> List[int]:
+        block = self.egtb_block_getnumber(req, idx)
+        n = self.egtb_block_getsize(req, idx)
+        z = self.egtb_block_getsize_zipped(req.egkey, block)
+
+        self.egtb_block_park(req.egkey, block, stream)
+        buffer_zipped = stream.read(z)
+
+        if buffer_zipped[0] == 0:
+            # If flag is zero, plain LZMA is following.
+            buffer_zipped = buffer_zipped[2:]
+        else:
+            # Else LZMA86. Build a fake header.
+            DICTIONARY_SIZE = 4096
+            POS_STATE_BITS = 2
+            NUM_LITERAL_POS_STATE_BITS = 0
+            NUM_LITERAL_CONTEXT_BITS = 3
+            properties = bytearray(13)
+            properties[0] = (POS_STATE_BITS * 5 + NUM_LITERAL_POS_STATE_BITS) * 9 + NUM_LITERAL_CONTEXT_BITS
+            for i in range(4):
+                properties[1 + i] = (DICTIONARY_SIZE >> (8 * i)) & 0xFF
+            for i in range(8):
+                properties[5 + i] = (n >> (8 * i)) & 0xFF
+
+            # Concatenate the fake header with the true LZMA stream.
+            buffer_zipped = properties + buffer_zipped[15:]
+
+        buffer_packed = lzma.LZMADecompressor().decompress(buffer_zipped)
+
+        return egtb_block_unpack(req.side, n, buffer_packed)
+
     def egtb_loadindexes(self, egkey: str, stream: BinaryIO) -> ZipInfo:
         zipinfo = self.zipinfo.get(egkey)
 
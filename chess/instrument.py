@@ -0,0 +1,232 @@
+"""
+Opt-in counters and timers for the hot paths of the library, to attribute
+CPU time in a running program without a profiler.
+
+While enabled, the instrumented functions are replaced with wrappers that
+count calls and measure cumulative (inclusive) time, separately for each
+thread. Disabling restores the original functions, so there is no overhead
+at all when instrumentation is off.
+
+Instrumented are :func:`chess.Board.push()`, :func:`~chess.Board.pop()`,
+:func:`~chess.Board.generate_legal_moves()`, :func:`~chess.Board.parse_san()`,
+:func:`~chess.Board.san()`, :func:`~chess.Board.set_fen()`,
+:func:`~chess.Board.fen()`, Syzygy WDL and DTZ probes, block reads of the
+pure Python Gaviota prober and Polyglot opening book lookups.
+
+>>> import chess
+>>> import chess.instrument
+>>>
+>>> with chess.instrument.instrumented():
+...     board = chess.Board()
+...     board.push(chess.Move.from_uci("e2e4"))
+...     board.pop()
+...
+Move.from_uci('e2e4')
+>>> chess.instrument.snapshot()["Board.push"].calls
+1
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import threading
+import time
+
+import chess
+import chess.gaviota
+import chess.polyglot
+import chess.syzygy
+
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+
+class Stats(NamedTuple):
+    """Statistics of an instrumented function."""
+
+    calls: int
+    """The number of calls."""
+
+    seconds: float
+    """
+    The cumulative time spent in the function, including nested
+    instrumented calls. For generators, only the time to produce the
+    items is included.
+    """
+
+
+_HOOKS: List[Tuple[type, str, str, bool]] = [
+    # (owner, attribute, name, generator)
+    (chess.Board, "push", "Board.push", False),
+    (chess.Board, "pop", "Board.pop", False),
+    (chess.Board, "generate_legal_moves", "Board.generate_legal_moves", True),
+    (chess.Board, "parse_san", "Board.parse_san", False),
+    (chess.Board, "san", "Board.san", False),
+    (chess.Board, "set_fen", "Board.set_fen", False),
+    (chess.Board, "fen", "Board.fen", False),
+    (chess.syzygy.Tablebase, "probe_wdl", "syzygy.Tablebase.probe_wdl", False),
+    (chess.syzygy.Tablebase, "probe_dtz", "syzygy.Tablebase.probe_dtz", False),
+    (chess.gaviota.PythonTablebase, "egtb_block_load", "gaviota.PythonTablebase.egtb_block_load", False),
+    (chess.polyglot.MemoryMappedReader, "find_all", "polyglot.MemoryMappedReader.find_all", True),
+]
+"""
+The instrumented functions. Subclasses that override them are counted
+only when delegating to the base class.
+"""
+
+_lock = threading.Lock()
+_local = threading.local()
+_counters_by_thread: Dict[int, Dict[str, List[int]]] = {}
+_finished: Dict[str, List[int]] = {name: [0, 0] for _, _, name, _ in _HOOKS}
+_originals: List[Tuple[type, str, Any]] = []
+
+
+def _counters() -> Dict[str, List[int]]:
+    try:
+        return _local.counters  # type: ignore[no-any-return]
+    except AttributeError:
+        counters: Dict[str, List[int]] = {name: [0, 0] for _, _, name, _ in _HOOKS}
+        with _lock:
+            # Identifiers are reused once a thread has terminated. Keep the
+            # statistics of the terminated thread in the totals.
+            finished = _counters_by_thread.get(threading.get_ident())
+            if finished is not None:
+                _add(_finished, finished)
+            _counters_by_thread[threading.get_ident()] = counters
+        _local.counters = counters
+        return counters
+
+
+def _add(totals: Dict[str, List[int]], counters: Dict[str, List[int]]) -> None:
+    for name, (calls, ns) in counters.items():
+        total = totals[name]
+        total[0] += calls
+        total[1] += ns
+
+
+def _wrap(f: Callable[..., Any], name: str) -> Callable[..., Any]:
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(f)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        counter = _counters()[name]
+        start = perf_counter_ns()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += perf_counter_ns() - start
+
+    return wrapper
+
+
+def _wrap_generator(f: Callable[..., Iterator[Any]], name: str) -> Callable[..., Iterator[Any]]:
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(f)
+    def wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+        # Time only the steps of the generator, not the work of the
+        # consumer between them.
+        counter = _counters()[name]
+        counter[0] += 1
+        start = perf_counter_ns()
+        try:
+            it = f(*args, **kwargs)
+        finally:
+            counter[1] += perf_counter_ns() - start
+
+        while True:
+            start = perf_counter_ns()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                counter[1] += perf_counter_ns() - start
+            yield item
+
+    return wrapper
+
+
+def enable() -> None:
+    """Enables instrumentation. Does nothing if it is already enabled."""
+    with _lock:
+        if _originals:
+            return
+
+        for owner, attribute, name, generator in _HOOKS:
+            original = owner.__dict__[attribute]
+            _originals.append((owner, attribute, original))
+            setattr(owner, attribute, _wrap_generator(original, name) if generator else _wrap(original, name))
+
+
+def disable() -> None:
+    """
+    Disables instrumentation and restores the original functions.
+    Collected statistics are kept.
+    """
+    with _lock:
+        while _originals:
+            owner, attribute, original = _originals.pop()
+            setattr(owner, attribute, original)
+
+
+def is_enabled() -> bool:
+    """Checks if instrumentation is enabled."""
+    return bool(_originals)
+
+
+@contextlib.contextmanager
+def instrumented() -> Iterator[None]:
+    """
+    Enables instrumentation in a ``with`` block and restores the previous
+    state afterwards.
+    """
+    enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not enabled:
+            disable()
+
+
+def reset() -> None:
+    """Resets all statistics and forgets threads that have terminated."""
+    alive = {thread.ident for thread in threading.enumerate()}
+    with _lock:
+        for ident, counters in list(_counters_by_thread.items()):
+            if ident not in alive:
+                del _counters_by_thread[ident]
+            for counter in counters.values():
+                counter[0] = 0
+                counter[1] = 0
+        for counter in _finished.values():
+            counter[0] = 0
+            counter[1] = 0
+
+
+def _stats(counters: Dict[str, List[int]]) -> Dict[str, Stats]:
+    return {name: Stats(calls, ns / 1e9) for name, (calls, ns) in counters.items()}
+
+
+def thread_snapshots() -> Dict[int, Dict[str, Stats]]:
+    """
+    Gets the statistics of each thread that used an instrumented function,
+    keyed by :func:`threading.get_ident()`.
+
+    A thread that has terminated is no longer listed once its identifier
+    is reused, but it is still included in :func:`~chess.instrument.snapshot()`.
+    """
+    with _lock:
+        return {ident: _stats(counters) for ident, counters in _counters_by_thread.items()}
+
+
+def snapshot() -> Dict[str, Stats]:
+    """Gets the statistics of all threads combined."""
+    totals = {name: [0, 0] for _, _, name, _ in _HOOKS}
+    with _lock:
+        _add(totals, _finished)
+        for counters in _counters_by_thread.values():
+            _add(totals, counters)
+    return _stats(totals)
@@ -0,0 +1,402 @@
+"""
+Perft (performance test, move path enumeration) to validate and benchmark
+the legal move generator.
+
+Run the bundled test suites with ``python -m chess.perft
+examples/perft/*.perft``. The variant of each suite is inferred from its
+file name, unless given with ``--variant``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import chess
+import chess.variant
+
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple, Type
+
+
+_DEPTH_MIX = 0x9e37_79b9_7f4a_7c15
+
+
+def _mix_castling_rights(castling_rights: chess.Bitboard) -> int:
+    # Finalizer of SplitMix64. Unlike a multiplication with the same
+    # constant as the depth, this does not commute with it.
+    x = castling_rights
+    x = (x ^ (x >> 30)) * 0xbf58_476d_1ce4_e5b9 & chess.BB_ALL
+    x = (x ^ (x >> 27)) * 0x94d0_49bb_1331_11eb & chess.BB_ALL
+    return x ^ (x >> 31)
+
+
+def _zobrist_key(board: chess.Board) -> int:
+    key = board.zobrist_hash()
+    if board.chess960:
+        # The Polyglot hash only records on which side of the king castling
+        # is possible, which is ambiguous in Chess960.
+        key ^= _mix_castling_rights(board.clean_castling_rights())
+    return key
+
+
+def _transposition_key_hash(board: chess.Board) -> int:
+    # Hashes of tuples are not suitable, because integers are hashed
+    # modulo 2**61 - 1, so that for example BB_H8 collides with BB_A1.
+    return hash(str(board._transposition_key())) & chess.BB_ALL
+
+
+def _key_function(board: chess.Board) -> Callable[[chess.Board], int]:
+    # Variants with additional state (pockets, remaining checks, ...)
+    # extend the transposition key, which the Zobrist hash does not cover.
+    if type(board)._transposition_key is chess.Board._transposition_key:
+        return _zobrist_key
+    else:
+        return _transposition_key_hash
+
+
+class PerftTable:
+    """
+    A transposition table of perft results, keyed on the Zobrist hash of
+    the position and the remaining depth.
+
+    The table has a fixed number of slots (*size* rounded up to a power of
+    two), so that memory use is bounded. A new entry replaces whatever was
+    stored in its slot before. Each slot needs about 100 bytes once it is
+    filled.
+
+    >>> import chess
+    >>> import chess.perft
+    >>>
+    >>> table = chess.perft.PerftTable(2 ** 16)
+    >>> board = chess.Board("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1")
+    >>> chess.perft.perft(board, 5, table=table)
+    145232
+    >>> table
+    PerftTable(size=65536, hits=582, misses=793)
+    """
+
+    size: int
+    """The number of slots."""
+
+    hits: int
+    """The number of lookups that found the position."""
+
+    misses: int
+    """The number of lookups that did not find the position."""
+
+    def __init__(self, size: int = 2 ** 18) -> None:
+        if size <= 0:
+            raise ValueError(f"expected positive table size, got {size}")
+        self.size = 1 << (size - 1).bit_length()
+        self.hits = 0
+        self.misses = 0
+        self._keys: List[int] = [-1] * self.size
+        self._nodes: List[int] = [0] * self.size
+
+    def get(self, key: int, depth: int) -> Optional[int]:
+        """
+        Gets the number of leaf nodes *depth* plies below the position with
+        the given 64-bit *key*, or ``None`` if it is not in the table.
+        """
+        key ^= depth * _DEPTH_MIX & chess.BB_ALL
+        index = key & (self.size - 1)
+        if self._keys[index] == key:
+            self.hits += 1
+            return self._nodes[index]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, nodes: int) -> None:
+        """Stores the number of leaf nodes *depth* plies below a position."""
+        key ^= depth * _DEPTH_MIX & chess.BB_ALL
+        index = key & (self.size - 1)
+        self._keys[index] = key
+        self._nodes[index] = nodes
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        self.hits = 0
+        self.misses = 0
+        self._keys = [-1] * self.size
+        self._nodes = [0] * self.size
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(size={self.size}, hits={self.hits}, misses={self.misses})"
+
+
+def _perft(board: chess.Board, depth: int, table: Optional[PerftTable], key_function: Callable[[chess.Board], int]) -> int:
+    # Bulk counting: The leaf nodes are never visited.
+    if depth == 1:
+        return board.legal_moves.count()
+    elif depth < 1:
+        return 1
+
+    if table is not None:
+        key = key_function(board)
+        nodes = table.get(key, depth)
+        if nodes is not None:
+            return nodes
+
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += _perft(board, depth - 1, table, key_function)
+        board.pop()
+
+    if table is not None:
+        table.store(key, depth, nodes)
+    return nodes
+
+
+def perft(board: chess.Board, depth: int, *, table: Optional[PerftTable] = None) -> int:
+    """
+    Counts the leaf nodes of the legal move tree *depth* plies deep.
+
+    Results of subtrees are cached in the transposition *table*, if given.
+    It can be reused for further calls, as long as the variant stays the
+    same.
+
+    The board is restored when the function returns.
+
+    >>> import chess
+    >>> import chess.perft
+    >>>
+    >>> chess.perft.perft(chess.Board(), 3)
+    8902
+    """
+    return _perft(board, depth, table, _key_function(board))
+
+
+def divide(board: chess.Board, depth: int, *, table: Optional[PerftTable] = None) -> Dict[chess.Move, int]:
+    """
+    Counts the leaf nodes below each legal move, as in :func:`perft()`.
+    This helps to find the subtree with a wrong number of nodes, when
+    comparing with another move generator.
+
+    >>> import chess
+    >>> import chess.perft
+    >>>
+    >>> board = chess.Board()
+    >>> nodes = chess.perft.divide(board, 3)
+    >>> nodes[chess.Move.from_uci("e2e4")]
+    600
+    >>> sum(nodes.values())
+    8902
+    """
+    key_function = _key_function(board)
+    nodes = {}
+    for move in board.legal_moves:
+        board.push(move)
+        nodes[move] = _perft(board, depth - 1, table, key_function)
+        board.pop()
+    return nodes
+
+
+_worker_table: Optional[PerftTable] = None
+
+
+def _init_worker(table_size: Optional[int]) -> None:
+    global _worker_table
+    _worker_table = PerftTable(table_size) if table_size else None
+
+
+def _perft_task(task: Tuple[chess.Board, int, int]) -> int:
+    board, depth, multiplicity = task
+    return multiplicity * perft(board, depth, table=_worker_table)
+
+
+def _split(board: chess.Board, depth: int, key_function: Callable[[chess.Board], int], frontier: Dict[int, Tuple[chess.Board, int]]) -> None:
+    if depth <= 0:
+        key = key_function(board)
+        try:
+            split_board, multiplicity = frontier[key]
+        except KeyError:
+            frontier[key] = board.copy(stack=False), 1
+        else:
+            frontier[key] = split_board, multiplicity + 1
+        return
+
+    for move in board.legal_moves:
+        board.push(move)
+        _split(board, depth - 1, key_function, frontier)
+        board.pop()
+
+
+def parallel_perft(board: chess.Board, depth: int, *, split_depth: int = 2, processes: Optional[int] = None, table_size: Optional[int] = 2 ** 18) -> int:
+    """
+    Like :func:`perft()`, but searches the subtrees of the positions
+    *split_depth* plies below the root in a pool of worker processes.
+
+    The subtrees are handed out one at a time, so that workers that finish
+    early pick up the remaining work, and transpositions among them are
+    searched only once. Each worker has its own :class:`~chess.perft.PerftTable`
+    with *table_size* slots, or none if *table_size* is ``None``.
+
+    *processes* defaults to the number of CPUs.
+    """
+    split_depth = min(split_depth, depth - 1)
+    if split_depth < 1:
+        return perft(board, depth, table=PerftTable(table_size) if table_size else None)
+
+    frontier: Dict[int, Tuple[chess.Board, int]] = {}
+    _split(board, split_depth, _key_function(board), frontier)
+
+    tasks = ((split_board, depth - split_depth, multiplicity) for split_board, multiplicity in frontier.values())
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(table_size, )) as pool:
+        return sum(pool.imap_unordered(_perft_task, tasks, chunksize=1))
+
+
+class PerftError(Exception):
+    """A perft result differs from the expected number of nodes."""
+
+    def __init__(self, message: str, board: chess.Board, depth: int) -> None:
+        super().__init__(message)
+        self.board = board
+        self.depth = depth
+
+
+def run_suite(perft_file: TextIO, VariantBoard: Type[chess.Board], perft_f: Callable[[chess.Board, int], int], *, max_depth: Optional[int] = None, max_nodes: Optional[int] = None, progress: Optional[TextIO] = None) -> Tuple[int, float]:
+    """
+    Runs the tests from a perft suite and returns the total number of
+    nodes and the elapsed time in seconds.
+
+    The suite consists of lines with ``id <name>``, ``epd <epd>`` and
+    ``perft <depth> <nodes>`` commands. Empty lines and comments
+    starting with ``#`` or ``%`` are ignored.
+
+    Tests that are deeper than *max_depth* or expect more than *max_nodes*
+    nodes are skipped.
+
+    :raises: :exc:`~chess.perft.PerftError` if a test fails, or
+        :exc:`ValueError` if the suite is malformed.
+    """
+    current_id = None
+    board = VariantBoard(chess960=True)
+    total_nodes = 0
+    elapsed = 0.0
+
+    for line in perft_file:
+        # Skip comments and empty lines.
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("%"):
+            continue
+
+        cmd, arg = line.split(None, 1)
+        if cmd == "id":
+            current_id = arg
+        elif cmd == "epd":
+            board.set_epd(arg)
+        elif cmd == "perft":
+            depth, nodes = map(int, arg.split(None, 1))
+            if (max_depth and depth > max_depth) or (max_nodes and nodes > max_nodes):
+                continue
+
+            start_time = time.perf_counter()
+            perft_nodes = perft_f(board, depth)
+            elapsed += time.perf_counter() - start_time
+
+            if nodes != perft_nodes:
+                raise PerftError(f"{current_id or '<no-name>'}: epd {board.epd()}: perft {depth} {nodes} (got {perft_nodes} instead)", board.copy(stack=False), depth)
+
+            total_nodes += perft_nodes
+            if progress is not None:
+                progress.write(".")
+                progress.flush()
+        else:
+            raise ValueError(f"unknown perft command: {cmd} {arg}")
+
+    return total_nodes, elapsed
+
+
+def _sdiv(a: float, b: float) -> float:
+    try:
+        return a / b
+    except ZeroDivisionError:
+        return float("Inf")
+
+
+def _suite_variant(path: str) -> Type[chess.Board]:
+    try:
+        return chess.variant.find_variant(os.path.splitext(os.path.basename(path))[0])
+    except ValueError:
+        return chess.Board
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m chess.perft", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("perft", nargs="*", help="Perft test suite(s)")
+    parser.add_argument("--max-depth", type=int, help="Skip deeper perft tests")
+    parser.add_argument("--max-nodes", type=int, default=1000000,
+        help="Skip larger perft tests. Defaults to 1000000")
+    parser.add_argument("-v", "--variant",
+        help="Use a non-standard chess variant. Defaults to the variant named by the file name of each suite")
+    parser.add_argument("-t", "--threads", type=int, help="Number of worker processes. Defaults to the number of CPUs")
+    parser.add_argument("--split-depth", type=int, default=2,
+        help="Distribute the subtrees this many plies below the root to the workers. Defaults to 2")
+    parser.add_argument("--hash", type=int, default=2 ** 18,
+        help="Number of transposition table slots (per worker), or 0 to disable. Defaults to 262144")
+    parser.add_argument("--fen", help="Count the nodes of a single position instead of running suites")
+    parser.add_argument("--depth", type=int, default=4, help="Depth for --fen. Defaults to 4")
+    parser.add_argument("--divide", action="store_true", help="With --fen, list the nodes below each move")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
+
+    def perft_f(board: chess.Board, depth: int) -> int:
+        if args.threads == 1:
+            return perft(board, depth, table=PerftTable(args.hash) if args.hash else None)
+        else:
+            return parallel_perft(board, depth, split_depth=args.split_depth, processes=args.threads, table_size=args.hash or None)
+
+    if args.fen is not None:
+        VariantBoard = chess.variant.find_variant(args.variant or "standard")
+        board = VariantBoard(args.fen, chess960=True)
+        start_time = time.perf_counter()
+        if args.divide:
+            total_nodes = 0
+            for move in board.legal_moves:
+                board.push(move)
+                nodes = perft_f(board, args.depth - 1)
+                board.pop()
+                print(f"{board.uci(move)}: {nodes}")
+                total_nodes += nodes
+            print()
+        else:
+            total_nodes = perft_f(board, args.depth)
+        elapsed = time.perf_counter() - start_time
+        print(f"nodes {total_nodes} time {elapsed:.3f} nps {_sdiv(total_nodes, elapsed):.0f}")
+        return
+
+    results: List[Tuple[str, int, float]] = []
+    for path in args.perft:
+        VariantBoard = chess.variant.find_variant(args.variant) if args.variant else _suite_variant(path)
+        print(f"### {path} ({VariantBoard.uci_variant})")
+        with open(path) as perft_file:
+            try:
+                total_nodes, elapsed = run_suite(perft_file, VariantBoard, perft_f, max_depth=args.max_depth, max_nodes=args.max_nodes, progress=sys.stdout)
+            except PerftError as err:
+                print()
+                print(f" !!! Failure in {err}")
+                print()
+                print(err.board)
+                print()
+                for move, nodes in sorted(divide(err.board, err.depth).items(), key=lambda item: err.board.uci(item[0])):
+                    print(f"{err.board.uci(move)}: {nodes}")
+                sys.exit(1)
+        print(f" nodes {total_nodes} nps {_sdiv(total_nodes, elapsed):.0f}")
+        results.append((path, total_nodes, elapsed))
+
+    if len(results) > 1:
+        print()
+        width = max(len(path) for path, _, _ in results)
+        for path, total_nodes, elapsed in results:
+            print(f"{path:<{width}} {total_nodes:>12} nodes {elapsed:>9.3f} s {_sdiv(total_nodes, elapsed):>10.0f} nps")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,13 @@ annotations (NAGs), and comments.
 from __future__ import annotations
 
 import abc
+import array
 import dataclasses
 import enum
+import functools
 import itertools
 import logging
+import mmap
 import re
 import typing
 import io
@@ -20,7 +23,7 @@ import chess
 import chess.engine
 import chess.svg
 
-from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Literal, Mapping, MutableMapping, Set, TextIO, Tuple, Type, TypeVar, Optional, Union
+from typing import Any, AnyStr, BinaryIO, Callable, Dict, Generic, Iterable, Iterator, List, Literal, Mapping, MutableMapping, Set, TextIO, Tuple, Type, TypeVar, Optional, Union
 from chess import Color, Square
 
 if typing.TYPE_CHECKING:
@@ -112,6 +115,50 @@ MOVETEXT_REGEX = re.compile(r"""
 
 SKIP_MOVETEXT_REGEX = re.compile(r""";|\{|\}""")
 
+# The same, for tokenizing the movetext of a whole file in a buffer.
+# Comments include the closing brace, if any. Additionally there are groups
+# for lines to be ignored and for an empty line (ending the game).
+MOVETEXT_BYTES_REGEX = re.compile(rb"""
+    (
+        [NBKRQ]?[a-h]?[1-8]?[\-x]?[a-h][1-8](?:=?[nbrqkNBRQK])?
+        |[PNBRQK]?@[a-h][1-8]
+        |--
+        |Z0
+        |0000
+        |@@@@
+        |O-O(?:-O)?
+        |0-0(?:-0)?
+    )
+    |(\{[^}]*\}?)
+    |(;[^\n]*|\n[%;][^\n]*)
+    |(\$[0-9]+)
+    |(\()
+    |(\))
+    |(\*|1-0|0-1|1/2-1/2)
+    |([\?!]{1,2})
+    |(\n[ \t\r\x0b\x0c\x1c-\x1f]*(?:\n|\Z))
+    """, re.VERBOSE)
+
+SKIP_MOVETEXT_BYTES_REGEX = re.compile(rb"""
+    (?:
+        [^{;\n]+
+        |\{[^}]*\}?
+        |;[^\n]*
+        |\n%[^\n]*
+        |\n(?![ \t\r\x0b\x0c\x1c-\x1f]*(?:\n|\Z))
+    )*
+    (?:\n[ \t\r\x0b\x0c\x1c-\x1f]*(?:\n|\Z))?
+    """, re.VERBOSE)
+
+_NAG_BYTES = {
+    b"?": NAG_MISTAKE,
+    b"??": NAG_BLUNDER,
+    b"!": NAG_GOOD_MOVE,
+    b"!!": NAG_BRILLIANT_MOVE,
+    b"!?": NAG_SPECULATIVE_MOVE,
+    b"?!": NAG_DUBIOUS_MOVE,
+}
+
 
 CLOCK_REGEX = re.compile(r"""(?P<prefix>\s?)\[%clk\s(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+(?:\.\d*)?)\](?P<suffix>\s?)""")
 EMT_REGEX = re.compile(r"""(?P<prefix>\s?)\[%emt\s(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+(?:\.\d*)?)\](?P<suffix>\s?)""")
@@ -149,6 +196,14 @@ def _standardize_comments(comment: Union[str, list[str]]) -> list[str]:
     return [] if not comment else [comment] if isinstance(comment, str) else comment
 
 
+def _preorder(node: GameNode) -> Iterator[GameNode]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.variations))
+
+
 TAG_ROSTER = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
 
 
@@ -665,6 +720,12 @@ class GameNode(abc.ABC):
     def __str__(self) -> str:
         return self.accept(StringExporter(columns=None))
 
+    def __copy__(self) -> Self:
+        # Shallow copy, bypassing the flattened pickle state.
+        node = type(self).__new__(type(self))
+        node.__dict__.update(self.__dict__)
+        return node
+
 
 class ChildNode(GameNode):
     """
@@ -717,10 +778,7 @@ class ChildNode(GameNode):
             node = node.parent
 
         board = node.game().board()
-
-        while stack:
-            board.push(stack.pop())
-
+        board.push_many(reversed(stack))
         return board
 
     @override
@@ -830,6 +888,25 @@ class ChildNode(GameNode):
                 "." if parent_board.turn == chess.WHITE else "...",
                 parent_board.san(self.move))
 
+    def __reduce__(self) -> Tuple[Callable[[Game, int], GameNode], Tuple[Game, int]]:
+        # Pickle the entire game and find the node again by its index.
+        game = self.game()
+        for index, node in enumerate(_preorder(game)):
+            if node is self:
+                return _unpickle_node, (game, index)
+        raise ValueError(f"cannot pickle dangling node: {self.move}")
+
+
+# Attributes of child nodes with special handling when pickling a game.
+# Any other attributes are pickled as they are. Annotations are pickled
+# only if not empty.
+_NODE_FIELDS = ["_parent", "_move", "variations", "comments", "starting_comments", "nags"]
+_NODE_ANNOTATIONS = ["comments", "starting_comments", "nags"]
+
+
+def _unpickle_node(game: Game, index: int) -> GameNode:
+    return next(itertools.islice(_preorder(game), index, None))
+
 
 GameT = TypeVar("GameT", bound="Game")
 
@@ -876,6 +953,51 @@ class Game(GameNode):
     def board(self) -> chess.Board:
         return self.headers.board()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Flatten the tree, so that long games do not exceed the recursion
+        # limit. Nodes are saved in preorder as packed moves. The parent of
+        # a main variation is the preceding node, so only sidelines need
+        # their parent index. Only non-default attributes are kept, and the
+        # class of nodes that are not plain ChildNodes.
+        state = self.__dict__.copy()
+        moves = array.array("H")
+        sidelines: Dict[int, int] = {}
+        annotations: Dict[int, Dict[str, Any]] = {}
+        classes: Dict[int, Type[ChildNode]] = {}
+        indexes = {id(self): 0}
+
+        for index, node in enumerate(_preorder(self)):
+            if isinstance(node, ChildNode):
+                indexes[id(node)] = index
+                if node.parent.variations[0] is not node:
+                    sidelines[index] = indexes[id(node.parent)]
+                moves.append(node.move.encode())
+
+                annotation = {name: getattr(node, name) for name in _NODE_ANNOTATIONS if getattr(node, name)}
+                annotation.update((key, value) for key, value in node.__dict__.items() if key not in _NODE_FIELDS)
+                if annotation:
+                    annotations[index] = annotation
+                if type(node) is not ChildNode:
+                    classes[index] = type(node)
+
+        state["variations"] = (moves, sidelines, annotations, classes)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state = state.copy()
+        moves, sidelines, annotations, classes = state.pop("variations")
+        self.__dict__.update(state)
+        self.variations = []
+
+        nodes: List[GameNode] = [self]
+        for index, move in enumerate(moves, 1):
+            # Like unpickling, do not call the constructor of subclasses.
+            cls = classes.get(index, ChildNode)
+            node = cls.__new__(cls)
+            ChildNode.__init__(node, nodes[sidelines.get(index, index - 1)], chess.Move.from_encoded(move))
+            node.__dict__.update(annotations.get(index, {}))
+            nodes.append(node)
+
     @override
     def ply(self) -> int:
         # Optimization: Parse FEN only for custom starting positions.
@@ -1327,7 +1449,7 @@ class BaseVisitor(abc.ABC, Generic[ResultT]):
         """
         pass
 
-    def visit_comment(self, comment: list[str]) -> None:
+    def visit_comment(self, comment: Union[str, list[str]]) -> None:
         """Called for each comment."""
         pass
 
@@ -1868,26 +1990,13 @@ def read_game(
         skipping_game = visitor.end_headers() is SKIP
 
     if not skipping_game:
-        # Chess variant.
         headers = managed_headers if unmanaged_headers is None else unmanaged_headers
         assert headers is not None, "got neither managed nor unmanaged headers"
-        try:
-            VariantBoard = headers.variant()
-        except ValueError as error:
-            visitor.handle_error(error)
-            VariantBoard = chess.Board
-
-        # Initial position.
-        fen = headers.get("FEN", VariantBoard.starting_fen)
-        try:
-            board = VariantBoard(fen, chess960=headers.is_chess960())
-        except ValueError as error:
-            visitor.handle_error(error)
+        board = _initial_board(visitor, headers)
+        if board is None:
             skipping_game = True
         else:
-            board.chess960 = board.chess960 or board.has_chess960_castling_rights()
             board_stack = [board]
-            visitor.visit_board(board)
 
     # Fast path: Skip entire game.
     if skipping_game:
@@ -1958,7 +2067,7 @@ def read_game(
             elif token == "(":
                 if skip_variation_depth:
                     skip_variation_depth += 1
-                elif board_stack[-1].move_stack:
+                elif board_stack[-1]._stack_size:
                     if visitor.begin_variation() is SKIP:
                         skip_variation_depth = 1
                     else:
@@ -2014,6 +2123,27 @@ def read_game(
     visitor.end_game()
     return visitor.result()
 
+def _initial_board(visitor: BaseVisitor[Any], headers: Headers) -> Optional[chess.Board]:
+    # Chess variant.
+    try:
+        VariantBoard = headers.variant()
+    except ValueError as error:
+        visitor.handle_error(error)
+        VariantBoard = chess.Board
+
+    # Initial position.
+    fen = headers.get("FEN", VariantBoard.starting_fen)
+    try:
+        board = VariantBoard(fen, chess960=headers.is_chess960())
+    except ValueError as error:
+        visitor.handle_error(error)
+        return None
+
+    board.chess960 = board.chess960 or board.has_chess960_castling_rights()
+    visitor.visit_board(board)
+    return board
+
+
 def read_all_headers(pgn_file):
     """
     Read all headers from a PGN file, skipping empty header objects.
@@ -2078,6 +2208,447 @@ def skip_game(handle: TextIO) -> bool:
     return bool(read_game(handle, Visitor=SkipVisitor))
 
 
+class _ChunkedReader:
+    # Provides readline() for read_game(), but reads the underlying file
+    # in large chunks and splits lines in bulk.
+
+    def __init__(self, handle: Union[TextIO, BinaryIO], *, byte_offset: Optional[int], chunk_size: int, encoding: str, errors: str) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.errors = errors
+
+        # Byte offset of the current chunk, and of the next line when
+        # splitting line by line.
+        self._base: Optional[int] = None
+        self._offset = 0
+
+        # The current chunk, when splitting it with StringIO.
+        self._text = ""
+        self._lines: Optional[io.StringIO] = None
+        self._ascii = True
+        self._encoded = 0, 0
+
+        # Not all text streams derive from io.TextIOBase (for example
+        # codecs.open()), so tell the mode from the first chunk.
+        if byte_offset is not None:
+            handle.seek(byte_offset)
+        chunk = handle.read(chunk_size)
+        lines: Iterator[str]
+        if isinstance(chunk, str):
+            if byte_offset is not None:
+                raise ValueError("byte_offset requires a file opened in binary mode")
+            lines = self._text_lines(chunk)
+        else:
+            if byte_offset is None:
+                self._base = handle.tell() - len(chunk) if handle.seekable() else 0
+            else:
+                self._base = byte_offset
+            lines = self._byte_lines(chunk)
+
+        self.readline = functools.partial(next, lines, "")
+
+    def read_game(self, Visitor: Callable[[], BaseVisitor[ResultT]]) -> Optional[ResultT]:
+        result: Optional[ResultT] = read_game(typing.cast(TextIO, self), Visitor=Visitor)
+        return result
+
+    def tell(self) -> Optional[int]:
+        if self._base is None:
+            return None
+        elif self._lines is None:
+            return self._offset
+
+        pos = self._lines.tell()
+        if self._ascii:
+            return self._base + pos
+
+        # Count bytes incrementally, since the previous call.
+        encoded_pos, encoded_bytes = self._encoded
+        if encoded_pos > pos:
+            encoded_pos, encoded_bytes = 0, 0
+        encoded_bytes += len(self._text[encoded_pos:pos].encode(self.encoding, self.errors))
+        self._encoded = pos, encoded_bytes
+        return self._base + encoded_bytes
+
+    def _chunks(self, chunk: AnyStr) -> Iterator[AnyStr]:
+        read = typing.cast(Callable[[int], AnyStr], self.handle.read)
+        while chunk:
+            yield chunk
+            chunk = read(self.chunk_size)
+
+    def _text_lines(self, first: str) -> Iterator[str]:
+        chunks = self._chunks(first)
+        pending = ""
+        while True:
+            chunk = next(chunks, "")
+            if not chunk:
+                if pending:
+                    yield pending
+                return
+
+            chunk = pending + chunk
+            cut = chunk.rfind("\n") + 1
+            pending = chunk[cut:]
+            yield from io.StringIO(chunk[:cut])
+
+    def _byte_lines(self, first: bytes) -> Iterator[str]:
+        chunks = self._chunks(first)
+        encoding = self.encoding
+        errors = self.errors
+        offset = typing.cast(int, self._base)
+        pending = b""
+        while True:
+            chunk = next(chunks, b"")
+            if chunk:
+                chunk = pending + chunk
+                # Never split a line, or a multi-byte character.
+                cut = chunk.rfind(b"\n") + 1
+                pending = chunk[cut:]
+                chunk = chunk[:cut]
+            elif pending:
+                chunk, pending = pending, b""
+            else:
+                return
+
+            if b"\r" not in chunk:
+                text = chunk.decode(encoding, errors)
+                ascii = len(text) == len(chunk)
+                if ascii or errors == "strict":
+                    # Fast path: Split the decoded chunk. Byte offsets can
+                    # be recovered from the position in the text.
+                    self._base = offset
+                    self._text = text
+                    self._ascii = ascii
+                    self._encoded = 0, 0
+                    self._lines = io.StringIO(text)
+                    yield from self._lines
+                    offset += len(chunk)
+                    continue
+
+            # Universal newlines, like in text mode, or decoding errors that
+            # are not reversible. Decode line by line.
+            self._lines = None
+            for line in chunk.splitlines(True):
+                self._offset = offset = offset + len(line)
+                if line.endswith((b"\r", b"\n")):
+                    yield line.rstrip(b"\r\n").decode(encoding, errors) + "\n"
+                else:
+                    yield line.decode(encoding, errors)
+
+
+class _BufferReader:
+    # Reads games from a buffer with the whole file. The movetext is
+    # tokenized as bytes, and only header values and comments are decoded.
+
+    def __init__(self, buffer: Union[bytes, bytearray, mmap.mmap], *, byte_offset: Optional[int], encoding: str, errors: str) -> None:
+        self.buffer = buffer
+        self.encoding = encoding
+        self.errors = errors
+        self.pos = byte_offset or 0
+
+    def tell(self) -> int:
+        return self.pos
+
+    def read_game(self, Visitor: Callable[[], BaseVisitor[ResultT]]) -> Optional[ResultT]:
+        buf = self.buffer
+        size = len(buf)
+        visitor = Visitor()
+
+        found_game = False
+        skipping_game = False
+        managed_headers: Optional[Headers] = None
+        unmanaged_headers: Optional[Headers] = None
+        board_stack: List[chess.Board] = []
+
+        # The current line is buf[pos:end]. Lines of the headers are
+        # decoded as a whole. Note that find() returns -1 on the last line,
+        # if it is not terminated.
+        encoding = self.encoding
+        errors = self.errors
+        pos = self.pos
+        end = buf.find(b"\n", pos) + 1 or size
+        line = buf[pos:end].decode(encoding, errors).lstrip("\ufeff")
+
+        # Ignore leading empty lines and comments.
+        while line.isspace() or line.startswith("%") or line.startswith(";"):
+            pos, end = end, buf.find(b"\n", end) + 1 or size
+            line = buf[pos:end].decode(encoding, errors)
+
+        # Parse game headers.
+        consecutive_empty_lines = 0
+        while line:
+            # Ignore comments.
+            if line.startswith("%") or line.startswith(";"):
+                pos, end = end, buf.find(b"\n", end) + 1 or size
+                line = buf[pos:end].decode(encoding, errors)
+                continue
+
+            # Ignore up to one consecutive empty line between headers.
+            if consecutive_empty_lines < 1 and line.isspace():
+                consecutive_empty_lines += 1
+                pos, end = end, buf.find(b"\n", end) + 1 or size
+                line = buf[pos:end].decode(encoding, errors)
+                continue
+
+            # First token of the game.
+            if not found_game:
+                found_game = True
+                skipping_game = visitor.begin_game() is SKIP
+                if not skipping_game:
+                    managed_headers = visitor.begin_headers()
+                    if not isinstance(managed_headers, Headers):
+                        unmanaged_headers = Headers({})
+
+            if not line.startswith("["):
+                break
+
+            consecutive_empty_lines = 0
+
+            if not skipping_game:
+                tag_match = TAG_REGEX.match(line)
+                if tag_match:
+                    visitor.visit_header(tag_match.group(1), tag_match.group(2))
+                    if unmanaged_headers is not None:
+                        unmanaged_headers[tag_match.group(1)] = tag_match.group(2)
+
+            pos, end = end, buf.find(b"\n", end) + 1 or size
+            line = buf[pos:end].decode(encoding, errors)
+
+        if not found_game:
+            self.pos = size
+            return None
+
+        if not skipping_game:
+            skipping_game = visitor.end_headers() is SKIP
+
+        if not skipping_game:
+            headers = managed_headers if unmanaged_headers is None else unmanaged_headers
+            assert headers is not None, "got neither managed nor unmanaged headers"
+            board = _initial_board(visitor, headers)
+            if board is None:
+                skipping_game = True
+            else:
+                board_stack = [board]
+
+        # The current line is the first line of the movetext.
+        if line.isspace():
+            self.pos = end
+            visitor.end_game()
+            return visitor.result()
+
+        # Fast path: Skip entire game.
+        if skipping_game:
+            self.pos = self._skip_movetext(pos, line.startswith("%"))
+            visitor.end_game()
+            return visitor.result()
+
+        # Parse movetext.
+        if line.startswith("%") or line.startswith(";"):
+            pos = end - 1 if line.endswith("\n") else size
+        skip_variation_depth = 0
+        for match in MOVETEXT_BYTES_REGEX.finditer(buf, pos):
+            group = match.lastindex
+            if group == 1 or group == 7:
+                if skip_variation_depth:
+                    continue
+
+                token = match.group(group).decode("ascii")
+                if group == 7 and len(board_stack) == 1:
+                    visitor.visit_result(token)
+                    continue
+
+                # Parse SAN tokens.
+                if visitor.begin_parse_san(board_stack[-1], token) is not SKIP:
+                    try:
+                        move = board_stack[-1].parse_san(token)
+                    except ValueError as error:
+                        visitor.handle_error(error)
+                        skip_variation_depth = 1
+                    else:
+                        visitor.visit_move(board_stack[-1], move)
+                        board_stack[-1].push(move)
+                visitor.visit_board(board_stack[-1])
+            elif group == 2:
+                if not skip_variation_depth:
+                    visitor.visit_comment(self._decode_comment(match.group(2)))
+            elif group == 3:
+                # Ignored until the end of the line.
+                continue
+            elif group == 9:
+                # An empty line means the end of a game.
+                self.pos = match.end()
+                visitor.end_game()
+                return visitor.result()
+            elif group == 5:
+                if skip_variation_depth:
+                    skip_variation_depth += 1
+                elif board_stack[-1]._stack_size:
+                    if visitor.begin_variation() is SKIP:
+                        skip_variation_depth = 1
+                    else:
+                        board = board_stack[-1].copy()
+                        board.pop()
+                        board_stack.append(board)
+            elif group == 6:
+                if skip_variation_depth == 1:
+                    skip_variation_depth = 0
+                    visitor.end_variation()
+                elif skip_variation_depth:
+                    skip_variation_depth -= 1
+                elif len(board_stack) > 1:
+                    visitor.end_variation()
+                    board_stack.pop()
+            elif skip_variation_depth:
+                continue
+            elif group == 4:
+                # Found a NAG.
+                visitor.visit_nag(int(match.group(4)[1:]))
+            else:
+                visitor.visit_nag(_NAG_BYTES[match.group(8)])
+
+        self.pos = size
+        visitor.end_game()
+        return visitor.result()
+
+    def _decode_comment(self, token: bytes) -> str:
+        # Strip one space after the opening brace, and one before the closing
+        # brace, if any.
+        comment = token[2:] if token.startswith(b"{ ") else token[1:]
+        if comment.endswith(b"}"):
+            comment = comment[:-2] if comment.endswith(b" }") else comment[:-1]
+        if b"\r" in comment:
+            comment = comment.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return comment.decode(self.encoding, self.errors)
+
+    def _skip_movetext(self, pos: int, ignore_line: bool) -> int:
+        # Returns the end of the movetext starting at pos.
+        if ignore_line:
+            pos = self.buffer.find(b"\n", pos)
+            if pos < 0:
+                return len(self.buffer)
+
+        match = SKIP_MOVETEXT_BYTES_REGEX.match(self.buffer, pos)
+        assert match is not None
+        return match.end()
+
+
+class GameIterator(Generic[ResultT]):
+    """
+    Iterates over the games of a PGN file. See :func:`~chess.pgn.iter_games()`.
+    """
+
+    byte_offset: Optional[int]
+    """
+    The position in the file after the last game, in bytes. A later
+    :func:`~chess.pgn.iter_games()` call with this *byte_offset* resumes
+    with the next game. ``None`` for files opened in text mode.
+    """
+
+    def __init__(self, handle: Union[TextIO, BinaryIO, bytes, bytearray, mmap.mmap], *, Visitor: Callable[[], BaseVisitor[ResultT]], byte_offset: Optional[int] = None, chunk_size: int = 1024 * 1024, encoding: str = "utf-8", errors: str = "strict") -> None:
+        self._reader: Union[_ChunkedReader, _BufferReader]
+        if isinstance(handle, (bytes, bytearray, mmap.mmap)):
+            self._reader = _BufferReader(handle, byte_offset=byte_offset, encoding=encoding, errors=errors)
+        else:
+            self._reader = _ChunkedReader(handle, byte_offset=byte_offset, chunk_size=chunk_size, encoding=encoding, errors=errors)
+        self._Visitor = Visitor
+        self.byte_offset = self._reader.tell()
+
+    def __iter__(self) -> GameIterator[ResultT]:
+        return self
+
+    def __next__(self) -> ResultT:
+        result = self._reader.read_game(self._Visitor)
+        if result is None:
+            raise StopIteration
+        self.byte_offset = self._reader.tell()
+        return result
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} at {id(self):#x} (byte_offset={self.byte_offset})>"
+
+
+@typing.overload
+def iter_games(handle: Union[TextIO, BinaryIO, bytes, bytearray, mmap.mmap], *, byte_offset: Optional[int] = None, chunk_size: int = ..., encoding: str = ..., errors: str = ...) -> GameIterator[Game]: ...
+@typing.overload
+def iter_games(handle: Union[TextIO, BinaryIO, bytes, bytearray, mmap.mmap], *, Visitor: Callable[[], BaseVisitor[ResultT]], byte_offset: Optional[int] = None, chunk_size: int = ..., encoding: str = ..., errors: str = ...) -> GameIterator[ResultT]: ...
+def iter_games(handle: Union[TextIO, BinaryIO, bytes, bytearray, mmap.mmap], *, Visitor: Any = GameBuilder, byte_offset: Optional[int] = None, chunk_size: int = 1024 * 1024, encoding: str = "utf-8", errors: str = "strict") -> Any:
+    """
+    Lazily reads all games from a PGN file, like repeated calls of
+    :func:`~chess.pgn.read_game()`.
+
+    The file is read in chunks of *chunk_size* bytes (or characters), so that
+    memory use is bounded even for huge files, and lines are split in bulk.
+    Prefer files opened in binary mode: Then lines are decoded with the given
+    *encoding* (which must be ASCII compatible) and *errors* handling, and
+    the iterator keeps track of the
+    :data:`~chess.pgn.GameIterator.byte_offset`.
+
+    Reading starts at *byte_offset*, if given.
+
+    >>> import chess.pgn
+    >>>
+    >>> pgn = open("data/pgn/kasparov-deep-blue-1997.pgn", "rb")
+    >>>
+    >>> games = chess.pgn.iter_games(pgn)
+    >>> next(games).headers["Result"]
+    '1-0'
+    >>> games.byte_offset
+    717
+    >>>
+    >>> # Resume later.
+    >>> for game in chess.pgn.iter_games(pgn, byte_offset=717):
+    ...     print(game.headers["Result"])
+    ...
+    1-0
+    1/2-1/2
+    1/2-1/2
+    1/2-1/2
+    1-0
+
+    The position of the underlying file is undefined while and after
+    iterating.
+
+    Alternatively, pass the contents of the whole file as :class:`bytes`,
+    :class:`bytearray` or :class:`mmap.mmap`. Then the movetext is
+    tokenized directly on the bytes, decoding only comments and the lines
+    of the headers. Lines must end with ``\\n`` or ``\\r\\n``, and only ASCII
+    whitespace counts for empty lines in the movetext. Visitors work as
+    usual.
+
+    >>> import mmap
+    >>>
+    >>> with open("data/pgn/kasparov-deep-blue-1997.pgn", "rb") as pgn:
+    ...     buffer = mmap.mmap(pgn.fileno(), 0, access=mmap.ACCESS_READ)
+    ...
+    >>> games = chess.pgn.iter_games(buffer, byte_offset=717)
+    >>> next(games).headers["Result"]
+    '1-0'
+    >>> games.byte_offset
+    1436
+    """
+    return GameIterator(handle, Visitor=Visitor, byte_offset=byte_offset, chunk_size=chunk_size, encoding=encoding, errors=errors)
+
+
+def iter_headers(handle: Union[TextIO, BinaryIO, bytes, bytearray, mmap.mmap], *, byte_offset: Optional[int] = None, chunk_size: int = 1024 * 1024, encoding: str = "utf-8", errors: str = "strict") -> GameIterator[Headers]:
+    """
+    Lazily reads the headers of all games from a PGN file, skipping the
+    movetext. See :func:`~chess.pgn.iter_games()`.
+
+    >>> import chess.pgn
+    >>>
+    >>> pgn = open("data/pgn/kasparov-deep-blue-1997.pgn", "rb")
+    >>>
+    >>> for headers in chess.pgn.iter_headers(pgn):
+    ...     if headers["Result"] == "1-0":
+    ...         print(headers["White"])
+    ...
+    Garry Kasparov
+    Deep Blue (Computer)
+    Deep Blue (Computer)
+    """
+    return GameIterator(handle, Visitor=HeadersBuilder, byte_offset=byte_offset, chunk_size=chunk_size, encoding=encoding, errors=errors)
+
+
 def parse_time_control(time_control: str) -> TimeControl:
     tc = TimeControl()
 
@@ -4,7 +4,7 @@ import chess
 import itertools
 import typing
 
-from typing import Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Type, TypeVar, Union
+from typing import Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
 if typing.TYPE_CHECKING:
     from typing_extensions import Self
@@ -28,6 +28,8 @@ class SuicideBoard(chess.Board):
     one_king = False
     captures_compulsory = True
 
+    __slots__ = ()
+
     def pin_mask(self, color: chess.Color, square: chess.Square) -> chess.Bitboard:
         return chess.BB_ALL
 
@@ -96,7 +98,7 @@ class SuicideBoard(chess.Board):
         for move in super().generate_pseudo_legal_moves(from_mask, to_mask):
             # Add king promotions.
             if move.promotion == chess.QUEEN:
-                yield chess.Move(move.from_square, move.to_square, chess.KING)
+                yield chess._MOVES[move.from_square | move.to_square << 6 | chess.KING << 12]
 
             yield move
 
@@ -162,6 +164,8 @@ class GiveawayBoard(SuicideBoard):
     pawnless_tbw_magic = b"\x7b\xf6\x93\x15"
     pawnless_tbz_magic = b"\xe4\xcf\xe7\x23"
 
+    __slots__ = ()
+
     def is_variant_win(self) -> bool:
         return not self.occupied_co[self.turn] or self.is_stalemate()
 
@@ -178,6 +182,8 @@ class AntichessBoard(GiveawayBoard):
     uci_variant = "antichess"  # Unofficial
     starting_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
 
+    __slots__ = ()
+
     def __init__(self, fen: Optional[str] = starting_fen, chess960: bool = False) -> None:
         super().__init__(fen, chess960=chess960)
 
@@ -198,6 +204,8 @@ class AtomicBoard(chess.Board):
     tbz_magic = b"\x91\xa9\x5e\xeb"
     connected_kings = True
 
+    __slots__ = ()
+
     def is_variant_end(self) -> bool:
         return not all(self.kings & side for side in self.occupied_co)
 
@@ -276,6 +284,14 @@ class AtomicBoard(chess.Board):
     def checkers_mask(self) -> chess.Bitboard:
         return chess.BB_EMPTY if self._kings_connected() else super().checkers_mask()
 
+    def gives_check(self, move: chess.Move) -> bool:
+        # Explosions can uncover attacks and connect kings.
+        self.push(move)
+        try:
+            return self.is_check()
+        finally:
+            self.pop()
+
     def was_into_check(self) -> bool:
         return not self._kings_connected() and super().was_into_check()
 
@@ -331,6 +347,8 @@ class KingOfTheHillBoard(chess.Board):
     tbw_magic = None
     tbz_magic = None
 
+    __slots__ = ()
+
     def is_variant_end(self) -> bool:
         return bool(self.kings & chess.BB_CENTER)
 
@@ -356,6 +374,8 @@ class RacingKingsBoard(chess.Board):
     tbw_magic = None
     tbz_magic = None
 
+    __slots__ = ()
+
     def __init__(self, fen: Optional[str] = starting_fen, chess960: bool = False) -> None:
         super().__init__(fen, chess960=chess960)
 
@@ -434,6 +454,8 @@ class HordeBoard(chess.Board):
     tbw_magic = None
     tbz_magic = None
 
+    __slots__ = ()
+
     def __init__(self, fen: Optional[str] = starting_fen, chess960: bool = False) -> None:
         super().__init__(fen, chess960=chess960)
 
@@ -677,12 +699,16 @@ class HordeBoard(chess.Board):
 
 ThreeCheckBoardT = TypeVar("ThreeCheckBoardT", bound="ThreeCheckBoard")
 
-class _ThreeCheckBoardState:
+class _ThreeCheckBoardState(chess._BoardState):
+    __slots__ = ("remaining_checks_w", "remaining_checks_b")
+
     def __init__(self, board: ThreeCheckBoard) -> None:
+        super().__init__(board)
         self.remaining_checks_w = board.remaining_checks[chess.WHITE]
         self.remaining_checks_b = board.remaining_checks[chess.BLACK]
 
-    def restore(self, board: ThreeCheckBoard) -> None:
+    def restore(self, board: ThreeCheckBoard) -> None:  # type: ignore[override]
+        super().restore(board)
         board.remaining_checks[chess.WHITE] = self.remaining_checks_w
         board.remaining_checks[chess.BLACK] = self.remaining_checks_b
 
@@ -698,14 +724,14 @@ class ThreeCheckBoard(chess.Board):
     tbw_magic = None
     tbz_magic = None
 
+    __slots__ = ("remaining_checks",)
+
     def __init__(self, fen: Optional[str] = starting_fen, chess960: bool = False) -> None:
         self.remaining_checks = [3, 3]
-        self._three_check_stack: List[_ThreeCheckBoardState] = []
         super().__init__(fen, chess960=chess960)
 
-    def clear_stack(self) -> None:
-        super().clear_stack()
-        self._three_check_stack.clear()
+    def _board_state(self) -> _ThreeCheckBoardState:
+        return _ThreeCheckBoardState(self)
 
     def reset_board(self) -> None:
         super().reset_board()
@@ -717,17 +743,11 @@ class ThreeCheckBoard(chess.Board):
         self.remaining_checks[chess.WHITE] = 3
         self.remaining_checks[chess.BLACK] = 3
 
-    def push(self, move: chess.Move) -> None:
-        self._three_check_stack.append(_ThreeCheckBoardState(self))
-        super().push(move)
+    def _make_move(self, move: chess.Move) -> None:
+        super()._make_move(move)
         if self.is_check():
             self.remaining_checks[not self.turn] -= 1
 
-    def pop(self) -> chess.Move:
-        move = super().pop()
-        self._three_check_stack.pop().restore(self)
-        return move
-
     def has_insufficient_material(self, color: chess.Color) -> bool:
         # Any remaining piece can give check.
         return not (self.occupied_co[color] & ~self.kings)
@@ -780,6 +800,24 @@ class ThreeCheckBoard(chess.Board):
             epd.append(self._epd_operations(operations))
         return " ".join(epd)
 
+    def _write_bytes(self, data: bytearray) -> None:
+        super()._write_bytes(data)
+        data.append(max(self.remaining_checks[chess.WHITE], 0))
+        data.append(max(self.remaining_checks[chess.BLACK], 0))
+
+    def _read_bytes(self, data: bytes, offset: int) -> Tuple[int, Callable[[], None]]:
+        offset, apply_board = super()._read_bytes(data, offset)
+        wc, bc = data[offset], data[offset + 1]
+        if wc > 3 or bc > 3:
+            raise ValueError(f"invalid remaining checks in binary position: {data!r}")
+
+        def apply() -> None:
+            apply_board()
+            self.remaining_checks[chess.WHITE] = wc
+            self.remaining_checks[chess.BLACK] = bc
+
+        return offset + 2, apply
+
     def is_variant_end(self) -> bool:
         return any(remaining_checks <= 0 for remaining_checks in self.remaining_checks)
 
@@ -802,19 +840,8 @@ class ThreeCheckBoard(chess.Board):
     def copy(self, *, stack: Union[bool, int] = True) -> Self:
         board = super().copy(stack=stack)
         board.remaining_checks = self.remaining_checks.copy()
-        if stack:
-            stack = len(self.move_stack) if stack is True else stack
-            board._three_check_stack = self._three_check_stack[-stack:]
         return board
 
-    def root(self) -> Self:
-        if self._three_check_stack:
-            board = super().root()
-            self._three_check_stack[0].restore(board)
-            return board
-        else:
-            return self.copy(stack=False)
-
     def mirror(self) -> Self:
         board = super().mirror()
         board.remaining_checks[chess.WHITE] = self.remaining_checks[chess.BLACK]
@@ -824,20 +851,26 @@ class ThreeCheckBoard(chess.Board):
 
 CrazyhouseBoardT = TypeVar("CrazyhouseBoardT", bound="CrazyhouseBoard")
 
-class _CrazyhouseBoardState:
+class _CrazyhouseBoardState(chess._BoardState):
+    __slots__ = ("pockets_w", "pockets_b")
+
     def __init__(self, board: CrazyhouseBoard) -> None:
+        super().__init__(board)
         self.pockets_w = board.pockets[chess.WHITE].copy()
         self.pockets_b = board.pockets[chess.BLACK].copy()
 
-    def restore(self, board: CrazyhouseBoard) -> None:
-        board.pockets[chess.WHITE] = self.pockets_w
-        board.pockets[chess.BLACK] = self.pockets_b
+    def restore(self, board: CrazyhouseBoard) -> None:  # type: ignore[override]
+        super().restore(board)
+        board.pockets[chess.WHITE] = self.pockets_w.copy()
+        board.pockets[chess.BLACK] = self.pockets_b.copy()
 
 CrazyhousePocketT = TypeVar("CrazyhousePocketT", bound="CrazyhousePocket")
 
 class CrazyhousePocket:
     """A Crazyhouse pocket with a counter for each piece type."""
 
+    __slots__ = ("_pieces", "__weakref__")
+
     def __init__(self, symbols: Iterable[str] = "") -> None:
         self.reset()
         for symbol in symbols:
@@ -887,14 +920,14 @@ class CrazyhouseBoard(chess.Board):
     tbw_magic = None
     tbz_magic = None
 
+    __slots__ = ("pockets",)
+
     def __init__(self, fen: Optional[str] = starting_fen, chess960: bool = False) -> None:
         self.pockets = [CrazyhousePocket(), CrazyhousePocket()]
-        self._crazyhouse_stack: List[_CrazyhouseBoardState] = []
         super().__init__(fen, chess960=chess960)
 
-    def clear_stack(self) -> None:
-        super().clear_stack()
-        self._crazyhouse_stack.clear()
+    def _board_state(self) -> _CrazyhouseBoardState:
+        return _CrazyhouseBoardState(self)
 
     def reset_board(self) -> None:
         super().reset_board()
@@ -906,9 +939,8 @@ class CrazyhouseBoard(chess.Board):
         self.pockets[chess.WHITE].reset()
         self.pockets[chess.BLACK].reset()
 
-    def push(self, move: chess.Move) -> None:
-        self._crazyhouse_stack.append(_CrazyhouseBoardState(self))
-        super().push(move)
+    def _make_move(self, move: chess.Move) -> None:
+        super()._make_move(move)
         if move.drop:
             self.pockets[not self.turn].remove(move.drop)
 
@@ -918,11 +950,6 @@ class CrazyhouseBoard(chess.Board):
         else:
             self.pockets[self.turn].add(piece_type)
 
-    def pop(self) -> chess.Move:
-        move = super().pop()
-        self._crazyhouse_stack.pop().restore(self)
-        return move
-
     def _is_halfmoves(self, n: int) -> bool:
         # No draw by 50-move rule or 75-move rule.
         return False
@@ -1041,6 +1068,32 @@ class CrazyhouseBoard(chess.Board):
         self.pockets[chess.WHITE] = white_pocket
         self.pockets[chess.BLACK] = black_pocket
 
+    def _write_bytes(self, data: bytearray) -> None:
+        super()._write_bytes(data)
+        codes = [chess._piece_code(piece_type, color)
+                 for color in chess.COLORS
+                 for piece_type in chess.PIECE_TYPES
+                 for _ in range(self.pockets[color].count(piece_type))]
+        chess._write_varint(data, len(codes))
+        chess._write_nibbles(data, codes)
+
+    def _read_bytes(self, data: bytes, offset: int) -> Tuple[int, Callable[[], None]]:
+        offset, apply_board = super()._read_bytes(data, offset)
+        n, offset = chess._read_varint(data, offset)
+        codes, offset = chess._read_nibbles(data, offset, n)
+        pockets = [CrazyhousePocket(), CrazyhousePocket()]
+        for code in codes:
+            if not chess.KING >= code & 7 >= chess.PAWN:
+                raise ValueError(f"invalid pocket piece code {code} in binary position: {data!r}")
+            pockets[bool(code & 8)].add(code & 7)
+
+        def apply() -> None:
+            apply_board()
+            self.pockets[chess.WHITE] = pockets[chess.WHITE]
+            self.pockets[chess.BLACK] = pockets[chess.BLACK]
+
+        return offset, apply
+
     def board_fen(self, *, promoted: Optional[bool] = None) -> str:
         if promoted is None:
             promoted = True
@@ -1055,19 +1108,8 @@ class CrazyhouseBoard(chess.Board):
         board = super().copy(stack=stack)
         board.pockets[chess.WHITE] = self.pockets[chess.WHITE].copy()
         board.pockets[chess.BLACK] = self.pockets[chess.BLACK].copy()
-        if stack:
-            stack = len(self.move_stack) if stack is True else stack
-            board._crazyhouse_stack = self._crazyhouse_stack[-stack:]
         return board
 
-    def root(self) -> Self:
-        if self._crazyhouse_stack:
-            board = super().root()
-            self._crazyhouse_stack[0].restore(board)
-            return board
-        else:
-            return self.copy(stack=False)
-
     def mirror(self) -> Self:
         board = super().mirror()
         board.pockets[chess.WHITE] = self.pockets[chess.BLACK].copy()
@@ -71,6 +71,9 @@ setuptools.setup(
         "chess": ["py.typed"],
     },
     python_requires=">=3.8",
+    extras_require={
+        "numpy": ["numpy"],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
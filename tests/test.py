@@ -1,26 +1,42 @@
 #!/usr/bin/env python3
 
 import asyncio
+import codecs
 import copy
+import dataclasses
+import glob
 import logging
+import mmap
 import os
+import pickle
 import os.path
 import platform
 import sys
 import tempfile
 import textwrap
+import threading
 import unittest
+import weakref
 import io
 
 import chess
 import chess.gaviota
+import chess.instrument
 import chess.engine
+import chess.perft
 import chess.pgn
 import chess.polyglot
 import chess.svg
 import chess.syzygy
 import chess.variant
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+else:
+    import chess.batch
+
 
 class RaiseLogHandler(logging.StreamHandler):
     def handle(self, record):
@@ -156,6 +172,23 @@ class MoveTestCase(unittest.TestCase):
         self.assertEqual(copy.copy(b), b)
         self.assertEqual(copy.copy(c), c)
 
+    def test_shared_instances(self):
+        board = chess.Board("4k3/1P6/8/8/8/8/8/R3K2R w KQ - 0 1")
+        for move in board.legal_moves:
+            self.assertIs(chess.Move.from_uci(move.uci()), move)
+            self.assertIs(board.parse_uci(move.uci()), move)
+        self.assertIs(chess.Move.null(), chess.Move.from_uci("0000"))
+
+        move = chess.Move.from_uci("b7b8q")
+        self.assertEqual(len({move, chess.Move(chess.B7, chess.B8, chess.QUEEN)}), 1)
+        with self.assertRaises(AttributeError):
+            move.promotion = chess.KNIGHT  # type: ignore
+        self.assertEqual(chess.Move.from_uci("b7b8q").promotion, chess.QUEEN)
+
+        # Moves that no piece could make are still valid.
+        self.assertEqual(chess.Move.from_uci("a1b4"), chess.Move(chess.A1, chess.B4))
+        self.assertEqual(chess.Move.from_uci("a7b8p").promotion, chess.PAWN)
+
 
 class PieceTestCase(unittest.TestCase):
 
@@ -287,6 +320,96 @@ class BoardTestCase(unittest.TestCase):
         board = chess.Board(fen)
         self.assertEqual(board.fen(), "1r6/8/8/pP6/8/8/8/1K6 w - - 0 1")
 
+    def test_bytes(self):
+        for fen in [
+            chess.STARTING_FEN,
+            "r3k2r/8/8/3pP3/8/8/8/R3K2R w KQkq d6 17 123",
+            "8/8/8/8/8/8/8/8 b - - 0 1",
+            "1r2k3/P7/8/8/8/8/8/4K3 w - - 400 1000",
+        ]:
+            board = chess.Board(fen)
+            data = board.to_bytes()
+            self.assertLessEqual(len(data), 32)
+            self.assertEqual(chess.Board.from_bytes(data), board)
+            self.assertEqual(chess.Board.from_bytes(data).fen(), fen)
+
+        board = chess.Board.from_chess960_pos(123)
+        board.push_uci("e2e4")
+        copy = chess.Board.from_bytes(board.to_bytes(), chess960=True)
+        self.assertEqual(copy.fen(en_passant="fen"), board.fen(en_passant="fen"))
+        self.assertEqual(copy.move_stack, [])
+
+        data = chess.Board().to_bytes()
+        for invalid in [b"", data[:-1], data + b"\x00", b"\xf0" + data[1:]]:
+            with self.assertRaises(ValueError):
+                chess.Board.from_bytes(invalid)
+
+    def test_position(self):
+        board = chess.Board()
+        start = board.position()
+        for san in ["Nf3", "Nf6", "Ng1", "Ng8"]:
+            board.push_san(san)
+        self.assertEqual(board.position(), start)
+        self.assertEqual(hash(board.position()), hash(start))
+        self.assertEqual(start.zobrist_hash, chess.polyglot.zobrist_hash(board))
+        self.assertEqual(len({start, board.position(), chess.Board().position()}), 1)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            start.turn = chess.BLACK
+
+        board.push_san("e4")
+        self.assertNotEqual(board.position(), start)
+        self.assertEqual(chess.Board.from_position(board.position()).fen(), "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1")
+
+        # En passant square without a legal capture.
+        board = chess.Board("8/8/8/8/k2Pp2Q/8/8/3K4 b - d3 0 1")
+        position = board.position()
+        self.assertIsNone(position.ep_square)
+        self.assertEqual(position, chess.Board("8/8/8/8/k2Pp2Q/8/8/3K4 b - - 0 1").position())
+        self.assertEqual(hash(position), hash(chess.Board("8/8/8/8/k2Pp2Q/8/8/3K4 b - - 0 1").position()))
+
+        board = chess.Board("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3")
+        self.assertEqual(chess.Board.from_position(board.position()).ep_square, chess.F6)
+
+    def test_legal_move_cache(self):
+        cache = chess.LegalMoveCache(maxsize=2)
+        board = chess.Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        board.legal_move_cache = cache
+        moves = list(board.generate_legal_moves())
+
+        self.assertEqual(list(board.legal_moves), moves)
+        self.assertEqual(board.legal_moves.count(), len(moves))
+        self.assertTrue(board.legal_moves)
+        self.assertIn(chess.Move.from_uci("e1g1"), board.legal_moves)
+        self.assertIn(chess.Move.from_uci("e1h1"), board.legal_moves)
+        self.assertIn(chess.Move(chess.A1, chess.A8), board.legal_moves)
+        self.assertNotIn(chess.Move.from_uci("a1b2"), board.legal_moves)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (6, 1, 1))
+
+        # Copies share the cache, and moving selects a different entry.
+        copy = board.copy()
+        copy.push_san("O-O")
+        self.assertEqual(list(copy.legal_moves), list(copy.generate_legal_moves()))
+        copy.pop()
+        self.assertEqual(list(copy.legal_moves), moves)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (7, 2, 2))
+
+        # Chess960 mode and variants get their own entries.
+        board.chess960 = True
+        self.assertEqual(list(board.legal_moves), list(board.generate_legal_moves()))
+        self.assertIn(chess.Move.from_uci("e1h1"), board.legal_moves)
+        self.assertNotIn(chess.Move.from_uci("e1g1"), board.legal_moves)
+        self.assertEqual(len(cache), 2)
+
+        suicide = chess.variant.SuicideBoard("r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1")
+        suicide.legal_move_cache = cache
+        self.assertEqual(list(suicide.legal_moves), list(suicide.generate_legal_moves()))
+        self.assertEqual(len(cache), 2)
+
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+        with self.assertRaises(ValueError):
+            chess.LegalMoveCache(maxsize=-1)
+
     def test_fen_en_passant(self):
         board = chess.Board()
         board.push_san("e4")
@@ -758,6 +881,22 @@ class BoardTestCase(unittest.TestCase):
         with self.assertRaises(chess.IllegalMoveError):
             board.parse_san("f6")
 
+    def test_san_pinned_pieces(self):
+        # Same tokens in different positions.
+        board = chess.Board("4k3/8/8/8/8/2N1N3/8/4K3 w - - 0 1")
+        with self.assertRaises(chess.AmbiguousMoveError):
+            board.parse_san("Nd5")
+        self.assertEqual(board.parse_san("Ncd5"), chess.Move.from_uci("c3d5"))
+
+        board = chess.Board("4k3/8/8/8/8/2N1N3/8/4K2r w - - 0 1")
+        with self.assertRaises(chess.IllegalMoveError):
+            board.parse_san("Nd5")
+
+        board = chess.Board("4k3/8/8/b7/8/2N1N3/8/4K3 w - - 0 1")
+        self.assertEqual(board.parse_san("Nd5"), chess.Move.from_uci("e3d5"))
+        with self.assertRaises(chess.IllegalMoveError):
+            board.parse_san("Ncd5")
+
     def test_variation_san(self):
         board = chess.Board()
         self.assertEqual('1. e4 e5 2. Nf3',
@@ -793,6 +932,18 @@ class BoardTestCase(unittest.TestCase):
         self.assertIn('f3h6', message,
                       msg=f"Illegal move f3h6 appears in message [{message}]")
 
+    def test_san_line(self):
+        board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 2 3")
+        self.assertEqual(board.san_line([chess.Move.from_uci("f3f7")]), ["Qxf7#"])
+
+        board = chess.Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        moves = [chess.Move.from_uci(uci) for uci in ["e1g1", "e8c8", "a1a8", "c8c7"]]
+        self.assertEqual(board.san_line(moves), ["O-O", "O-O-O", "Ra8+", "Kc7"])
+        copy = board.copy()
+        self.assertEqual(board.san_line(moves), [copy.san_and_push(move) for move in moves])
+        self.assertEqual(board.fen(), "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        self.assertEqual(board.san_line([]), [])
+
     def test_move_stack_usage(self):
         board = chess.Board()
         board.push_uci("d2d4")
@@ -807,6 +958,88 @@ class BoardTestCase(unittest.TestCase):
         san = chess.Board().variation_san(board.move_stack)
         self.assertEqual(san, "1. d4 d5 2. Nf3 Bf5 3. e3 e6 4. Bd3 Bd6 5. O-O")
 
+    def test_pickle(self):
+        board = chess.Board()
+        self.assertEqual(pickle.loads(pickle.dumps(board)), board)
+
+        # Long history, including the chess960 flag and repetitions.
+        board = chess.Board.from_chess960_pos(518)
+        for _ in range(1000):
+            for uci in ["g1f3", "g8f6", "f3g1", "f6g8"]:
+                board.push_uci(uci)
+        board.push_uci("e2e4")
+        copy = pickle.loads(pickle.dumps(board))
+        self.assertEqual(copy, board)
+        self.assertTrue(copy.chess960)
+        self.assertEqual(copy.move_stack, board.move_stack)
+        self.assertEqual(copy.root(), board.root())
+        copy.pop()
+        self.assertTrue(copy.is_fivefold_repetition())
+
+        # Positions edited without clearing the stack.
+        board.turn = chess.WHITE
+        self.assertEqual(pickle.loads(pickle.dumps(board)).fen(), board.fen())
+
+    def test_copy_shares_move_stack(self):
+        board = chess.Board()
+        for san in ["e4", "e5", "Nf3", "Nc6", "Bb5"]:
+            board.push_san(san)
+        move_stack = board.move_stack
+
+        copy = board.copy()
+        self.assertEqual(copy.move_stack, move_stack)
+        self.assertEqual(copy.pop(), chess.Move.from_uci("f1b5"))
+        self.assertEqual(copy.pop(), chess.Move.from_uci("b8c6"))
+        copy.push_san("Nf6")
+        self.assertEqual(copy.peek(), chess.Move.from_uci("g8f6"))
+        self.assertEqual(len(copy.move_stack), 4)
+
+        board.push_san("a6")
+        self.assertIs(board.move_stack, move_stack)
+        self.assertEqual(len(move_stack), 6)
+        self.assertEqual(board.root(), chess.Board())
+        self.assertEqual(copy.root(), chess.Board())
+
+        limited = board.copy(stack=2)
+        self.assertEqual(limited.move_stack, move_stack[-2:])
+        self.assertEqual(limited.root().fen(), "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+        limited.pop()
+        limited.pop()
+        with self.assertRaises(IndexError):
+            limited.pop()
+        with self.assertRaises(IndexError):
+            limited.peek()
+        self.assertEqual(board.copy(stack=False).move_stack, [])
+        self.assertEqual(board.copy(stack=100).move_stack, move_stack)
+
+    def test_push_many(self):
+        moves = [chess.Move.from_uci(uci) for uci in ["e2e4", "d7d5", "e4d5", "d8d5", "b1c3", "d5a5", "d2d4", "c7c6", "g1f3"]]
+        board = chess.Board()
+        for move in moves:
+            board.push(move)
+
+        replayed = chess.Board()
+        replayed.push_many(moves)
+        self.assertEqual(replayed, board)
+        self.assertEqual(replayed.move_stack, moves)
+
+        fast = chess.Board()
+        fast.push_many(moves, stack=False)
+        self.assertEqual(fast.fen(), board.fen())
+        self.assertEqual(fast.move_stack, [])
+        self.assertEqual(fast.root(), fast)
+
+        partial = chess.Board()
+        partial.push_many(moves, ply=4)
+        self.assertEqual(partial.move_stack, moves[:4])
+
+        illegal = chess.Board()
+        with self.assertRaises(chess.IllegalMoveError):
+            illegal.push_many(moves[:2] + [chess.Move.from_uci("a1a3")], validate=True)
+        self.assertEqual(illegal.move_stack, moves[:2])
+        illegal.push_many([chess.Move.null()], validate=True)
+        self.assertEqual(illegal.turn, chess.BLACK)
+
     def test_is_legal_move(self):
         fen = "3k4/6P1/7P/8/K7/8/8/4R3 w - - 0 1"
         board = chess.Board(fen)
@@ -881,6 +1114,30 @@ class BoardTestCase(unittest.TestCase):
         self.assertEqual(board.fen(), "rnbqkbnr/p1pppppp/8/8/P6P/R1p5/1P1PPPP1/1NBQKBNR b Kkq - 1 4")
         self.assertEqual(chess.polyglot.zobrist_hash(board), 0x5c3f9b829b279560)
 
+    def test_zobrist_hash_incremental(self):
+        hasher = chess.polyglot.ZobristHasher(chess.polyglot.POLYGLOT_RANDOM_ARRAY)
+
+        board = chess.Board("r3k2r/1P6/8/3pP3/8/8/8/R3K2R w KQkq d6 0 1")
+        self.assertEqual(board.zobrist_hash(), hasher(board))
+
+        for san in ["exd6", "O-O", "bxa8=Q", "Rxa8", "O-O-O", "Kg7"]:
+            board.push_san(san)
+            self.assertEqual(board.zobrist_hash(), hasher(board))
+
+        copied = board.copy()
+        while board.move_stack:
+            board.pop()
+            self.assertEqual(board.zobrist_hash(), hasher(board))
+
+        self.assertEqual(copied.zobrist_hash(), hasher(copied))
+        self.assertEqual(board.root().zobrist_hash(), hasher(board))
+
+        board.set_piece_at(chess.E4, chess.Piece.from_symbol("N"))
+        self.assertEqual(board.zobrist_hash(), hasher(board))
+
+        board.apply_mirror()
+        self.assertEqual(board.zobrist_hash(), hasher(board))
+
     def test_castling_move_generation_bug(self):
         # Specific test position right after castling.
         fen = "rnbqkbnr/2pp1ppp/8/4p3/2BPP3/P1N2N2/PB3PPP/2RQ1RK1 b kq - 1 10"
@@ -1209,6 +1466,15 @@ class BoardTestCase(unittest.TestCase):
 
         self.assertFalse(board.attacks(chess.G1))
 
+    def test_attack_tables(self):
+        for masks, table, deltas in [(chess.BB_DIAG_MASKS, chess.BB_DIAG_ATTACKS, [-9, -7, 7, 9]),
+                                     (chess.BB_FILE_MASKS, chess.BB_FILE_ATTACKS, [-8, 8]),
+                                     (chess.BB_RANK_MASKS, chess.BB_RANK_ATTACKS, [-1, 1])]:
+            for square in [chess.A1, chess.H1, chess.D4, chess.E5, chess.B7, chess.H8]:
+                self.assertEqual(len(table[square]), 1 << chess.popcount(masks[square]))
+                for subset in chess.SquareSet(masks[square]).carry_rippler():
+                    self.assertEqual(table[square][subset], chess._sliding_attacks(square, subset, deltas))
+
     def test_clear(self):
         board = chess.Board()
         board.clear()
@@ -1337,6 +1603,46 @@ class BoardTestCase(unittest.TestCase):
     def test_trivial_is_repetition(self):
         self.assertTrue(chess.Board().is_repetition(1))
 
+    def test_repetition_with_illegal_en_passant(self):
+        # The en passant capture exd6 would expose the king, so the position
+        # after d5 counts as a repetition.
+        board = chess.Board("4k3/3p4/8/r3P2K/8/8/8/8 b - - 0 1")
+        board.push_san("d5")
+        self.assertTrue(board.has_pseudo_legal_en_passant())
+        self.assertFalse(board.has_legal_en_passant())
+
+        for san in ["Kh6", "Kf7", "Kh5", "Ke8"]:
+            board.push_san(san)
+        self.assertTrue(board.is_repetition(2))
+        self.assertFalse(board.is_repetition(3))
+
+        for san in ["Kh6", "Kf7", "Kh5", "Ke8"]:
+            board.push_san(san)
+        self.assertTrue(board.is_repetition(3))
+        self.assertFalse(board.is_repetition(4))
+
+        copy = board.copy(stack=5)
+        self.assertTrue(copy.is_repetition(2))
+        self.assertFalse(copy.is_repetition(3))
+
+    def test_repetition_keeps_resolved_keys(self):
+        board = chess.Board("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1")
+        for san in ["e4", "Ke7", "Kf1", "Ke8", "Ke1"]:
+            board.push_san(san)
+        self.assertFalse(board.can_claim_threefold_repetition())
+
+        def keys():
+            state = board._stack
+            while state is not None:
+                yield state.transposition_key
+                state = state.previous
+        self.assertNotIn(None, list(keys()))
+
+        # The deferred key after e4 is not resolved again.
+        stack = board._stack
+        self.assertFalse(board.is_repetition(2))
+        self.assertIs(board._stack, stack)
+
     def test_fifty_moves(self):
         # Test positions from Jan Timman vs. Christopher Lutz (1995).
         board = chess.Board()
@@ -1550,6 +1856,38 @@ class BoardTestCase(unittest.TestCase):
         # The empty square e8 would be considered pinned.
         self.assertTrue(board.is_pinned(chess.BLACK, chess.E8))
 
+    def test_check_analysis_invalidation(self):
+        board = chess.Board("4k3/8/8/8/1b6/8/3N4/4K3 w - - 0 1")
+        self.assertFalse(board.is_check())
+        self.assertNotIn(chess.Move.from_uci("d2f3"), board.legal_moves)
+
+        board.push_san("Kf2")
+        self.assertFalse(board.is_check())
+        board.push_san("Bc5+")
+        self.assertTrue(board.is_check())
+        self.assertEqual(board.checkers(), chess.SquareSet(chess.BB_C5))
+        copy = board.copy()
+
+        board.pop()
+        board.pop()
+        self.assertFalse(board.is_check())
+        self.assertFalse(board.is_legal(chess.Move.from_uci("d2f3")))
+        self.assertTrue(copy.is_check())
+
+        board.turn = chess.BLACK
+        self.assertFalse(board.is_check())
+        self.assertIn(chess.Move.from_uci("b4d2"), board.legal_moves)
+
+        board.turn = chess.WHITE
+        board.remove_piece_at(chess.B4)
+        self.assertIn(chess.Move.from_uci("d2f3"), board.legal_moves)
+        board.set_piece_at(chess.A5, chess.Piece.from_symbol("b"))
+        self.assertTrue(board.is_pinned(chess.WHITE, chess.D2))
+        self.assertNotIn(chess.Move.from_uci("d2f3"), board.legal_moves)
+        board.set_piece_at(chess.H4, chess.Piece.from_symbol("b"))
+        self.assertTrue(board.is_check())
+        self.assertEqual(board.checkers(), chess.SquareSet(chess.BB_H4))
+
     def test_impossible_en_passant(self):
         # Not a pawn there.
         board = chess.Board("1b1b4/8/b1P5/2kP4/8/2b4K/8/8 w - c6 0 1")
@@ -1646,6 +1984,93 @@ class BoardTestCase(unittest.TestCase):
         self.assertIn(chess.Move.from_uci("c2d3"), plc)
         self.assertEqual(len(plc), 5)
 
+    def test_legal_move_count(self):
+        for fen in [
+            chess.STARTING_FEN,
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+            "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+            "8/8/8/r2Pp2K/8/8/4k3/8 w - e6 0 1",  # En passant exposes the king
+            "4k3/8/8/8/7b/8/5P2/4K3 w - - 0 1",  # Pinned pawn
+            "1q2k3/8/8/8/8/8/1R6/K7 w - - 0 1",  # Pinned rook
+            "1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1",  # Promotions
+            "k7/8/8/8/8/8/1p6/R3K3 b Q - 0 1",
+            "4k3/8/8/8/8/8/8/RPPPPPP1 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4K2r w - - 0 1",  # Check
+        ]:
+            board = chess.Board(fen)
+            self.assertEqual(board.legal_moves.count(), len(list(board.legal_moves)), fen)
+
+        board = chess.variant.HordeBoard()
+        self.assertEqual(board.legal_moves.count(), len(list(board.legal_moves)))
+
+    def test_has_legal_moves(self):
+        for fen, has_legal_moves in [
+            ("8/8/8/5p2/8/q7/Q7/K1k5 w - - 0 1", True),  # Pinned queen
+            ("7K/8/5pq1/7P/8/8/7r/6k1 w - - 0 1", True),  # Pinned pawn
+            ("8/8/4k3/3pP3/8/2nn4/8/K7 w - d6 0 1", True),  # En passant
+            ("8/8/4k3/3pP3/8/2nn4/8/K7 w - - 0 1", False),
+            ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", False),
+            ("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1", False),  # Checkmate
+        ]:
+            board = chess.Board(fen)
+            self.assertEqual(bool(board.legal_moves), has_legal_moves, fen)
+            self.assertEqual(board.is_game_over(), not has_legal_moves, fen)
+
+        board = chess.Board("7k/8/6K1/8/8/8/8/5Q2 w - - 0 1")
+        self.assertFalse(board.is_game_over())
+        board.push_san("Qf7")
+        self.assertTrue(board.is_stalemate())
+        board.pop()
+        self.assertFalse(board.is_stalemate())
+        self.assertTrue(board.legal_moves)
+
+        # Attributes may be assigned directly.
+        board = chess.Board("8/8/4k3/3pP3/8/2nn4/8/K7 w - d6 0 1")
+        self.assertFalse(board.is_stalemate())
+        board.ep_square = None
+        self.assertTrue(board.is_stalemate())
+        self.assertFalse(board.legal_moves)
+        board.ep_square = chess.D6
+        self.assertFalse(board.is_game_over())
+
+    def test_gives_check(self):
+        for fen, uci in [
+            ("3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", "e1c1"),  # Castling
+            ("8/8/8/R2pP2k/8/8/8/4K3 w - d6 0 1", "e5d6"),  # En passant
+            ("8/4P1k1/8/8/8/8/8/4K3 w - - 0 1", "e7e8n"),  # Underpromotion
+            ("8/8/8/8/8/2k5/8/B1N1K3 w - - 0 1", "c1e2"),  # Discovered
+        ]:
+            board = chess.Board(fen)
+            self.assertTrue(board.gives_check(chess.Move.from_uci(uci)), fen)
+
+            for move in board.legal_moves:
+                board.push(move)
+                is_check = board.is_check()
+                board.pop()
+                self.assertEqual(board.gives_check(move), is_check, f"{fen} {move}")
+
+        board = chess.Board("8/4P1k1/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertFalse(board.gives_check(chess.Move.from_uci("e7e8q")))
+        self.assertFalse(board.gives_check(chess.Move.null()))
+
+    def test_legal_moves_array(self):
+        board = chess.Board("r3k3/1P6/8/3pP3/8/8/8/4K2R w Kq d6 0 1")
+        moves = board.legal_moves_array()
+        self.assertEqual(moves.typecode, "H")
+        self.assertEqual([chess.Move.from_encoded(code) for code in moves], list(board.legal_moves))
+        self.assertEqual(list(board.legal_moves_array(chess.BB_B7)), [move.encode() for move in board.generate_legal_moves(chess.BB_B7)])
+
+        self.assertEqual(chess.Move.from_uci("b7a8n").encode(), chess.B7 | chess.A8 << 6 | chess.KNIGHT << 12)
+        self.assertEqual(chess.Move.null().encode(), 0)
+        for code in [-1, 0x10000, chess.B7 | chess.A8 << 6 | 7 << 12]:
+            with self.assertRaises(chess.InvalidMoveError):
+                chess.Move.from_encoded(code)
+
+        board.push_encoded(chess.Move.from_uci("e5d6").encode())
+        board.push_encoded(chess.Move.from_uci("e8c8").encode())
+        self.assertEqual(board.fen(), "2kr4/1P6/3P4/8/8/8/8/4K2R w K - 1 2")
+        self.assertEqual(board.push_encoded(0), chess.Move.null())
+
     def test_castling_is_legal(self):
         board = chess.Board("rnbqkbnr/5p2/1pp3pp/p2P4/6P1/2NPpN2/PPP1Q1BP/R3K2R w Qq - 0 11")
         self.assertFalse(board.is_legal(chess.Move.from_uci("e1g1")))
@@ -1771,6 +2196,26 @@ class BaseBoardTestCase(unittest.TestCase):
         a.set_piece_map({})
         self.assertNotEqual(a, b)
 
+    def test_slots(self):
+        objects = [chess.BaseBoard(), chess.SquareSet(chess.BB_ALL), chess.Piece.from_symbol("K"), chess.variant.CrazyhousePocket("pq")]
+        for cls in chess.variant.VARIANTS:
+            board = cls()
+            board.push(next(iter(board.legal_moves)))
+            objects.append(board)
+            objects.append(board._stack)
+
+        for obj in objects:
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_weakref(self):
+        objects = [chess.BaseBoard(), chess.SquareSet(chess.BB_ALL), chess.variant.CrazyhousePocket("pq")]
+        objects.extend(cls() for cls in chess.variant.VARIANTS)
+        for obj in objects:
+            self.assertIs(weakref.ref(obj)(), obj)
+
+        boards = weakref.WeakValueDictionary({"start": chess.Board()})
+        self.assertEqual(len(boards), 0)
+
 
 class SquareSetTestCase(unittest.TestCase):
 
@@ -2084,6 +2529,10 @@ class PolyglotTestCase(unittest.TestCase):
                 book.find(chess.Board(), minimum_weight=2)
 
 
+class AnnotatedNode(chess.pgn.ChildNode):
+    engine_eval = None
+
+
 class PgnTestCase(unittest.TestCase):
 
     def test_exporter(self):
@@ -2199,6 +2648,132 @@ class PgnTestCase(unittest.TestCase):
         node.promote_to_main(d4)
         self.assertEqual(list(variation.move for variation in node.variations), [d4, e4])
 
+    def test_pickle(self):
+        game = chess.pgn.Game()
+        game.headers["Event"] = "Pickle"
+        game.comments = ["root"]
+        node = game
+        for _ in range(1000):
+            for uci in ["g1f3", "g8f6", "f3g1", "f6g8"]:
+                node = node.add_variation(chess.Move.from_uci(uci))
+        node.comment = "end"
+        side = game.add_variation(chess.Move.from_uci("e2e4"), comment="sideline", nags=[chess.pgn.NAG_GOOD_MOVE])
+        side.add_main_variation(chess.Move.from_uci("e7e5"))
+        game.variations[0].add_variation(chess.Move.from_uci("e7e5"), starting_comment="start")
+
+        copy = pickle.loads(pickle.dumps(game))
+        self.assertEqual(str(copy), str(game))
+        self.assertEqual(copy.headers["Event"], "Pickle")
+        self.assertEqual(copy.end().comment, "end")
+        self.assertEqual(copy.end().ply(), 4000)
+        self.assertEqual(copy.variations[1].nags, {chess.pgn.NAG_GOOD_MOVE})
+        self.assertEqual(copy.variations[0].variations[1].starting_comments, ["start"])
+
+        # Nodes are pickled along with their game.
+        end = pickle.loads(pickle.dumps(side.end()))
+        self.assertEqual(end.move, chess.Move.from_uci("e7e5"))
+        self.assertEqual(end.game().end().comment, "end")
+
+        # Custom node classes and attributes survive.
+        game = chess.pgn.Game()
+        node = AnnotatedNode(game, chess.Move.from_uci("e2e4"))
+        node.engine_eval = 31
+        node.add_variation(chess.Move.from_uci("e7e5")).clock = 59.5
+        copy = pickle.loads(pickle.dumps(game))
+        self.assertIs(type(copy.next()), AnnotatedNode)
+        self.assertEqual(copy.next().engine_eval, 31)
+        self.assertIs(type(copy.end()), chess.pgn.ChildNode)
+        self.assertEqual(copy.end().clock, 59.5)
+        self.assertEqual(copy.end().comments, [])
+
+    def test_iter_games(self):
+        with open("data/pgn/kasparov-deep-blue-1997.pgn") as pgn:
+            expected = [str(game) for game in iter(lambda: chess.pgn.read_game(pgn), None)]
+        self.assertEqual(len(expected), 6)
+
+        with open("data/pgn/kasparov-deep-blue-1997.pgn", "rb") as pgn:
+            games = chess.pgn.iter_games(pgn, chunk_size=100)
+            self.assertEqual(games.byte_offset, 0)
+            self.assertEqual(str(next(games)), expected[0])
+            offset = games.byte_offset
+            self.assertEqual(offset, 717)
+
+            games = chess.pgn.iter_games(pgn, byte_offset=offset)
+            self.assertEqual([str(game) for game in games], expected[1:])
+            self.assertEqual(games.byte_offset, os.path.getsize("data/pgn/kasparov-deep-blue-1997.pgn"))
+
+        with open("data/pgn/kasparov-deep-blue-1997.pgn") as pgn:
+            self.assertEqual([str(game) for game in chess.pgn.iter_games(pgn, chunk_size=7)], expected)
+            with self.assertRaises(ValueError):
+                chess.pgn.iter_games(pgn, byte_offset=0)
+
+        # Text streams that do not derive from io.TextIOBase.
+        with codecs.open("data/pgn/kasparov-deep-blue-1997.pgn", encoding="utf-8") as pgn:
+            games = chess.pgn.iter_games(pgn, chunk_size=100)
+            self.assertIsNone(games.byte_offset)
+            self.assertEqual([str(game) for game in games], expected)
+
+    def test_iter_games_newlines(self):
+        pgn = "[White \"Müller\"]\n\n1. e4 { A\ncomment } e5 *\n\n1. d4 *\n"
+        expected = [str(game) for game in chess.pgn.iter_games(io.StringIO(pgn))]
+        self.assertEqual(len(expected), 2)
+        self.assertIn("A\ncomment", expected[0])
+
+        for newline in [b"\r\n", b"\r"]:
+            data = pgn.encode("utf-8").replace(b"\n", newline)
+            for chunk_size in [1, 5, 1024]:
+                games = chess.pgn.iter_games(io.BytesIO(data), chunk_size=chunk_size)
+                self.assertEqual([str(game) for game in games], expected)
+                self.assertEqual(games.byte_offset, len(data))
+
+        data = pgn.encode("utf-8")
+        games = chess.pgn.iter_games(io.BytesIO(data), chunk_size=5)
+        next(games)
+        self.assertEqual(data[games.byte_offset:], b"1. d4 *\n")
+
+    def test_iter_games_buffer(self):
+        for path in sorted(glob.glob("data/pgn/*.pgn")):
+            with open(path, "rb") as pgn:
+                data = pgn.read()
+                games = chess.pgn.iter_games(pgn, byte_offset=0)
+                expected = [(str(game), game.errors == [], games.byte_offset) for game in games]
+
+                buffer = mmap.mmap(pgn.fileno(), 0, access=mmap.ACCESS_READ)
+                self.addCleanup(buffer.close)
+
+            for source in [data, bytearray(data), buffer]:
+                games = chess.pgn.iter_games(source)
+                self.assertEqual([(str(game), game.errors == [], games.byte_offset) for game in games], expected, path)
+
+            # Resume at the start of each game.
+            offsets = [offset for _, _, offset in expected]
+            for i, offset in enumerate([0] + offsets[:-1]):
+                games = chess.pgn.iter_games(data, Visitor=chess.pgn.SkipVisitor, byte_offset=offset)
+                self.assertEqual([games.byte_offset for _ in games], offsets[i:])
+
+            headers = list(chess.pgn.iter_headers(data.replace(b"\n", b"\r\n")))
+            self.assertEqual(headers, list(chess.pgn.iter_headers(io.BytesIO(data))))
+
+    def test_iter_games_buffer_comments(self):
+        pgn = b"1. e4 {} 1... e5 { A } 2. Nf3 {  B  } ( 2. Nc3 { C\r\nD } ; E {\r\n2... Nc6 ) {F}\n%G {\n2... Nc6 { H\n\n(\n I } *\n"
+        expected = chess.pgn.read_game(io.TextIOWrapper(io.BytesIO(pgn), encoding="utf-8"))
+        game = next(chess.pgn.iter_games(pgn))
+        self.assertEqual(str(game), str(expected))
+
+        e4 = game.next()
+        self.assertEqual(e4.comments, [])
+        self.assertEqual(e4.next().comments, ["A"])
+        self.assertEqual(e4.next().next().comments, [" B ", "F"])
+        self.assertEqual(e4.next().variation(1).comments, ["C\nD"])
+        self.assertEqual(game.end().comments, ["H\n\n(\n I"])
+
+    def test_iter_headers(self):
+        with open("data/pgn/kasparov-deep-blue-1997.pgn", "rb") as pgn:
+            headers = list(chess.pgn.iter_headers(pgn))
+        self.assertEqual(len(headers), 6)
+        self.assertEqual(headers[5]["White"], "Deep Blue (Computer)")
+        self.assertEqual(headers[5]["Result"], "1-0")
+
     def test_read_game(self):
         with open("data/pgn/kasparov-deep-blue-1997.pgn") as pgn:
             first_game = chess.pgn.read_game(pgn)
@@ -2332,6 +2907,15 @@ class PgnTestCase(unittest.TestCase):
         self.assertEqual(game[0].san(), "c4")
         self.assertEqual(len(game.errors), 0)
 
+    def test_node_san_after_setup(self):
+        game = chess.pgn.Game()
+        node = game.add_variation(chess.Move.from_uci("g1f3"))
+        self.assertEqual(node.san(), "Nf3")
+
+        game.setup("4k3/8/8/8/8/8/8/4K1R1 w - - 0 1")
+        self.assertEqual(node.san(), "Rf3")
+        self.assertIn("1. Rf3", str(game))
+
     def test_game_starting_comment(self):
         pgn = io.StringIO("{ Game starting comment } 1. d3")
         game = chess.pgn.read_game(pgn)
@@ -4385,6 +4969,217 @@ class SvgTestCase(unittest.TestCase):
         self.assertIn("id=\"white-king\"", svg)
 
 
+class InstrumentTestCase(unittest.TestCase):
+
+    def setUp(self):
+        chess.instrument.reset()
+
+    def tearDown(self):
+        chess.instrument.disable()
+
+    def test_instrumented(self):
+        push = chess.Board.push
+        board = chess.Board()
+
+        with chess.instrument.instrumented():
+            self.assertTrue(chess.instrument.is_enabled())
+            self.assertIsNot(chess.Board.push, push)
+            board.push_san("e4")
+            board.push_san("e5")
+            board.pop()
+            self.assertEqual(len(list(board.generate_legal_moves())), 20)
+
+        self.assertFalse(chess.instrument.is_enabled())
+        self.assertIs(chess.Board.push, push)
+        board.push_san("c5")
+
+        stats = chess.instrument.snapshot()
+        self.assertEqual(stats["Board.push"].calls, 2)
+        self.assertEqual(stats["Board.pop"].calls, 1)
+        self.assertEqual(stats["Board.parse_san"].calls, 2)
+        self.assertGreaterEqual(stats["Board.generate_legal_moves"].calls, 1)
+        self.assertGreater(stats["Board.push"].seconds, 0)
+
+        chess.instrument.reset()
+        self.assertEqual(chess.instrument.snapshot()["Board.push"], chess.instrument.Stats(0, 0.0))
+
+    def test_threads(self):
+        def work():
+            board = chess.Board()
+            for move in list(board.legal_moves):
+                board.push(move)
+                board.pop()
+
+        chess.instrument.enable()
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+        work()
+        chess.instrument.disable()
+
+        snapshots = chess.instrument.thread_snapshots()
+        self.assertEqual(snapshots[thread.ident]["Board.push"].calls, 20)
+        self.assertEqual(snapshots[threading.get_ident()]["Board.push"].calls, 20)
+        self.assertEqual(chess.instrument.snapshot()["Board.push"].calls, 40)
+
+    def test_sequential_threads(self):
+        # Identifiers of terminated threads are reused.
+        with chess.instrument.instrumented():
+            for _ in range(5):
+                thread = threading.Thread(target=lambda: chess.Board().fen())
+                thread.start()
+                thread.join()
+
+        self.assertEqual(chess.instrument.snapshot()["Board.fen"].calls, 5)
+
+        chess.instrument.reset()
+        self.assertEqual(chess.instrument.snapshot()["Board.fen"].calls, 0)
+
+    def test_probes(self):
+        board = chess.Board("8/8/8/8/8/2k5/8/K6Q w - - 0 1")
+        with chess.instrument.instrumented():
+            with chess.syzygy.open_tablebase("data/syzygy/regular") as tables:
+                tables.probe_wdl(board)
+            with chess.polyglot.open_reader("data/polyglot/performance.bin") as reader:
+                reader.get(board)
+
+        stats = chess.instrument.snapshot()
+        self.assertEqual(stats["syzygy.Tablebase.probe_wdl"].calls, 1)
+        self.assertEqual(stats["polyglot.MemoryMappedReader.find_all"].calls, 1)
+
+
+class PerftTestCase(unittest.TestCase):
+
+    def test_perft(self):
+        board = chess.Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        self.assertEqual(chess.perft.perft(board, 0), 1)
+        self.assertEqual(chess.perft.perft(board, 1), 48)
+        self.assertEqual(chess.perft.perft(board, 2), 2039)
+
+        table = chess.perft.PerftTable(1000)
+        self.assertEqual(table.size, 1024)
+        self.assertEqual(chess.perft.perft(board, 3, table=table), 97862)
+        self.assertEqual(chess.perft.perft(board, 3, table=table), 97862)
+        self.assertTrue(table.hits)
+        self.assertEqual(board.fen(), "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+        with self.assertRaises(ValueError):
+            chess.perft.PerftTable(0)
+
+    def test_divide(self):
+        board = chess.Board()
+        nodes = chess.perft.divide(board, 2, table=chess.perft.PerftTable())
+        self.assertEqual(len(nodes), 20)
+        self.assertEqual(nodes[chess.Move.from_uci("g1f3")], 20)
+        self.assertEqual(sum(nodes.values()), 400)
+
+    def test_variant_keys(self):
+        # Transposition keys must include pockets and Chess960 castling
+        # rights.
+        board = chess.variant.CrazyhouseBoard("2k5/8/8/8/8/8/8/4K3[Qn] w - - 0 1")
+        self.assertEqual(chess.perft.perft(board, 3, table=chess.perft.PerftTable()), 88634)
+
+        table = chess.perft.PerftTable()
+        board = chess.Board("1r2k3/8/8/8/8/8/8/R3K1RR w G - 0 1", chess960=True)
+        self.assertEqual(chess.perft.perft(board, 3, table=table), 13826)
+        board = chess.Board("1r2k3/8/8/8/8/8/8/R3K1RR w H - 0 1", chess960=True)
+        self.assertEqual(chess.perft.perft(board, 3, table=table), 13292)
+
+        # Castling rights and depth must not be interchangeable.
+        table = chess.perft.PerftTable()
+        board = chess.Board("4k3/8/8/8/8/8/8/1RRK4 w - - 0 1", chess960=True)
+        board.castling_rights = chess.BB_B1
+        table.store(chess.perft._zobrist_key(board), 4, 12345)
+        board.castling_rights = chess.BB_C1
+        self.assertIsNone(table.get(chess.perft._zobrist_key(board), 2))
+        self.assertEqual(chess.perft.perft(board, 2, table=table), chess.perft.perft(board, 2))
+
+    def test_parallel_perft(self):
+        board = chess.Board("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1")
+        self.assertEqual(chess.perft.parallel_perft(board, 3, split_depth=1, processes=2), 2812)
+
+    def test_run_suite(self):
+        suite = io.StringIO(textwrap.dedent("""\
+            # Comment
+            id start
+            epd rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -
+            perft 1 20
+            perft 2 400
+            perft 3 8902
+            """))
+        nodes, elapsed = chess.perft.run_suite(suite, chess.Board, chess.perft.perft, max_depth=2)
+        self.assertEqual(nodes, 420)
+
+        suite = io.StringIO("epd 4k3/8/8/8/8/8/8/4K3 w - -\nperft 1 6\n")
+        with self.assertRaises(chess.perft.PerftError) as err:
+            chess.perft.run_suite(suite, chess.Board, chess.perft.perft)
+        self.assertEqual(err.exception.depth, 1)
+
+
+@unittest.skipIf(numpy is None, "need numpy")
+class BatchTestCase(unittest.TestCase):
+
+    def boards(self):
+        boards = [
+            chess.Board(),
+            chess.Board("r3k2r/8/8/8/8/8/8/R3K2R b Kq - 3 21"),
+            chess.Board("rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3"),
+            chess.Board("rnbqkbnr/pppp1ppp/8/3Pp3/8/8/PPP1PPPP/RNBQKBNR w KQkq e6 0 3"),
+            chess.Board("8/8/8/4k3/8/8/3QK3/8 w - - 0 1"),
+        ]
+        board = chess.Board()
+        for san in ["e4", "d5", "exd5", "Qxd5", "Nc3", "Qa5", "d4", "c6", "Nf3", "Bg4"]:
+            board.push_san(san)
+            boards.append(board.copy(stack=False))
+        return boards
+
+    def test_roundtrip(self):
+        boards = self.boards()
+        batch = chess.batch.BoardBatch.from_fens(board.fen() for board in boards)
+        self.assertEqual(len(batch), len(boards))
+        self.assertEqual(batch.fens(), [board.fen() for board in boards])
+        self.assertEqual(batch[2], boards[2])
+        self.assertEqual(batch[batch.turn].fens(), [board.fen() for board in boards if board.turn])
+        self.assertEqual(len(batch[1:3]), 2)
+
+    def test_chess960_roundtrip(self):
+        boards = [
+            chess.Board(),
+            chess.Board.from_chess960_pos(0),
+            chess.Board("1r2k1r1/8/8/8/8/8/8/1R2K1R1 w GBgb - 0 1", chess960=True),
+        ]
+        batch = chess.batch.BoardBatch.from_boards(boards)
+        self.assertEqual(batch.chess960.tolist(), [False, True, True])
+        self.assertEqual(batch.fens(), [board.fen() for board in boards])
+        self.assertEqual(batch[2].castling_rights, chess.BB_B1 | chess.BB_G1 | chess.BB_B8 | chess.BB_G8)
+        self.assertTrue(batch[1:].board(1).chess960)
+
+        batch = chess.batch.BoardBatch.from_fens([boards[2].fen()], chess960=True)
+        self.assertEqual(batch.fens(), [boards[2].fen()])
+
+    def test_features(self):
+        boards = self.boards()
+        batch = chess.batch.BoardBatch.from_boards(boards)
+        self.assertEqual(batch.zobrist_hash().tolist(), [chess.polyglot.zobrist_hash(board) for board in boards])
+        for color in chess.COLORS:
+            for piece_type in chess.PIECE_TYPES:
+                self.assertEqual(batch.count_pieces(color, piece_type).tolist(),
+                                 [len(board.pieces(piece_type, color)) for board in boards])
+        self.assertEqual(batch.count_pieces().tolist(), [chess.popcount(board.occupied) for board in boards])
+        signature = batch.material_signature()
+        self.assertEqual(signature[0], signature[5])
+        self.assertNotEqual(signature[0], signature[-1])
+
+    def test_transforms(self):
+        boards = self.boards()
+        batch = chess.batch.BoardBatch.from_boards(boards)
+        self.assertEqual(batch.flip_vertical().fens(), [board.transform(chess.flip_vertical).fen() for board in boards])
+        self.assertEqual(batch.flip_horizontal().fens(), [board.transform(chess.flip_horizontal).fen() for board in boards])
+        self.assertEqual(batch.flip_diagonal().fens(), [board.transform(chess.flip_diagonal).fen() for board in boards])
+        self.assertEqual(batch.mirror().fens(), [board.mirror().fen() for board in boards])
+        self.assertEqual(batch.fens(), [board.fen() for board in boards])
+
+
 class SuicideTestCase(unittest.TestCase):
 
     def test_parse_san(self):
@@ -4574,6 +5369,18 @@ class AtomicTestCase(unittest.TestCase):
         self.assertEqual(game.end().parent.board().fen(), "rkr1b1n1/1pp2p2/4n1p1/p2pp2p/3P3P/Q1P3P1/PP2PP2/RK3N2 w Qkq - 0 10")
         self.assertEqual(game.end().board().fen(), "rkr1b1n1/1pp2p2/4n1p1/p2pp2p/3P3P/Q1P3P1/PP2PP2/2KR1N2 b kq - 1 10")
 
+    def test_atomic_gives_check_restores_board(self):
+        class FailingAtomicBoard(chess.variant.AtomicBoard):
+            def is_check(self) -> bool:
+                raise RuntimeError("is_check")
+
+        board = FailingAtomicBoard()
+        fen = board.fen()
+        with self.assertRaises(RuntimeError):
+            board.gives_check(chess.Move.from_uci("e2e4"))
+        self.assertEqual(board.fen(), fen)
+        self.assertEqual(board.move_stack, [])
+
     def test_atomic_king_exploded(self):
         board = chess.variant.AtomicBoard("rn5r/pp4pp/2p3Nn/5p2/1b2P1PP/8/PPP2P2/R1B1KB1R b KQ - 0 9")
         self.assertEqual(board.outcome().winner, chess.WHITE)
@@ -4811,6 +5618,31 @@ class ThreeCheckTestCase(unittest.TestCase):
         self.assertEqual(board.copy().root().remaining_checks[chess.WHITE], 2)
         self.assertEqual(board.copy().root().remaining_checks[chess.BLACK], 3)
 
+    def test_three_check_push_many(self):
+        moves = [chess.Move.from_uci(uci) for uci in ["e2e4", "e7e5", "f1c4", "d8h4", "c4f7", "e8e7"]]
+        board = chess.variant.ThreeCheckBoard()
+        board.push_many(moves, stack=False)
+        self.assertEqual(board.remaining_checks[chess.WHITE], 2)
+        self.assertEqual(board.move_stack, [])
+        self.assertEqual(board.epd(), "rnb2bnr/ppppkBpp/8/4p3/4P2q/8/PPPP1PPP/RNBQK1NR w KQ - 2+3")
+
+    def test_three_check_bytes(self):
+        board = chess.variant.ThreeCheckBoard("rnb1kbnr/pppp1ppp/8/8/2B1Pp1q/8/PPPP2PP/RNBQ1KNR b kq - 3+2 3 4")
+        copy = chess.variant.ThreeCheckBoard.from_bytes(board.to_bytes())
+        self.assertEqual(copy, board)
+        self.assertEqual(copy.remaining_checks[chess.BLACK], 2)
+
+        # Invalid data leaves the board unchanged.
+        data = board.to_bytes()
+        target = chess.variant.ThreeCheckBoard()
+        target.push_san("e4")
+        fen = target.fen()
+        for invalid in [data[:-1], data[:-2] + b"\x04\x03"]:
+            with self.assertRaises(ValueError):
+                target.set_bytes(invalid)
+            self.assertEqual(target.fen(), fen)
+            self.assertEqual(len(target.move_stack), 1)
+
     def test_three_check_epd(self):
         board, ops = chess.variant.ThreeCheckBoard.from_epd("rnb1kbnr/pppp1ppp/8/8/2B1Pp1q/8/PPPP2PP/RNBQ1KNR b kq - 3+2 hmvc 3; fmvn 4; bm Qf2+")
         self.assertEqual(board.remaining_checks[chess.WHITE], 3)
@@ -4868,6 +5700,15 @@ class CrazyhouseTestCase(unittest.TestCase):
         board.pop()
         self.assertEqual(board.fen(), "4k3/8/8/8/8/8/1p6/2R1K3[] b - - 0 1")
 
+    def test_encoded_drop(self):
+        board = chess.variant.CrazyhouseBoard("r2q1rk1/ppp2pp1/1bnp3p/3B4/3PP1b1/4PN2/PP4PP/R2Q1RK1[BNPnp] b - - 0 13")
+        moves = board.legal_moves_array()
+        self.assertEqual([chess.Move.from_encoded(code) for code in moves], list(board.legal_moves))
+        self.assertEqual(chess.Move.from_encoded(chess.Move.from_uci("N@f3").encode()), chess.Move.from_uci("N@f3"))
+
+        board.push_encoded(chess.Move.from_uci("P@e6").encode())
+        self.assertEqual(board.peek(), chess.Move.from_uci("P@e6"))
+
     def test_illegal_drop_uci(self):
         board = chess.variant.CrazyhouseBoard()
         with self.assertRaises(chess.IllegalMoveError):
@@ -4920,6 +5761,47 @@ class CrazyhouseTestCase(unittest.TestCase):
         self.assertEqual(str(board.copy().root().pockets[chess.WHITE]), white_pocket)
         self.assertEqual(str(board.copy().root().pockets[chess.BLACK]), black_pocket)
 
+    def test_bytes(self):
+        board = chess.variant.CrazyhouseBoard("r2q1rk1/ppp2ppp/2n1b3/3p4/3P4/2N1B3/PPP2PPP/R2Q1RK1/NBbnP w - - 0 12")
+        board.promoted = chess.BB_C3
+        copy = chess.variant.CrazyhouseBoard.from_bytes(board.to_bytes())
+        self.assertEqual(copy, board)
+        self.assertEqual(copy.promoted, chess.BB_C3)
+        self.assertEqual(str(copy.pockets[chess.WHITE]), "bnp")
+        self.assertEqual(str(copy.pockets[chess.BLACK]), "bn")
+
+        # Invalid data leaves the board unchanged.
+        target = chess.variant.CrazyhouseBoard("8/8/8/8/8/8/8/K6k/Q w - - 0 1")
+        data = board.to_bytes()
+        for invalid in [data[:-1], data + b"\x00"]:
+            with self.assertRaises(ValueError):
+                target.set_bytes(invalid)
+            self.assertEqual(target.fen(), "8/8/8/8/8/8/8/K6k[Q] w - - 0 1")
+
+    def test_pickle(self):
+        board = chess.variant.CrazyhouseBoard()
+        for san in ["e4", "d5", "exd5", "Qxd5", "Nc3", "Qa5", "P@d4"]:
+            board.push_san(san)
+        copy = pickle.loads(pickle.dumps(board))
+        self.assertIsInstance(copy, chess.variant.CrazyhouseBoard)
+        self.assertEqual(copy, board)
+        self.assertEqual(copy.move_stack, board.move_stack)
+        for _ in range(4):
+            copy.pop()
+        self.assertEqual(copy.fen(), "rnbqkbnr/ppp1pppp/8/3P4/8/8/PPPP1PPP/RNBQKBNR[P] b KQkq - 0 2")
+
+    def test_copy_pockets(self):
+        board = chess.variant.CrazyhouseBoard("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR[N] w KQkq - 0 1")
+        board.push_san("e4")
+        board.push_san("e5")
+        copy = board.copy()
+        board.pop()
+        board.pop()
+        board.push_san("N@f3")
+        copy.pop()
+        copy.pop()
+        self.assertEqual(copy.fen(), "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR[N] w KQkq - 0 1")
+
     def test_zh_is_irreversible(self):
         board = chess.variant.CrazyhouseBoard("r3k2r/8/8/8/8/8/8/R3K2R w Qkq - 0 1")
         self.assertTrue(board.is_irreversible(board.parse_san("Ra2")))